@@ -4,7 +4,7 @@ Graduate Student Learning Dashboard
 """
 
 from flask import Flask, jsonify
-from flask_jwt_extended import JWTManager
+from flask_jwt_extended import JWTManager, jwt_required
 from flask_cors import CORS
 from flask_migrate import Migrate
 import os
@@ -12,7 +12,14 @@ from datetime import datetime
 
 from config import config
 from models import db
+import database
 from routes import auth_bp, todos_bp, notes_bp, pomodoro_bp, dashboard_bp, search_bp, export_bp, references_bp
+import fulltext
+import stats
+import jobs
+import references
+import identity
+import bootstrap
 
 
 def create_app(config_name=None):
@@ -31,8 +38,10 @@ def create_app(config_name=None):
     if config_name == 'production':
         config[config_name].init_app(app)
 
-    # 初始化擴展
+    # 初始化擴展（連線池設定依資料庫類型與部署模式產生）
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = database.engine_options(app.config)
     db.init_app(app)
+    database.init_app(app)
     jwt = JWTManager(app)
 
     # 配置 CORS - 允許所有必要的方法和標頭
@@ -41,10 +50,28 @@ def create_app(config_name=None):
          supports_credentials=True,
          allow_headers=['Content-Type', 'Authorization'],
          methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
-         expose_headers=['Content-Type', 'Authorization'])
+         expose_headers=['Content-Type', 'Authorization', 'X-Next-Cursor', 'Location'])
 
     migrate = Migrate(app, db)
 
+    # 全文檢索 CLI（flask fulltext reindex）
+    fulltext.init_app(app)
+
+    # 統計快取設定
+    stats.init_app(app)
+
+    # 用戶快取設定（路由以 identity.current_user 延遲載入用戶）
+    identity.init_app(app)
+
+    # 背景工作 CLI（flask jobs worker）
+    jobs.init_app(app)
+
+    # 文獻 CLI（flask references parse-bulk）
+    references.init_app(app)
+
+    # 資料庫結構初始化 CLI（flask init-db，於啟動時執行，不在請求中建立資料表）
+    bootstrap.init_app(app)
+
     # 註冊藍圖
     app.register_blueprint(auth_bp)
     app.register_blueprint(todos_bp)
@@ -55,14 +82,25 @@ def create_app(config_name=None):
     app.register_blueprint(export_bp)
     app.register_blueprint(references_bp)
 
-    # 健康檢查端點
+    # 健康檢查端點（資料庫無法連線或結構未就緒時返回 503）
     @app.route('/health')
     def health_check():
+        ready, checks = bootstrap.readiness()
         return jsonify({
-            'status': 'healthy',
+            'status': 'healthy' if ready else 'unavailable',
             'service': 'gradpilot-v2',
-            'version': '2.0.0'
-        }), 200
+            'version': '2.0.0',
+            **checks
+        }), 200 if ready else 503
+
+    # 資料庫連線池統計（每個 worker 各自統計）；含進程與連線池內部資訊，
+    # 需登入，生產環境預設停用（POOL_METRICS_ENABLED=1 啟用）
+    @app.route('/health/pool')
+    @jwt_required()
+    def pool_metrics():
+        if not app.config.get('POOL_METRICS_ENABLED'):
+            return jsonify({'error': 'Not found'}), 404
+        return jsonify(database.pool_stats(app)), 200
 
     # JWT 調試端點（僅用於排查問題）
     @app.route('/debug/jwt-config')
@@ -126,13 +164,6 @@ def create_app(config_name=None):
             'message': '請先登入'
         }), 401
 
-    @jwt.user_lookup_loader
-    def user_lookup_callback(_jwt_header, jwt_data):
-        """當 JWT token 有效時，加載用戶資料"""
-        from models import User
-        user_id = int(jwt_data["sub"])  # 轉換字元串為整數
-        return User.query.filter_by(id=user_id).first()
-
     @jwt.revoked_token_loader
     def revoked_token_callback(jwt_header, jwt_payload):
         return jsonify({
@@ -140,23 +171,13 @@ def create_app(config_name=None):
             'message': '請重新登入'
         }), 401
 
-    # 創建資料庫表（延遲執行，避免啟動時因資料庫未就緒而失敗）
-    @app.before_request
-    def ensure_tables():
-        """在第一次請求時創建資料庫表"""
-        if not hasattr(app, '_tables_created'):
-            try:
-                db.create_all()
-                app._tables_created = True
-            except Exception as e:
-                app.logger.warning(f"無法創建資料庫表：{e}")
-                # 不拋出異常，允許健康檢查等端點正常運作
-
     return app
 
 
 # 用於開發環境直接運行
 if __name__ == '__main__':
     app = create_app('development')
+    with app.app_context():
+        bootstrap.init_db()
     port = int(os.environ.get('PORT', 5001))
     app.run(host='0.0.0.0', port=port, debug=True)
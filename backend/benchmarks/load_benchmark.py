@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+"""
+併發負載測試
+Load Benchmark: sync vs gthread (vs gevent) gunicorn profiles
+
+以本機模擬的 CrossRef 服務（每次查詢延遲 --latency 秒）取代外部 API，
+同時送出：
+- 慢請求：POST /api/references/parse（補全 DOI，需等待外部 API）
+- 快請求：GET /api/todos（只查詢資料庫）
+
+比較各部署模式下兩類請求的吞吐量與快請求的延遲；
+sync 模式中慢請求會佔滿 worker，快請求只能排隊等待。
+
+用法：
+    python benchmarks/load_benchmark.py
+    python benchmarks/load_benchmark.py --profiles sync,gthread,gevent --duration 20 --latency 1
+"""
+
+import argparse
+import itertools
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class FakeCrossRefHandler(BaseHTTPRequestHandler):
+    """模擬 CrossRef /works/<doi>：延遲 latency 秒後返回固定的文獻資料"""
+
+    latency = 1.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        doi = self.path.split('/works/', 1)[-1]
+        body = json.dumps({
+            'status': 'ok',
+            'message': {
+                'DOI': doi,
+                'title': ['Concurrent Requests in Practice'],
+                'author': [{'given': 'Ada', 'family': 'Lovelace'}],
+                'container-title': ['Journal of Load Testing'],
+                'published-print': {'date-parts': [[2024]]},
+                'volume': '12', 'issue': '3', 'page': '100-120',
+                'publisher': 'Benchmark Press', 'type': 'journal-article',
+            }
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_upstream(latency):
+    FakeCrossRefHandler.latency = latency
+    server = ThreadingHTTPServer(('127.0.0.1', free_port()), FakeCrossRefHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def benchmark_env(database_url, upstream_url, profile, workers):
+    env = dict(os.environ)
+    env.update({
+        'FLASK_ENV': 'production',
+        'SECRET_KEY': env.get('SECRET_KEY', 'load-benchmark'),
+        'JWT_SECRET_KEY': env.get('JWT_SECRET_KEY', 'load-benchmark'),
+        'DATABASE_URL': database_url,
+        'GUNICORN_PROFILE': profile,
+        'WEB_CONCURRENCY': str(workers),
+        'CROSSREF_API_URL': f'{upstream_url}/works',
+        'REFERENCE_SOURCES': 'crossref',
+        # 每個 DOI 只查一次，排除快取與速率限制的影響
+        'METADATA_CACHE_ENABLED': '0',
+        'REFERENCE_API_RATE': '0',
+        'REFERENCE_API_MAX_RETRIES': '1',
+    })
+    return env
+
+
+def call(url, method='GET', payload=None, token=None, timeout=120):
+    """送出請求，返回 (狀態碼, 回應, 耗時秒數)"""
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    request = urllib.request.Request(url, data=data, method=method)
+    request.add_header('Content-Type', 'application/json')
+    if token:
+        request.add_header('Authorization', f'Bearer {token}')
+
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        body, status = e.read(), e.code
+    except (urllib.error.URLError, ConnectionError):
+        # worker 回收（max_requests）時可能中斷連線，計為錯誤
+        body, status = b'', None
+    return status, body, time.perf_counter() - started
+
+
+def wait_until_ready(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status, _, _ = call(url, timeout=2)
+        if status == 200:
+            return
+        time.sleep(0.05)
+    raise TimeoutError(f'{url} 在 {timeout} 秒內未就緒')
+
+
+def run_load(base_url, token, slow_clients, fast_clients, duration):
+    """在 duration 秒內持續送出慢 / 快請求，返回兩類請求的耗時與錯誤數"""
+    deadline = time.monotonic() + duration
+    counter = itertools.count()
+    results = {'slow': [], 'fast': [], 'errors': 0}
+    lock = threading.Lock()
+
+    def record(kind, status, seconds):
+        with lock:
+            if status == 200:
+                results[kind].append(seconds)
+            else:
+                results['errors'] += 1
+
+    def slow_loop():
+        while time.monotonic() < deadline:
+            doi = f'10.5555/load.{next(counter)}'
+            status, _, seconds = call(f'{base_url}/api/references/parse', 'POST', {
+                'text': f'Lovelace, A. (2024). Concurrent requests in practice. https://doi.org/{doi}',
+                'enrich': True,
+            }, token)
+            record('slow', status, seconds)
+
+    def fast_loop():
+        while time.monotonic() < deadline:
+            status, _, seconds = call(f'{base_url}/api/todos', token=token)
+            record('fast', status, seconds)
+
+    with ThreadPoolExecutor(max_workers=slow_clients + fast_clients) as pool:
+        futures = [pool.submit(slow_loop) for _ in range(slow_clients)]
+        futures += [pool.submit(fast_loop) for _ in range(fast_clients)]
+        for future in futures:
+            future.result()
+    return results
+
+
+def percentile(values, p):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run_profile(profile, args, upstream_url):
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), f'load_{profile}.db')}"
+    env = benchmark_env(database_url, upstream_url, profile, args.workers)
+    subprocess.run([sys.executable, '-m', 'flask', 'init-db'], cwd=BACKEND_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+    port = free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    process = subprocess.Popen([
+        sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'wsgi:app',
+        '--bind', f'127.0.0.1:{port}', '--access-logfile', '/dev/null', '--log-level', 'warning',
+    ], cwd=BACKEND_DIR, env=env)
+    try:
+        wait_until_ready(f'{base_url}/')
+        status, body, _ = call(f'{base_url}/api/auth/register', 'POST', {
+            'email': 'load@example.com', 'username': 'load', 'password': 'benchmark'
+        })
+        token = json.loads(body)['access_token']
+        return run_load(base_url, token, args.slow_clients, args.fast_clients, args.duration)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='gunicorn 部署模式併發負載測試')
+    parser.add_argument('--profiles', default='sync,gthread', help='要比較的部署模式（逗號分隔）')
+    parser.add_argument('--workers', type=int, default=2, help='worker 進程數（WEB_CONCURRENCY）')
+    parser.add_argument('--slow-clients', type=int, default=4, help='同時送出補全請求的客戶端數')
+    parser.add_argument('--fast-clients', type=int, default=4, help='同時送出一般請求的客戶端數')
+    parser.add_argument('--duration', type=float, default=10, help='每個模式的測試秒數')
+    parser.add_argument('--latency', type=float, default=1.0, help='模擬 CrossRef 的回應延遲（秒）')
+    args = parser.parse_args()
+
+    upstream = start_upstream(args.latency)
+    upstream_url = f'http://127.0.0.1:{upstream.server_address[1]}'
+
+    print(f'workers={args.workers}，慢請求客戶端 {args.slow_clients}、快請求客戶端 {args.fast_clients}，'
+          f'CrossRef 延遲 {args.latency}s，每個模式 {args.duration}s')
+    print(f'{"模式":<10}{"補全 req/s":>12}{"一般 req/s":>12}{"一般 p50 (ms)":>16}{"一般 p95 (ms)":>16}{"錯誤":>8}')
+    try:
+        for profile in args.profiles.split(','):
+            results = run_profile(profile.strip(), args, upstream_url)
+            fast = results['fast']
+            print(
+                f'{profile:<10}{len(results["slow"]) / args.duration:>12.1f}{len(fast) / args.duration:>12.1f}'
+                f'{percentile(fast, 0.5) * 1000:>16.0f}{percentile(fast, 0.95) * 1000:>16.0f}{results["errors"]:>8}'
+            )
+    finally:
+        upstream.shutdown()
+
+
+if __name__ == '__main__':
+    main()
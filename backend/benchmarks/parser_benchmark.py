@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+文獻解析效能基準測試
+Reference Parser Microbenchmark
+
+以真實引用格式（APA、MLA、IEEE、Chicago、Vancouver、中文、網站、書籍）組成的語料，
+測量 ReferenceParser.parse_reference 每筆解析時間，
+以及 parse_multiple 在大量貼上時的擴展性（應與筆數成線性）。
+
+用法：
+    python benchmarks/parser_benchmark.py
+    python benchmarks/parser_benchmark.py --repeat 20 --sizes 1000,10000,50000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from references.parser import ReferenceParser
+
+CITATIONS = [
+    # APA
+    'LeCun, Y., Bengio, Y., & Hinton, G. (2015). Deep learning. Nature, 521(7553), 436-444. https://doi.org/10.1038/nature14539',
+    'Vaswani, A., Shazeer, N., Parmar, N., Uszkoreit, J., Jones, L., Gomez, A. N., Kaiser, L., & Polosukhin, I. (2017). Attention is all you need. Advances in Neural Information Processing Systems, 30, 5998-6008.',
+    'He, K., Zhang, X., Ren, S., & Sun, J. (2016). Deep residual learning for image recognition. Proceedings of the IEEE Conference on Computer Vision and Pattern Recognition, 770-778. doi:10.1109/CVPR.2016.90',
+    'Braun, V., & Clarke, V. (2006). Using thematic analysis in psychology. Qualitative Research in Psychology, 3(2), 77-101. https://doi.org/10.1191/1478088706qp063oa',
+    'Kahneman, D., & Tversky, A. (1979). Prospect theory: An analysis of decision under risk. Econometrica, 47(2), 263-291.',
+    'Bandura, A. (1977). Self-efficacy: Toward a unifying theory of behavioral change. Psychological Review, 84(2), 191-215. DOI: 10.1037/0033-295X.84.2.191',
+    'Creswell, J. W., & Creswell, J. D. (2018). Research design: Qualitative, quantitative, and mixed methods approaches (5th ed.). SAGE Publications.',
+    'Devlin, J., Chang, M.-W., Lee, K., & Toutanova, K. (2019). BERT: Pre-training of deep bidirectional transformers for language understanding. Proceedings of NAACL-HLT, 4171-4186. https://doi.org/10.18653/v1/N19-1423',
+    'Hochreiter, S., & Schmidhuber, J. (1997). Long short-term memory. Neural Computation, 9(8), 1735-1780. https://doi.org/10.1162/neco.1997.9.8.1735',
+    'Cohen, J. (1992). A power primer. Psychological Bulletin, 112(1), 155-159.',
+    'Ryan, R. M., & Deci, E. L. (2000). Self-determination theory and the facilitation of intrinsic motivation, social development, and well-being. American Psychologist, 55(1), 68-78. https://doi.org/10.1037/0003-066X.55.1.68',
+    'Silver, D., Huang, A., Maddison, C. J., Guez, A., Sifre, L., van den Driessche, G., et al. (2016). Mastering the game of Go with deep neural networks and tree search. Nature, 529(7587), 484-489.',
+    # MLA
+    'Smith, Zadie. "Fail Better." The Guardian, 13 Jan. 2007, www.theguardian.com/books/2007/jan/13/fiction.zadiesmith.',
+    'Morrison, Toni. Beloved. Alfred A. Knopf, 1987.',
+    'Said, Edward W. Orientalism. Pantheon Books, 1978.',
+    'Foucault, Michel. Discipline and Punish: The Birth of the Prison. Translated by Alan Sheridan, Vintage Books, 1995.',
+    # IEEE
+    'A. Krizhevsky, I. Sutskever, and G. E. Hinton, "ImageNet classification with deep convolutional neural networks," in Proc. NIPS, 2012, pp. 1097-1105.',
+    'C. E. Shannon, "A mathematical theory of communication," Bell Syst. Tech. J., vol. 27, no. 3, pp. 379-423, Jul. 1948.',
+    'J. Redmon, S. Divvala, R. Girshick, and A. Farhadi, "You only look once: Unified, real-time object detection," in Proc. IEEE CVPR, 2016, pp. 779-788, doi: 10.1109/CVPR.2016.91.',
+    'T. Mikolov, K. Chen, G. Corrado, and J. Dean, "Efficient estimation of word representations in vector space," arXiv preprint arXiv:1301.3781, 2013.',
+    # Chicago
+    'Kuhn, Thomas S. The Structure of Scientific Revolutions. Chicago: University of Chicago Press, 1962.',
+    'Anderson, Benedict. Imagined Communities: Reflections on the Origin and Spread of Nationalism. London: Verso, 1983.',
+    'Granovetter, Mark S. "The Strength of Weak Ties." American Journal of Sociology 78, no. 6 (1973): 1360-80.',
+    # Vancouver
+    'Lowry OH, Rosebrough NJ, Farr AL, Randall RJ. Protein measurement with the Folin phenol reagent. J Biol Chem. 1951;193(1):265-75.',
+    'Laemmli UK. Cleavage of structural proteins during the assembly of the head of bacteriophage T4. Nature. 1970;227(5259):680-5. doi:10.1038/227680a0',
+    # 中文
+    '王小明、李大華（2019）。深度學習於中文斷詞之應用。資訊管理學報，26(3)，45-67。https://doi.org/10.6382/JIM.201907_26(3).0003',
+    '陳美玲（2020）。研究生時間管理與學業表現之關聯。教育研究集刊，66(2)，1-35。',
+    '林志強（2018）。質性研究方法論。台北市：五南。',
+    '張三、李四 (2021). 大型語言模型的評估方法. 中文計算語言學期刊, 12(1), 1-20.',
+    # 網站與報告
+    'World Health Organization. (2020). Coronavirus disease (COVID-19) pandemic. Retrieved from https://www.who.int/emergencies/diseases/novel-coronavirus-2019',
+    'OpenAI. (2023). GPT-4 technical report. arXiv. https://arxiv.org/abs/2303.08774',
+    'National Center for Education Statistics. (2019). Digest of education statistics. U.S. Department of Education. https://nces.ed.gov/programs/digest/',
+    # 書籍
+    'Goodfellow, I., Bengio, Y., & Courville, A. (2016). Deep learning. MIT Press.',
+    'Bishop, C. M. (2006). Pattern recognition and machine learning. Springer.',
+    'Sutton, R. S., & Barto, A. G. (2018). Reinforcement learning: An introduction (2nd ed.). MIT Press.',
+    # 不完整或格式不一致
+    'Deep learning review nature 2015',
+    'doi:10.1145/3292500.3330701',
+    'https://doi.org/10.1126/science.aar6404',
+    'Smith J (2020) Some unpublished manuscript',
+    '',
+]
+
+
+def per_reference(parser, repeat):
+    """每筆文獻的解析時間（微秒）"""
+    timings = []
+    for text in CITATIONS:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            parser.parse_reference(text)
+        timings.append((time.perf_counter() - started) / repeat * 1e6)
+    return timings
+
+
+def bulk(parser, size):
+    """parse_multiple 解析 size 筆（換行分隔）的總時間（秒）"""
+    lines = [CITATIONS[i % len(CITATIONS)] for i in range(size)]
+    text = '\n'.join(lines)
+    started = time.perf_counter()
+    parser.parse_multiple(text)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ReferenceParser 微基準測試')
+    parser.add_argument('--repeat', type=int, default=200, help='每筆文獻重複解析次數')
+    parser.add_argument('--sizes', default='1000,10000,50000', help='parse_multiple 測試筆數（逗號分隔）')
+    args = parser.parse_args()
+
+    reference_parser = ReferenceParser()
+
+    timings = per_reference(reference_parser, args.repeat)
+    timings.sort()
+    print(f'語料 {len(CITATIONS)} 筆，每筆重複 {args.repeat} 次')
+    print(f'{"每筆解析":<12}{"mean (µs)":>12}{"p50 (µs)":>12}{"p95 (µs)":>12}{"max (µs)":>12}')
+    print(f'{"":<12}{statistics.mean(timings):>12.1f}{timings[len(timings) // 2]:>12.1f}'
+          f'{timings[int(len(timings) * 0.95) - 1]:>12.1f}{timings[-1]:>12.1f}')
+
+    print(f'\n{"parse_multiple":<16}{"total (s)":>12}{"per ref (µs)":>14}')
+    for size in [int(s) for s in args.sizes.split(',') if s]:
+        seconds = bulk(reference_parser, size)
+        print(f'{size:<16}{seconds:>12.3f}{seconds / size * 1e6:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+搜尋效能基準測試
+Search Benchmark: ILIKE vs CJK bigram full-text index
+
+產生合成筆記語料（繁體中文為主，夾雜英文），比較：
+- 原本的 ILIKE '%q%' 掃描（Note.title / content / tags / category）
+- fulltext 二元組索引（SQLite FTS5 / PostgreSQL GIN）
+
+用法：
+    python benchmarks/search_benchmark.py --notes 100000
+    python benchmarks/search_benchmark.py --database-url postgresql+psycopg://... --notes 100000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, or_
+
+import config
+from app import create_app
+from models import db, User, Note
+import fulltext
+
+VOCABULARY = [
+    '機器學習', '深度學習', '神經網絡', '反向傳播', '梯度下降', '卷積', '強化學習', '推薦系統',
+    '論文', '研究方法', '文獻回顧', '實驗設計', '數據收集', '統計分析', '指導教授', '研討會',
+    '假設檢定', '迴歸模型', '樣本', '變數', '問卷', '訪談', '質性研究', '量化研究',
+    '自然語言處理', '電腦視覺', '資料庫', '演算法', '複雜度', '最佳化', '期中報告', '口試',
+    'transformer', 'attention', 'dataset', 'baseline', 'evaluation', 'regression', 'python', 'pytorch',
+]
+FILLER = '的了在是我有和也就都而及與或但並把被讓給對從向於為以這那'
+CATEGORIES = ['學習筆記', '研究', '會議', '靈感', '文獻', '實驗']
+
+QUERIES = ['機器學習', '反向傳播', '指導教授', '質性研究', '口試', 'transformer', '研究方法 實驗']
+
+
+def random_text(rng, words):
+    parts = []
+    for _ in range(words):
+        parts.append(rng.choice(VOCABULARY))
+        parts.append(''.join(rng.choice(FILLER) for _ in range(rng.randint(1, 4))))
+    return ''.join(parts)
+
+
+def build_corpus(app, notes, batch_size, seed):
+    rng = random.Random(seed)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        user = User(email='bench@example.com', username='bench')
+        user.set_password('benchmark')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+        started = time.perf_counter()
+        batch = []
+        for i in range(notes):
+            batch.append({
+                'user_id': user_id,
+                'title': random_text(rng, 2),
+                'content': random_text(rng, rng.randint(40, 120)),
+                'category': rng.choice(CATEGORIES),
+                'tags': ','.join(rng.sample(VOCABULARY, 2)),
+            })
+            if len(batch) >= batch_size:
+                db.session.execute(insert(Note), batch)
+                batch = []
+        if batch:
+            db.session.execute(insert(Note), batch)
+        db.session.commit()
+        insert_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        fulltext.reindex(user_id=user_id, batch_size=batch_size)
+        index_seconds = time.perf_counter() - started
+
+    return user_id, insert_seconds, index_seconds
+
+
+def ilike_search(user_id, query, limit):
+    return Note.query.filter(
+        Note.user_id == user_id,
+        or_(
+            Note.title.ilike(f'%{query}%'),
+            Note.content.ilike(f'%{query}%'),
+            Note.tags.ilike(f'%{query}%'),
+            Note.category.ilike(f'%{query}%')
+        )
+    ).order_by(Note.updated_at.desc()).limit(limit).all()
+
+
+def index_search(user_id, query, limit):
+    return fulltext.search(Note, user_id, query, limit=limit)
+
+
+def measure(app, fn, user_id, repeat, limit):
+    timings = []
+    with app.app_context():
+        for query in QUERIES:
+            for _ in range(repeat):
+                started = time.perf_counter()
+                fn(user_id, query, limit)
+                timings.append((time.perf_counter() - started) * 1000)
+                db.session.expire_all()
+    timings.sort()
+    return {
+        'mean': statistics.mean(timings),
+        'p50': timings[len(timings) // 2],
+        'p95': timings[int(len(timings) * 0.95) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ILIKE vs 二元組全文索引搜尋基準測試')
+    parser.add_argument('--notes', type=int, default=100_000, help='合成筆記數量')
+    parser.add_argument('--repeat', type=int, default=5, help='每個查詢重複次數')
+    parser.add_argument('--limit', type=int, default=20, help='每次查詢返回筆數')
+    parser.add_argument('--batch-size', type=int, default=2000, help='寫入批次大小')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-url', help='資料庫連線字串（預設為暫存 SQLite）')
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'search_bench.db')}"
+    config.TestingConfig.SQLALCHEMY_DATABASE_URI = database_url
+    app = create_app('testing')
+
+    print(f'資料庫: {database_url}')
+    print(f'建立 {args.notes} 筆合成筆記...')
+    user_id, insert_seconds, index_seconds = build_corpus(app, args.notes, args.batch_size, args.seed)
+    print(f'  寫入筆記: {insert_seconds:.1f}s，建立索引: {index_seconds:.1f}s')
+
+    print(f'\n查詢: {", ".join(QUERIES)}（各 {args.repeat} 次，limit={args.limit}）')
+    print(f'{"方法":<16}{"mean (ms)":>12}{"p50 (ms)":>12}{"p95 (ms)":>12}')
+    for label, fn in [('ILIKE', ilike_search), ('bigram index', index_search)]:
+        result = measure(app, fn, user_id, args.repeat, args.limit)
+        print(f'{label:<16}{result["mean"]:>12.2f}{result["p50"]:>12.2f}{result["p95"]:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
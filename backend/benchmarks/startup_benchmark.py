@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""
+啟動時間基準測試
+Startup Benchmark: import time & gunicorn worker-ready latency
+
+量測：
+- 各模組 import 時間（python -X importtime，依頂層套件加總自身耗時）與 create_app() 耗時
+- gunicorn 冷啟動：從啟動到第一個請求成功的時間
+- worker 回收：max_requests=1 時每個請求都會回收 worker，請求延遲即為新 worker 就緒的時間
+
+分別以 preload（GUNICORN_PRELOAD=1）與不預載（GUNICORN_PRELOAD=0）執行比較。
+
+用法：
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --top 25 --requests 30 --skip-gunicorn
+"""
+
+import argparse
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 專案內的頂層模組（其餘視為第三方套件）
+PROJECT_PACKAGES = {
+    'app', 'wsgi', 'config', 'models', 'routes', 'references', 'fulltext', 'stats', 'jobs',
+    'exporter', 'cache', 'pagination', 'identity', 'bootstrap',
+}
+
+
+def benchmark_env(database_url):
+    env = dict(os.environ)
+    env.update({
+        'FLASK_ENV': 'production',
+        'SECRET_KEY': env.get('SECRET_KEY', 'startup-benchmark'),
+        'JWT_SECRET_KEY': env.get('JWT_SECRET_KEY', 'startup-benchmark'),
+        'DATABASE_URL': database_url,
+    })
+    return env
+
+
+def parse_importtime(stderr):
+    """解析 -X importtime 輸出，返回 [(模組, 自身微秒, 累計微秒)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure_imports(env, top):
+    """以子進程載入 wsgi（含 create_app），依頂層套件加總 import 耗時"""
+    code = (
+        'import time; started = time.perf_counter(); import wsgi; '
+        'print(time.perf_counter() - started)'
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    total_seconds = float(result.stdout.strip().splitlines()[-1])
+    rows = parse_importtime(result.stderr)
+
+    by_package = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split('.')[0]] += self_us
+
+    print(f'載入 wsgi（import + create_app）: {total_seconds * 1000:.0f} ms')
+    print(f'\n{"套件":<28}{"自身耗時 (ms)":>16}  來源')
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        origin = '專案' if package in PROJECT_PACKAGES else '第三方'
+        print(f'{package:<28}{self_us / 1000:>16.1f}  {origin}')
+
+    print(f'\n{"專案模組":<28}{"累計耗時 (ms)":>16}')
+    for name, _, cumulative_us in sorted(rows, key=lambda row: -row[2]):
+        if name.split('.')[0] in PROJECT_PACKAGES and name != 'wsgi':
+            print(f'{name:<28}{cumulative_us / 1000:>16.1f}')
+            top -= 1
+            if top <= 0:
+                break
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url, timeout):
+    """輪詢直到請求成功，返回耗時秒數"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                response.read()
+                return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.01)
+    raise TimeoutError(f'{url} 在 {timeout} 秒內未就緒')
+
+
+def measure_gunicorn(env, preload, requests, timeout):
+    """
+    返回 (冷啟動秒數, 回收延遲列表)
+
+    以單一 worker 與 max_requests=1 啟動，第一個請求量測冷啟動，
+    之後每個請求都需等待新 worker 就緒
+    """
+    port = free_port()
+    url = f'http://127.0.0.1:{port}/'
+    env = dict(env, GUNICORN_PRELOAD='1' if preload else '0')
+    command = [
+        sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'wsgi:app',
+        '--bind', f'127.0.0.1:{port}', '--workers', '1',
+        '--max-requests', '1', '--max-requests-jitter', '0',
+        '--access-logfile', '/dev/null', '--log-level', 'warning',
+    ]
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+    try:
+        wait_until_ready(url, timeout)
+        cold_start = time.perf_counter() - started
+
+        recycles = []
+        for _ in range(requests):
+            recycles.append(wait_until_ready(url, timeout))
+        return cold_start, recycles
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='import 時間與 gunicorn worker 就緒延遲基準測試')
+    parser.add_argument('--top', type=int, default=15, help='列出耗時最多的套件 / 模組數')
+    parser.add_argument('--requests', type=int, default=20, help='worker 回收量測的請求數')
+    parser.add_argument('--timeout', type=float, default=30, help='等待 worker 就緒的秒數上限')
+    parser.add_argument('--skip-gunicorn', action='store_true', help='只量測 import 時間')
+    parser.add_argument('--database-url', help='資料庫連線字串（預設為暫存 SQLite）')
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'startup_bench.db')}"
+    env = benchmark_env(database_url)
+
+    print('== import 時間 ==')
+    measure_imports(env, args.top)
+
+    if args.skip_gunicorn:
+        return
+
+    print(f'\n== gunicorn worker 就緒延遲（max_requests=1，{args.requests} 次回收）==')
+    print(f'{"模式":<12}{"冷啟動 (ms)":>14}{"回收 p50 (ms)":>16}{"回收 max (ms)":>16}')
+    for label, preload in [('preload', True), ('no preload', False)]:
+        cold_start, recycles = measure_gunicorn(env, preload, args.requests, args.timeout)
+        print(
+            f'{label:<12}{cold_start * 1000:>14.0f}'
+            f'{statistics.median(recycles) * 1000:>16.0f}{max(recycles) * 1000:>16.0f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+資料庫結構初始化與就緒檢查
+Schema Bootstrap & Readiness
+
+資料表的建立與升級在啟動階段執行（flask init-db，由 start.sh 於啟動 gunicorn 前呼叫），
+不在用戶請求中反射資料庫結構；/health 回報資料庫連線與結構 / 遷移狀態，
+供部署平台判斷是否可接收流量。
+"""
+
+import logging
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+
+from models import db
+from references.dedupe import upgrade_schema
+
+logger = logging.getLogger(__name__)
+
+_STATUS_KEY = 'schema_status'
+
+
+def _migrations_directory() -> Optional[str]:
+    """Flask-Migrate 的遷移目錄（不存在時返回 None，結構由 db.create_all 管理）"""
+    migrate = current_app.extensions.get('migrate')
+    directory = getattr(migrate, 'directory', None) or 'migrations'
+    return directory if os.path.isdir(directory) else None
+
+
+def check_connection():
+    """執行 SELECT 1，資料庫無法連線時拋出 DBAPIError"""
+    with db.engine.connect() as connection:
+        connection.execute(text('SELECT 1'))
+
+
+def wait_for_database(timeout: float, interval: float = 2):
+    """等待資料庫可連線（部署時資料庫可能晚於應用啟動）"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            check_connection()
+            return
+        except DBAPIError as e:
+            if time.monotonic() >= deadline:
+                raise
+            logger.warning(f"資料庫尚未就緒，{interval} 秒後重試：{e.orig}")
+            time.sleep(interval)
+
+
+def migration_state(connection) -> Dict:
+    """
+    Alembic 遷移狀態
+
+    Returns:
+        status: unmanaged（無遷移目錄）、current（已是最新版本）、pending（有未套用的遷移）
+    """
+    from alembic.runtime.migration import MigrationContext
+
+    current = sorted(MigrationContext.configure(connection).get_current_heads())
+    directory = _migrations_directory()
+    if directory is None:
+        return {'status': 'unmanaged', 'current': current, 'head': []}
+
+    from alembic.script import ScriptDirectory
+    head = sorted(ScriptDirectory(directory).get_heads())
+    return {'status': 'current' if current == head else 'pending', 'current': current, 'head': head}
+
+
+def schema_status() -> Dict:
+    """比對模型與資料庫結構，列出缺少的資料表、欄位與索引"""
+    inspector = inspect(db.engine)
+    existing = set(inspector.get_table_names())
+
+    missing_tables, missing_columns, missing_indexes = [], [], []
+    for name, table in db.metadata.tables.items():
+        if name not in existing:
+            missing_tables.append(name)
+            continue
+        columns = {column['name'] for column in inspector.get_columns(name)}
+        missing_columns.extend(f'{name}.{column.name}' for column in table.columns if column.name not in columns)
+        indexes = {index['name'] for index in inspector.get_indexes(name)}
+        missing_indexes.extend(index.name for index in table.indexes if index.name not in indexes)
+
+    with db.engine.connect() as connection:
+        migration = migration_state(connection)
+
+    return {
+        'ready': not (missing_tables or missing_columns or missing_indexes) and migration['status'] != 'pending',
+        'missing_tables': sorted(missing_tables),
+        'missing_columns': sorted(missing_columns),
+        'missing_indexes': sorted(missing_indexes),
+        'migration': migration,
+    }
+
+
+def init_db() -> Dict:
+    """
+    建立 / 升級資料庫結構（可重複執行）
+
+    有遷移目錄時先執行 flask db upgrade，再以 db.create_all 補上新資料表，
+    最後升級既有 references 資料表的去重欄位與索引
+    """
+    directory = _migrations_directory()
+    if directory is not None:
+        from flask_migrate import upgrade
+        upgrade(directory=directory)
+
+    db.create_all()
+    upgrade_schema(db.engine)
+
+    current_app.extensions.pop(_STATUS_KEY, None)
+    return schema_status()
+
+
+def readiness() -> Tuple[bool, Dict]:
+    """
+    就緒檢查：資料庫可連線且結構為最新
+
+    結構比對需反射整個資料庫，確認就緒後即保存於應用，之後只檢查連線
+    """
+    try:
+        check_connection()
+    except DBAPIError as e:
+        return False, {'database': 'unavailable', 'error': str(e.orig)}
+
+    status = current_app.extensions.get(_STATUS_KEY)
+    if status is None:
+        try:
+            status = schema_status()
+        except DBAPIError as e:
+            return False, {'database': 'unavailable', 'error': str(e.orig)}
+        if status['ready']:
+            current_app.extensions[_STATUS_KEY] = status
+
+    return status['ready'], {'database': 'ok', 'schema': status}
+
+
+@click.command('init-db')
+@click.option('--wait', type=float, default=0, help='等待資料庫就緒的秒數')
+@with_appcontext
+def init_db_command(wait):
+    """建立 / 升級資料庫結構（部署啟動時執行）"""
+    if wait:
+        wait_for_database(wait)
+
+    status = init_db()
+    if not status['ready']:
+        raise click.ClickException(f"資料庫結構仍不完整：{status}")
+    click.echo(f"資料庫結構已就緒（遷移狀態：{status['migration']['status']}）")
+
+
+def init_app(app):
+    """註冊 CLI 指令（flask init-db）"""
+    app.cli.add_command(init_db_command)
@@ -4,6 +4,7 @@ Configuration for GradPilot 2.0
 """
 
 import os
+import tempfile
 from datetime import timedelta
 
 class Config:
@@ -27,22 +28,123 @@ class Config:
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # gunicorn 部署模式（與 gunicorn.conf.py 共用環境變數）與每個 worker 同時處理的請求數，
+    # 資料庫與對外 API 的連線池依此設定，避免請求執行緒互相等待連線
+    GUNICORN_PROFILE = os.environ.get('GUNICORN_PROFILE', 'gthread')
+    WORKER_CONCURRENCY = {
+        'gthread': int(os.environ.get('GUNICORN_THREADS', 4)),
+        'gevent': int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 100)),
+    }.get(GUNICORN_PROFILE, 1)
+
+    # 資料庫連線池（SQLALCHEMY_ENGINE_OPTIONS 由 database.engine_options() 依資料庫類型產生）
+    # PostgreSQL：DB_MAX_CONNECTIONS 條連線的額度由 WEB_CONCURRENCY 個 worker 與背景工作執行器平分；
+    # DB_POOL_SIZE / DB_MAX_OVERFLOW 未設定時由額度與每個 worker 的並行請求數計算
+    WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 2))
+    DB_MAX_CONNECTIONS = int(os.environ.get('DB_MAX_CONNECTIONS', 20))
+    DB_POOL_SIZE = int(os.environ['DB_POOL_SIZE']) if os.environ.get('DB_POOL_SIZE') else None
+    DB_MAX_OVERFLOW = int(os.environ['DB_MAX_OVERFLOW']) if os.environ.get('DB_MAX_OVERFLOW') else None
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 10))  # 等待可用連線的秒數
+    # 閒置超過此秒數的連線重新建立（代理或資料庫端會關閉長時間閒置的連線）
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 300))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', '1') != '0'
+    DB_STATEMENT_TIMEOUT = int(os.environ.get('DB_STATEMENT_TIMEOUT', 30000))  # 毫秒，0 表示不限制
+    # psycopg 3 執行同一查詢達此次數後改用伺服器端預備語句；經由 PgBouncer（交易模式）連線時設為 none
+    DB_PREPARE_THRESHOLD = os.environ.get('DB_PREPARE_THRESHOLD', '5')
+
+    # SQLite PRAGMA（每條連線建立時設定）
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 64 * 1024 * 1024))
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))  # 毫秒
+
+    # /health/pool 連線池統計（含進程與連線池內部資訊，生產環境預設停用）
+    POOL_METRICS_ENABLED = os.environ.get('POOL_METRICS_ENABLED', '1') != '0'
+
     # CORS 配置
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:5173').split(',')
 
     # 應用配置
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
 
+    # 全文檢索分詞器（cjk_bigram, word），更換後需執行 flask fulltext reindex
+    SEARCH_TOKENIZER = os.environ.get('SEARCH_TOKENIZER', 'cjk_bigram')
+
+    # 儀表板統計快取秒數（資料變更時會主動失效）
+    DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', 60))
+
+    # 用戶資料快取（每個 worker 的筆數與秒數，用戶資料變更時會主動失效）
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 1024))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+
+    # 背景工作（flask jobs worker）
+    JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 2))  # 佇列為空時的等待秒數
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+    JOB_TIMEOUT = int(os.environ.get('JOB_TIMEOUT', 600))  # 執行超過此秒數視為中斷，放回佇列
+
+    # 非同步導出檔案目錄與保存時數
+    EXPORT_DIR = os.environ.get('EXPORT_DIR') or os.path.join(tempfile.gettempdir(), 'gradpilot_exports')
+    EXPORT_RETENTION_HOURS = int(os.environ.get('EXPORT_RETENTION_HOURS', 24))
+
+    # 文獻 API（CrossRef）
+    REFERENCE_API_TIMEOUT = int(os.environ.get('REFERENCE_API_TIMEOUT', 10))
+    REFERENCE_API_MAX_RETRIES = int(os.environ.get('REFERENCE_API_MAX_RETRIES', 3))
+    REFERENCE_API_BACKOFF = float(os.environ.get('REFERENCE_API_BACKOFF', 0.5))  # 重試退避係數（秒）
+    REFERENCE_API_CONCURRENCY = int(os.environ.get('REFERENCE_API_CONCURRENCY', 4))  # 批次補全同時查詢數
+    REFERENCE_BATCH_MAX_ITEMS = int(os.environ.get('REFERENCE_BATCH_MAX_ITEMS', 200))
+    REFERENCE_BATCH_TIMEOUT = float(os.environ.get('REFERENCE_BATCH_TIMEOUT', 45))  # 需小於 gunicorn timeout
+
+    # 多來源查詢：並行查詢各來源，任一來源完整度達門檻即採用，否則合併各來源結果
+    REFERENCE_SOURCES = os.environ.get('REFERENCE_SOURCES', 'crossref,openalex,doi.org').split(',')
+    # 查詢執行緒數：每個並行請求同時查詢各來源（上限 32）
+    REFERENCE_RESOLVER_WORKERS = int(os.environ.get(
+        'REFERENCE_RESOLVER_WORKERS', min(max(WORKER_CONCURRENCY * len(REFERENCE_SOURCES), 8), 32)
+    ))
+    # 每個主機保持的連線數（不少於查詢執行緒數，否則多出的連線用完即丟棄）
+    REFERENCE_API_POOL_SIZE = int(os.environ.get('REFERENCE_API_POOL_SIZE', max(REFERENCE_RESOLVER_WORKERS, 10)))
+    REFERENCE_RESOLVER_TIMEOUT = float(os.environ.get('REFERENCE_RESOLVER_TIMEOUT', 8))
+    REFERENCE_RESOLVER_QUALITY = float(os.environ.get('REFERENCE_RESOLVER_QUALITY', 0.75))
+
+    # 來源 API 位址（未設定時使用官方位址；可指向鏡像站或負載測試用的模擬服務）
+    CROSSREF_API_URL = os.environ.get('CROSSREF_API_URL')
+    OPENALEX_API_URL = os.environ.get('OPENALEX_API_URL')
+    DOI_ORG_URL = os.environ.get('DOI_ORG_URL')
+
+    # 背景補全尚未完成時建議客戶端再次查詢的間隔秒數（Retry-After）
+    REFERENCE_JOB_POLL_INTERVAL = int(os.environ.get('REFERENCE_JOB_POLL_INTERVAL', 1))
+
+    # 大量解析（CLI 多進程；API 在請求內解析），未設定工作進程數時依 CPU 核心數決定
+    BULK_PARSE_WORKERS = int(os.environ.get('BULK_PARSE_WORKERS', 0)) or None
+    BULK_PARSE_CHUNK_SIZE = int(os.environ.get('BULK_PARSE_CHUNK_SIZE', 500))
+
+    # BibTeX / RIS 匯入（上傳大小受 MAX_CONTENT_LENGTH 限制）
+    REFERENCE_IMPORT_BATCH_SIZE = int(os.environ.get('REFERENCE_IMPORT_BATCH_SIZE', 500))
+
+    # 對外 API 速率限制（同一台機器所有進程共用，0 表示不限速）
+    # 回應帶有 X-Rate-Limit-Limit / X-Rate-Limit-Interval 時以標頭為準
+    REFERENCE_API_RATE = float(os.environ.get('REFERENCE_API_RATE', 10))  # 每個主機每秒請求數
+    REFERENCE_API_BURST = int(os.environ.get('REFERENCE_API_BURST', 10))
+    REFERENCE_API_MAX_WAIT = float(os.environ.get('REFERENCE_API_MAX_WAIT', 2))  # 等待額度的最長秒數
+    RATE_LIMIT_DIR = os.environ.get('RATE_LIMIT_DIR') or os.path.join(tempfile.gettempdir(), 'gradpilot_ratelimit')
+
+    # 文獻元數據快取（跨用戶共用），查無結果以較短時間快取
+    METADATA_CACHE_ENABLED = os.environ.get('METADATA_CACHE_ENABLED', '1') != '0'
+    METADATA_CACHE_TTL = int(os.environ.get('METADATA_CACHE_TTL', 30 * 24 * 3600))
+    METADATA_CACHE_NEGATIVE_TTL = int(os.environ.get('METADATA_CACHE_NEGATIVE_TTL', 24 * 3600))
+    # 命中次數累計於記憶體，達到筆數或間隔秒數時批次寫回
+    METADATA_CACHE_HIT_FLUSH_SIZE = int(os.environ.get('METADATA_CACHE_HIT_FLUSH_SIZE', 100))
+    METADATA_CACHE_HIT_FLUSH_INTERVAL = float(os.environ.get('METADATA_CACHE_HIT_FLUSH_INTERVAL', 60))
+
 
 class DevelopmentConfig(Config):
     """開發環境配置"""
     DEBUG = True
-    SQLALCHEMY_ECHO = True  # 顯示 SQL 語句
+    SQLALCHEMY_ECHO = os.environ.get('SQLALCHEMY_ECHO') == '1'  # 設定 SQLALCHEMY_ECHO=1 顯示 SQL 語句
 
 
 class ProductionConfig(Config):
     """生產環境配置"""
     DEBUG = False
+    POOL_METRICS_ENABLED = os.environ.get('POOL_METRICS_ENABLED') == '1'
 
     # 生產環境必須設定這些環境變數
     @classmethod
@@ -0,0 +1,171 @@
+"""
+資料庫連線設定
+Database Engine Configuration
+
+依資料庫類型與部署模式產生 SQLALCHEMY_ENGINE_OPTIONS：
+- PostgreSQL：連線池大小依 WEB_CONCURRENCY 分配連線額度，取出連線前先 ping、
+  定期重建閒置連線（避免閒置後第一個查詢卡在已被關閉的連線），並設定伺服器端語句逾時
+- SQLite：每條連線設定 WAL、synchronous=NORMAL 與 mmap，並由 SQLAlchemy 控制 BEGIN
+  （pysqlite 預設的隱含交易會使 SAVEPOINT 失效）
+
+並記錄各連線池的統計，供 /health/pool 查詢
+"""
+
+import os
+import threading
+from typing import Dict, Mapping
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from models import db
+
+_STAT_NAMES = ('connects', 'checkouts', 'checkins', 'invalidations')
+
+# 回報於 /health/pool 的連線池設定（取自建立 engine 時的 SQLALCHEMY_ENGINE_OPTIONS）
+_REPORTED_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle', 'pool_pre_ping', 'pool_use_lifo')
+
+
+def _pool_limits(config: Mapping) -> Dict:
+    """
+    每個進程的 pool_size / max_overflow
+
+    連線額度 DB_MAX_CONNECTIONS 由 gunicorn worker 與背景工作執行器（flask jobs worker）平分
+    """
+    processes = max(1, config.get('WEB_CONCURRENCY', 2)) + 1
+    per_worker = max(2, config.get('DB_MAX_CONNECTIONS', 20) // processes)
+    pool_size = config.get('DB_POOL_SIZE')
+    if pool_size is None:
+        pool_size = max(1, min(config.get('WORKER_CONCURRENCY', 1), per_worker))
+    max_overflow = config.get('DB_MAX_OVERFLOW')
+    if max_overflow is None:
+        max_overflow = max(0, per_worker - pool_size)
+    return {'pool_size': pool_size, 'max_overflow': max_overflow}
+
+
+def _postgresql_options(config: Mapping, driver: str) -> Dict:
+    connect_args = {'connect_timeout': 10}
+    if config.get('DB_STATEMENT_TIMEOUT'):
+        connect_args['options'] = f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT']}"
+    if driver == 'psycopg':
+        threshold = str(config.get('DB_PREPARE_THRESHOLD', '5')).strip().lower()
+        connect_args['prepare_threshold'] = None if threshold in ('', 'none') else int(threshold)
+
+    return {
+        **_pool_limits(config),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 10),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 300),
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+        # 優先重用最近歸還的連線，尖峰過後多出的連線可閒置到期回收
+        'pool_use_lifo': True,
+        'connect_args': connect_args,
+    }
+
+
+def engine_options(config: Mapping) -> Dict:
+    """
+    依 SQLALCHEMY_DATABASE_URI 產生 SQLALCHEMY_ENGINE_OPTIONS
+
+    設定中已有的 SQLALCHEMY_ENGINE_OPTIONS 優先（可覆寫任一項）
+    """
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    options = {}
+    if url.get_backend_name() == 'postgresql':
+        options = _postgresql_options(config, url.get_driver_name())
+    return {**options, **(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})}
+
+
+def _sqlite_pragmas(config: Mapping):
+    statements = [f"PRAGMA busy_timeout = {int(config.get('SQLITE_BUSY_TIMEOUT', 5000))}"]
+    if config.get('SQLITE_JOURNAL_MODE'):
+        statements.append(f"PRAGMA journal_mode = {config['SQLITE_JOURNAL_MODE']}")
+    if config.get('SQLITE_SYNCHRONOUS'):
+        statements.append(f"PRAGMA synchronous = {config['SQLITE_SYNCHRONOUS']}")
+    if config.get('SQLITE_MMAP_SIZE'):
+        statements.append(f"PRAGMA mmap_size = {int(config['SQLITE_MMAP_SIZE'])}")
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    return set_pragmas
+
+
+def _sqlite_disable_implicit_transactions(dbapi_connection, connection_record):
+    # pysqlite 只在 DML 前才送出 BEGIN，SAVEPOINT（begin_nested）會落在交易之外，
+    # RELEASE 時即提交；改由 SQLAlchemy 在交易開始時自行送出 BEGIN
+    dbapi_connection.isolation_level = None
+
+
+def _sqlite_begin(connection):
+    connection.exec_driver_sql('BEGIN')
+
+
+class PoolStats:
+    """連線池事件計數（每個 worker 進程各自統計）"""
+
+    def __init__(self, engine, options: Mapping = None):
+        """
+        Args:
+            engine: SQLAlchemy engine
+            options: 建立 engine 時的參數（SQLALCHEMY_ENGINE_OPTIONS）
+        """
+        self.engine = engine
+        self.options = {name: options[name] for name in _REPORTED_OPTIONS if name in (options or {})}
+        self.counts = dict.fromkeys(_STAT_NAMES, 0)
+        self._lock = threading.Lock()
+
+        for name, stat in (('connect', 'connects'), ('checkout', 'checkouts'),
+                           ('checkin', 'checkins'), ('invalidate', 'invalidations')):
+            event.listen(engine.pool, name, self._counter(stat))
+
+    def _counter(self, stat):
+        def count(*args):
+            with self._lock:
+                self.counts[stat] += 1
+        return count
+
+    def to_dict(self) -> Dict:
+        pool = self.engine.pool
+        data = {
+            'dialect': self.engine.dialect.name,
+            'pool_class': type(pool).__name__,
+            'status': pool.status(),
+        }
+        # QueuePool 才有以下計數
+        for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+            method = getattr(pool, name, None)
+            if callable(method):
+                data[name] = method()
+        data['options'] = dict(self.options)
+        with self._lock:
+            data.update(self.counts)
+        return data
+
+
+def pool_stats(app) -> Dict:
+    """各資料庫連線池的狀態與事件計數"""
+    stats = app.extensions.get('pool_stats', {})
+    return {
+        'pid': os.getpid(),
+        'engines': {bind or 'default': stat.to_dict() for bind, stat in stats.items()},
+    }
+
+
+def init_app(app):
+    """為已建立的 engine 註冊 SQLite PRAGMA 與連線池統計（需在 db.init_app 之後呼叫）"""
+    stats = {}
+    with app.app_context():
+        for bind, engine in db.engines.items():
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', _sqlite_pragmas(app.config))
+                event.listen(engine, 'connect', _sqlite_disable_implicit_transactions)
+                event.listen(engine, 'begin', _sqlite_begin)
+            # 預設 engine 以 SQLALCHEMY_ENGINE_OPTIONS 建立；其他 bind 的參數寫在 SQLALCHEMY_BINDS
+            options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') if bind is None else None
+            stats[bind] = PoolStats(engine, options)
+    app.extensions['pool_stats'] = stats
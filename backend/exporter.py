@@ -0,0 +1,317 @@
+"""
+串流導出
+Streaming Exporter
+
+以產生器逐批輸出 JSON / CSV / Markdown / BibTeX，資料列以 yield_per 分批讀取，
+記憶體用量與導出筆數無關。輸出內容與原本一次性 json.dumps(indent=2) 相同。
+"""
+
+import csv
+import html
+import io
+import json
+import unicodedata
+from datetime import datetime
+from typing import Iterable, Iterator
+from urllib.parse import quote
+
+from models import Todo, Note, PomodoroSession, Reference
+
+# 每批讀取的資料列數
+YIELD_PER = 500
+
+# 輸出緩衝大小（累積到此大小才送出一個區塊）
+CHUNK_SIZE = 64 * 1024
+
+PRIORITY_NAMES = {'high': '高', 'medium': '中', 'low': '低'}
+
+# 參考文獻列表輸出格式 -> Content-Type
+BIBLIOGRAPHY_FORMATS = {
+    'text': 'text/plain; charset=utf-8',
+    'html': 'text/html; charset=utf-8',
+    'markdown': 'text/markdown; charset=utf-8',
+}
+
+
+def buffered(chunks: Iterable[str], size: int = CHUNK_SIZE) -> Iterator[str]:
+    """將細碎的字串合併為較大的區塊再輸出"""
+    buffer = []
+    buffered_size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered_size += len(chunk)
+        if buffered_size >= size:
+            yield ''.join(buffer)
+            buffer = []
+            buffered_size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def content_disposition(filename: str) -> str:
+    """
+    下載檔案的 Content-Disposition 標頭值
+
+    filename 為加上引號並跳脫的 ASCII 檔名（舊版客戶端使用），
+    filename* 以 RFC 5987（UTF-8''...）編碼保留完整檔名
+    """
+    fallback = unicodedata.normalize('NFKD', filename).encode('ascii', 'ignore').decode('ascii')
+    fallback = ''.join(ch for ch in fallback if ch.isprintable())
+    fallback = fallback.replace('\\', '\\\\').replace('"', '\\"') or 'download'
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+def _dumps(value, level: int) -> str:
+    """以 indent=2 序列化，並依巢狀層級縮排後續行"""
+    text = json.dumps(value, ensure_ascii=False, indent=2)
+    return text.replace('\n', '\n' + '  ' * level)
+
+
+class JSONObjectWriter:
+    """逐欄位輸出 JSON 物件（格式等同 json.dumps(..., indent=2)）"""
+
+    def __init__(self):
+        self._fields = 0
+
+    def _key(self, key: str) -> str:
+        prefix = '{\n' if self._fields == 0 else ',\n'
+        self._fields += 1
+        return f'{prefix}  {json.dumps(key, ensure_ascii=False)}: '
+
+    def field(self, key: str, value) -> str:
+        """輸出單一欄位"""
+        return self._key(key) + _dumps(value, 1)
+
+    def array(self, key: str, items: Iterable) -> Iterator[str]:
+        """逐筆輸出陣列欄位"""
+        yield self._key(key)
+        empty = True
+        for item in items:
+            yield ('[\n    ' if empty else ',\n    ') + _dumps(item, 2)
+            empty = False
+        yield '[]' if empty else '\n  ]'
+
+    def close(self) -> str:
+        return '{}' if self._fields == 0 else '\n}'
+
+
+class _Counter:
+    """計算串流中經過的筆數"""
+
+    def __init__(self, items: Iterable):
+        self.items = items
+        self.count = 0
+
+    def __iter__(self):
+        for item in self.items:
+            self.count += 1
+            yield item
+
+
+def _rows(query) -> Iterator:
+    return query.yield_per(YIELD_PER)
+
+
+def iter_all_json(user) -> Iterator[str]:
+    """導出用戶所有數據（JSON）"""
+    user_id = user.id
+    todos = _Counter(todo.to_dict() for todo in _rows(Todo.query.filter_by(user_id=user_id)))
+    notes = _Counter(note.to_dict() for note in _rows(Note.query.filter_by(user_id=user_id)))
+    sessions = _Counter(
+        session.to_dict() for session in _rows(PomodoroSession.query.filter_by(user_id=user_id))
+    )
+
+    writer = JSONObjectWriter()
+    yield writer.field('export_date', datetime.utcnow().isoformat())
+    yield writer.field('user', {
+        'username': user.username,
+        'email': user.email,
+        'timezone': user.timezone,
+        'pomodoro_duration': user.pomodoro_duration,
+        'break_duration': user.break_duration
+    })
+    yield from writer.array('todos', todos)
+    yield from writer.array('notes', notes)
+    yield from writer.array('pomodoro_sessions', sessions)
+    yield writer.field('stats', {
+        'total_todos': todos.count,
+        'total_notes': notes.count,
+        'total_pomodoro_sessions': sessions.count
+    })
+    yield writer.close()
+
+
+def _iter_list_json(key: str, objects: Iterable) -> Iterator[str]:
+    items = _Counter(obj.to_dict() for obj in objects)
+    writer = JSONObjectWriter()
+    yield writer.field('export_date', datetime.utcnow().isoformat())
+    yield from writer.array(key, items)
+    yield writer.field('total', items.count)
+    yield writer.close()
+
+
+def _todos_query(user_id: int):
+    return Todo.query.filter_by(user_id=user_id).order_by(Todo.created_at.desc())
+
+
+def _notes_query(user_id: int):
+    return Note.query.filter_by(user_id=user_id).order_by(Note.updated_at.desc())
+
+
+def iter_todos_json(user_id: int) -> Iterator[str]:
+    """導出待辦事項（JSON）"""
+    return _iter_list_json('todos', _rows(_todos_query(user_id)))
+
+
+def iter_todos_csv(user_id: int) -> Iterator[str]:
+    """導出待辦事項（CSV，含 BOM 確保 Excel 正確顯示中文）"""
+    line = io.StringIO()
+    writer = csv.writer(line)
+
+    def row(values):
+        line.seek(0)
+        line.truncate()
+        writer.writerow(values)
+        return line.getvalue()
+
+    yield '\ufeff'
+    yield row(['標題', '描述', '優先級', '已完成', '標籤', '截止日期', '創建時間'])
+
+    for todo in _rows(_todos_query(user_id)):
+        yield row([
+            todo.title,
+            todo.description or '',
+            todo.priority,
+            '是' if todo.completed else '否',
+            todo.tags or '',
+            todo.due_date.isoformat() if todo.due_date else '',
+            todo.created_at.isoformat()
+        ])
+
+
+def iter_todos_markdown(user_id: int) -> Iterator[str]:
+    """導出待辦事項（Markdown，按優先級分組）"""
+    yield '# 待辦事項清單\n'
+    yield f'導出時間：{datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")}\n'
+    yield f'總計：{Todo.query.filter_by(user_id=user_id).count()} 項\n\n'
+
+    # 每個優先級各自串流查詢，不需先載入全部再分組
+    for priority in ['high', 'medium', 'low']:
+        header_written = False
+        for todo in _rows(_todos_query(user_id).filter(Todo.priority == priority)):
+            if not header_written:
+                yield f'## {PRIORITY_NAMES[priority]}優先級\n\n'
+                header_written = True
+
+            status = '✅' if todo.completed else '⬜'
+            yield f'- {status} **{todo.title}**\n'
+            if todo.description:
+                yield f'  - {todo.description}\n'
+            if todo.tags:
+                yield f'  - 標籤: {todo.tags}\n'
+            if todo.due_date:
+                yield f'  - 截止: {todo.due_date.strftime("%Y-%m-%d")}\n'
+            yield '\n'
+
+
+def iter_notes_json(user_id: int) -> Iterator[str]:
+    """導出筆記（JSON）"""
+    return _iter_list_json('notes', _rows(_notes_query(user_id)))
+
+
+def iter_notes_markdown(user_id: int) -> Iterator[str]:
+    """導出筆記（Markdown）"""
+    yield '# 筆記集合\n'
+    yield f'導出時間：{datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")}\n'
+    yield f'總計：{Note.query.filter_by(user_id=user_id).count()} 篇\n\n'
+    yield '---\n\n'
+
+    for note in _rows(_notes_query(user_id)):
+        yield f'## {note.title}\n\n'
+        if note.category:
+            yield f'**分類：** {note.category}\n\n'
+        if note.tags:
+            yield f'**標籤：** {note.tags}\n\n'
+        yield f'{note.content}\n\n'
+        yield f'_更新時間: {note.updated_at.strftime("%Y-%m-%d %H:%M")}_\n\n'
+        yield '---\n\n'
+
+
+def to_bibtex(reference) -> str:
+    """將 Reference 物件轉換為 BibTeX 格式"""
+    ref_type = reference.reference_type or 'article'
+
+    # BibTeX key: 第一作者姓 + 年份
+    if reference.authors and len(reference.authors) > 0:
+        first_author = reference.authors[0].get('last', 'Unknown')
+    else:
+        first_author = 'Unknown'
+
+    year = reference.year or 'n.d.'
+    key = f"{first_author}{year}"
+
+    # 作者列表
+    authors_str = ' and '.join([
+        f"{a.get('first', '')} {a.get('last', '')}"
+        for a in reference.authors
+    ]) if reference.authors else ''
+
+    # 構建 BibTeX 條目
+    lines = [f"@{ref_type}{{{key},"]
+
+    if reference.title:
+        lines.append(f"  title = {{{reference.title}}},")
+    if authors_str:
+        lines.append(f"  author = {{{authors_str}}},")
+    if reference.year:
+        lines.append(f"  year = {{{reference.year}}},")
+    if reference.journal:
+        lines.append(f"  journal = {{{reference.journal}}},")
+    if reference.volume:
+        lines.append(f"  volume = {{{reference.volume}}},")
+    if reference.issue:
+        lines.append(f"  number = {{{reference.issue}}},")
+    if reference.pages:
+        lines.append(f"  pages = {{{reference.pages}}},")
+    if reference.publisher:
+        lines.append(f"  publisher = {{{reference.publisher}}},")
+    if reference.doi:
+        lines.append(f"  doi = {{{reference.doi}}},")
+    if reference.url:
+        lines.append(f"  url = {{{reference.url}}},")
+
+    lines.append("}")
+
+    return '\n'.join(lines)
+
+
+def iter_references_bibtex(query) -> Iterator[str]:
+    """導出文獻（BibTeX，條目之間以空行分隔）"""
+    for index, reference in enumerate(_rows(query.order_by(Reference.id.asc()))):
+        yield ('\n\n' if index else '') + to_bibtex(reference)
+
+
+def iter_bibliography(entries: Iterable[str], fmt: str = 'text', style: str = 'apa') -> Iterator[str]:
+    """
+    輸出參考文獻列表（條目須已依格式排序並格式化）
+
+    Args:
+        entries: 格式化後的文獻字串
+        fmt: text（條目之間空一行）、html（懸掛縮排的段落）、markdown
+        style: 引用格式（標示於 HTML / Markdown）
+    """
+    if fmt == 'html':
+        yield f'<div class="bibliography" data-style="{html.escape(style)}">\n'
+        for entry in entries:
+            yield (
+                '  <p class="bibliography-entry" style="padding-left: 2em; text-indent: -2em;">'
+                f'{html.escape(entry)}</p>\n'
+            )
+        yield '</div>\n'
+    elif fmt == 'markdown':
+        yield f'# 參考文獻（{style.upper()}）\n\n'
+        for entry in entries:
+            yield f'{entry}\n\n'
+    else:
+        for index, entry in enumerate(entries):
+            yield ('\n\n' if index else '') + entry
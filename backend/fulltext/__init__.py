@@ -0,0 +1,37 @@
+"""
+全文檢索模組
+Full-text Search Module
+
+包含分詞器（CJK 二元組）、索引維護（flush 時同步）與依資料庫方言的檢索查詢
+"""
+
+import click
+from flask.cli import AppGroup
+
+from .indexer import reindex, remove_user_documents
+from .engine import search, search_ids
+from .tokenizer import Tokenizer, get_tokenizer, set_tokenizer
+
+
+fulltext_cli = AppGroup('fulltext', help='全文檢索索引管理')
+
+
+@fulltext_cli.command('reindex')
+@click.option('--user-id', type=int, default=None, help='只重建指定用戶')
+@click.option('--batch-size', type=int, default=500, help='每批寫入筆數')
+def reindex_command(user_id, batch_size):
+    """重建全文檢索索引"""
+    total = reindex(user_id=user_id, batch_size=batch_size)
+    click.echo(f'已建立 {total} 筆索引文件')
+
+
+def init_app(app):
+    """設定分詞器並註冊 CLI 指令"""
+    set_tokenizer(app.config.get('SEARCH_TOKENIZER', 'cjk_bigram'))
+    app.cli.add_command(fulltext_cli)
+
+
+__all__ = [
+    'init_app', 'reindex', 'remove_user_documents', 'search', 'search_ids',
+    'Tokenizer', 'get_tokenizer', 'set_tokenizer'
+]
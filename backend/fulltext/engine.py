@@ -0,0 +1,135 @@
+"""
+全文檢索查詢
+Full-text Search Engine
+
+依資料庫方言選擇檢索方式：
+- PostgreSQL：tsvector @@ tsquery，以 ts_rank 排序
+- SQLite：FTS5 MATCH，以 bm25 排序
+- 其他：退回 ILIKE 掃描 search_documents
+
+查詢字串與索引使用同一分詞器；每個詞組以片語（相鄰詞元）匹配，
+最後一個詞元做前綴匹配，以支援輸入中的搜尋。
+"""
+
+from typing import List
+
+from sqlalchemy import text, and_, or_
+
+from models import db, SearchDocument
+from .indexer import DOC_TYPES
+from .tokenizer import get_tokenizer
+
+# 標題與內文的 bm25 權重
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+_POSTGRES_SQL = text("""
+    SELECT doc_id FROM search_documents
+    WHERE user_id = :user_id
+      AND doc_type = :doc_type
+      AND search_vector @@ to_tsquery('simple', :tsquery)
+    ORDER BY ts_rank(search_vector, to_tsquery('simple', :tsquery)) DESC, updated_at DESC
+    LIMIT :limit
+""")
+
+_SQLITE_SQL = text(f"""
+    SELECT search_documents.doc_id FROM search_documents_fts
+    JOIN search_documents ON search_documents.id = search_documents_fts.rowid
+    WHERE search_documents_fts MATCH :match
+      AND search_documents.user_id = :user_id
+      AND search_documents.doc_type = :doc_type
+    ORDER BY bm25(search_documents_fts, {TITLE_WEIGHT}, {BODY_WEIGHT}), search_documents.updated_at DESC
+    LIMIT :limit
+""")
+
+
+def query_groups(query: str) -> List[List[str]]:
+    """將搜尋字串切分為詞組（每個詞組為相鄰詞元）"""
+    return get_tokenizer().segments(query)
+
+
+def _postgres_ids(user_id, doc_type, groups, limit):
+    # 詞組內以 <-> 相鄰匹配，詞組之間為 AND，最後一個詞元做前綴匹配
+    phrases = []
+    for group in groups:
+        terms = [f"'{term}'" for term in group]
+        terms[-1] += ':*'
+        phrases.append('(' + ' <-> '.join(terms) + ')')
+
+    rows = db.session.execute(_POSTGRES_SQL, {
+        'user_id': user_id, 'doc_type': doc_type, 'tsquery': ' & '.join(phrases), 'limit': limit
+    })
+    return [row[0] for row in rows]
+
+
+def _sqlite_ids(user_id, doc_type, groups, limit):
+    # FTS5 片語查詢："t1 t2"* 表示相鄰且最後一個詞元為前綴
+    match = ' '.join('"' + ' '.join(group) + '"*' for group in groups)
+    rows = db.session.execute(_SQLITE_SQL, {
+        'user_id': user_id, 'doc_type': doc_type, 'match': match, 'limit': limit
+    })
+    return [row[0] for row in rows]
+
+
+def _fallback_ids(user_id, doc_type, groups, limit):
+    conditions = []
+    for group in groups:
+        phrase = ' '.join(group)
+        conditions.append(or_(
+            SearchDocument.title.ilike(f'%{phrase}%'),
+            SearchDocument.body.ilike(f'%{phrase}%')
+        ))
+
+    rows = db.session.query(SearchDocument.doc_id).filter(
+        SearchDocument.user_id == user_id,
+        SearchDocument.doc_type == doc_type,
+        and_(*conditions)
+    ).order_by(SearchDocument.updated_at.desc()).limit(limit)
+    return [row[0] for row in rows]
+
+
+def search_ids(user_id: int, query: str, doc_type: str, limit: int = 20) -> List[int]:
+    """
+    依相關度搜尋文件 ID
+
+    Args:
+        user_id: 用戶 ID
+        query: 搜尋字串
+        doc_type: 文件類型（todo, note, reference）
+        limit: 最多返回筆數
+
+    Returns:
+        依相關度排序的來源資料 ID 列表
+    """
+    groups = query_groups(query)
+    if not groups:
+        return []
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return _postgres_ids(user_id, doc_type, groups, limit)
+    if dialect == 'sqlite':
+        return _sqlite_ids(user_id, doc_type, groups, limit)
+    return _fallback_ids(user_id, doc_type, groups, limit)
+
+
+def search(model, user_id: int, query: str, limit: int = 20) -> List:
+    """
+    搜尋並載入模型物件（依相關度排序）
+
+    Args:
+        model: Todo、Note 或 Reference
+        user_id: 用戶 ID
+        query: 搜尋字串
+        limit: 最多返回筆數
+
+    Returns:
+        模型物件列表
+    """
+    ids = search_ids(user_id, query, DOC_TYPES[model], limit)
+    if not ids:
+        return []
+
+    rows = model.query.filter(model.user_id == user_id, model.id.in_(ids)).all()
+    by_id = {row.id: row for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
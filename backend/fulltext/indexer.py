@@ -0,0 +1,164 @@
+"""
+全文檢索索引維護
+Full-text Index Maintenance
+
+功能：
+- 在 flush 時同步 Todo / Note / Reference 到 search_documents
+- 提供全量重建索引（reindex）
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, delete, insert, inspect
+from sqlalchemy.orm import Session
+
+from models import db, Todo, Note, Reference, SearchDocument
+from .tokenizer import get_tokenizer
+
+
+# 模型 -> (文件類型, 標題欄位, 內文欄位)
+INDEXED_MODELS = {
+    Todo: ('todo', 'title', ('description', 'tags')),
+    Note: ('note', 'title', ('content', 'tags', 'category')),
+    Reference: ('reference', 'title', ('authors', 'journal', 'year', 'tags', 'notes', 'doi')),
+}
+
+DOC_TYPES = {model: spec[0] for model, spec in INDEXED_MODELS.items()}
+
+
+def _field_text(value) -> str:
+    """將欄位值轉為可索引的文字"""
+    if not value:
+        return ''
+    if isinstance(value, list):
+        # 文獻作者：[{'last': ..., 'first': ...}, ...]
+        return ' '.join(
+            ' '.join(filter(None, [a.get('first'), a.get('last')])) if isinstance(a, dict) else str(a)
+            for a in value
+        )
+    # 標籤以逗號分隔
+    return str(value).replace(',', ' ')
+
+
+def build_document(obj) -> Optional[Dict]:
+    """
+    建立索引文件資料列（經分詞器處理）
+
+    Returns:
+        search_documents 的欄位字典，非索引模型返回 None
+    """
+    spec = INDEXED_MODELS.get(type(obj))
+    if not spec:
+        return None
+
+    doc_type, title_field, body_fields = spec
+    body = ' '.join(filter(None, (_field_text(getattr(obj, f)) for f in body_fields)))
+    tokenizer = get_tokenizer()
+
+    # 索引欄位存放分詞後的詞元，由資料庫全文檢索以空白切分
+    return {
+        'user_id': obj.user_id,
+        'doc_type': doc_type,
+        'doc_id': obj.id,
+        'title': tokenizer.index_text(_field_text(getattr(obj, title_field))),
+        'body': tokenizer.index_text(body),
+        'updated_at': datetime.utcnow()
+    }
+
+
+def _indexed_fields_changed(obj) -> bool:
+    """檢查索引相關欄位是否有變更"""
+    _, title_field, body_fields = INDEXED_MODELS[type(obj)]
+    state = inspect(obj)
+    return any(
+        state.attrs[field].history.has_changes()
+        for field in (title_field, 'user_id') + body_fields
+    )
+
+
+def write_documents(connection, upserts: List, deletes: List):
+    """
+    將物件的索引文件寫入資料庫（先刪後插）
+
+    Args:
+        connection: 資料庫連線
+        upserts: 需要新增或更新索引的物件
+        deletes: 需要移除索引的物件
+    """
+    table = SearchDocument.__table__
+
+    stale: Dict[str, List[int]] = {}
+    for obj in list(upserts) + list(deletes):
+        stale.setdefault(DOC_TYPES[type(obj)], []).append(obj.id)
+
+    for doc_type, ids in stale.items():
+        connection.execute(
+            delete(table).where(table.c.doc_type == doc_type, table.c.doc_id.in_(ids))
+        )
+
+    rows = [build_document(obj) for obj in upserts]
+    if rows:
+        connection.execute(insert(table), rows)
+
+
+def _after_flush(session, flush_context):
+    """flush 後同步索引（與資料變更位於同一交易）"""
+    upserts = [obj for obj in session.new if type(obj) in INDEXED_MODELS]
+    upserts += [
+        obj for obj in session.dirty
+        if type(obj) in INDEXED_MODELS and _indexed_fields_changed(obj)
+    ]
+    deletes = [obj for obj in session.deleted if type(obj) in INDEXED_MODELS]
+
+    if upserts or deletes:
+        write_documents(session.connection(), upserts, deletes)
+
+
+event.listen(Session, 'after_flush', _after_flush)
+
+
+def remove_user_documents(user_id: int):
+    """移除用戶的所有索引文件（用於批次刪除等繞過 ORM 事件的操作）"""
+    SearchDocument.query.filter_by(user_id=user_id).delete()
+
+
+def reindex(user_id: int = None, batch_size: int = 500) -> int:
+    """
+    重建全文檢索索引
+
+    Args:
+        user_id: 只重建指定用戶（可選）
+        batch_size: 每批寫入筆數
+
+    Returns:
+        寫入的索引文件數
+    """
+    table = SearchDocument.__table__
+    connection = db.session.connection()
+
+    stmt = delete(table)
+    if user_id is not None:
+        stmt = stmt.where(table.c.user_id == user_id)
+    connection.execute(stmt)
+
+    total = 0
+    for model in INDEXED_MODELS:
+        query = model.query
+        if user_id is not None:
+            query = query.filter_by(user_id=user_id)
+
+        batch = []
+        for obj in query.yield_per(batch_size):
+            batch.append(build_document(obj))
+            if len(batch) >= batch_size:
+                connection.execute(insert(table), batch)
+                total += len(batch)
+                batch = []
+
+        if batch:
+            connection.execute(insert(table), batch)
+            total += len(batch)
+
+    db.session.commit()
+    return total
@@ -0,0 +1,128 @@
+"""
+分詞模組
+Tokenizer Module
+
+索引建立與搜尋查詢共用同一個分詞器：
+- 中日韓文字切為重疊二元組（bigram）：「機器學習」-> 機器 器學 學習
+- 拉丁文字切為單字，轉小寫並做簡易詞幹化
+"""
+
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, Type
+
+# 中日韓文字範圍（CJK 統一表意文字、擴充 A、相容表意文字、假名、諺文）
+_CJK_RANGES = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\u3040-\u30ff\uac00-\ud7af'
+
+# 一次掃描切出 CJK 區段或拉丁單字
+_SEGMENT_PATTERN = re.compile(rf'([{_CJK_RANGES}]+)|([^\W_{_CJK_RANGES}]+)')
+
+
+class Tokenizer(ABC):
+    """分詞器基類（子類別實作 segments）"""
+
+    name = 'base'
+
+    @abstractmethod
+    def segments(self, text: str) -> List[List[str]]:
+        """
+        將文字切為詞組
+
+        每個詞組是一串相鄰的詞元，查詢時以片語（相鄰）方式匹配
+
+        Returns:
+            詞組列表
+        """
+
+    def tokenize(self, text: str) -> List[str]:
+        """將文字切為詞元列表"""
+        return [token for group in self.segments(text) for token in group]
+
+    def index_text(self, text: str) -> str:
+        """產生寫入索引的詞元字串（以空白分隔）"""
+        if not text:
+            return ''
+        return ' '.join(self.tokenize(text))
+
+
+class WordTokenizer(Tokenizer):
+    """以單字切分（CJK 連續文字視為一個詞）"""
+
+    name = 'word'
+
+    def segments(self, text: str) -> List[List[str]]:
+        if not text:
+            return []
+        return [[match.group(0).lower()] for match in _SEGMENT_PATTERN.finditer(text)]
+
+
+class CJKBigramTokenizer(Tokenizer):
+    """CJK 二元組 + 拉丁單字詞幹分詞器"""
+
+    name = 'cjk_bigram'
+
+    def segments(self, text: str) -> List[List[str]]:
+        if not text:
+            return []
+
+        groups = []
+        for match in _SEGMENT_PATTERN.finditer(text):
+            cjk, word = match.groups()
+            if cjk:
+                groups.append(self.bigrams(cjk))
+            else:
+                groups.append([self.stem(word.lower())])
+        return groups
+
+    @staticmethod
+    def bigrams(run: str) -> List[str]:
+        """將 CJK 連續文字切為重疊二元組（單字則保留單字）"""
+        if len(run) == 1:
+            return [run]
+        return [run[i:i + 2] for i in range(len(run) - 1)]
+
+    @staticmethod
+    def stem(word: str) -> str:
+        """簡易英文詞幹化（去除常見字尾）"""
+        if not word.isascii() or len(word) <= 3:
+            return word
+        if word.endswith('ies') and len(word) > 4:
+            return word[:-3] + 'y'
+        if word.endswith('sses'):
+            return word[:-2]
+        if word.endswith('ing') and len(word) > 5:
+            return word[:-3]
+        if word.endswith('ed') and len(word) > 4:
+            return word[:-2]
+        if word.endswith('s') and not word.endswith('ss'):
+            return word[:-1]
+        return word
+
+
+TOKENIZERS: Dict[str, Type[Tokenizer]] = {
+    WordTokenizer.name: WordTokenizer,
+    CJKBigramTokenizer.name: CJKBigramTokenizer,
+}
+
+_tokenizer: Tokenizer = CJKBigramTokenizer()
+
+
+def get_tokenizer() -> Tokenizer:
+    """取得目前使用的分詞器"""
+    return _tokenizer
+
+
+def set_tokenizer(name: str):
+    """
+    設定分詞器（更換後需執行 flask fulltext reindex）
+
+    Args:
+        name: 分詞器名稱（'cjk_bigram', 'word'）
+    """
+    global _tokenizer
+
+    tokenizer_class = TOKENIZERS.get(name)
+    if not tokenizer_class:
+        raise ValueError(f"不支援的分詞器: {name}")
+
+    _tokenizer = tokenizer_class()
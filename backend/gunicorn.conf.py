@@ -5,11 +5,31 @@ Production WSGI Server Configuration
 
 import os
 
+# 部署模式（GUNICORN_PROFILE）：
+# - gthread（預設）：每個 worker 以多個執行緒處理請求，等待 CrossRef 等外部 API 時不會擋住其他用戶
+# - gevent：協程 worker，適合大量等待外部 API 的請求（需另外安裝 gevent）
+# - sync：每個 worker 一次只處理一個請求
+# 連線池大小由 config.py 依相同環境變數計算
+profile = os.getenv("GUNICORN_PROFILE", "gthread")
+
+if profile == "gevent":
+    # preload 時應用在 master 載入，需在載入前完成 monkey patch，
+    # 否則 master 建立的鎖與連線不會切換為協程版本
+    from gevent import monkey
+    monkey.patch_all()
+
 # Worker 進程數 (Render 免費方案限制 512MB RAM，使用 2 個 worker)
 workers = int(os.getenv("WEB_CONCURRENCY", 2))
 
 # Worker 類型
-worker_class = "sync"
+if profile == "gthread":
+    worker_class = "gthread"
+    threads = int(os.getenv("GUNICORN_THREADS", 4))
+elif profile == "gevent":
+    worker_class = "gevent"
+    worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 100))
+else:
+    worker_class = "sync"
 
 # 綁定地址
 bind = "0.0.0.0:5000"
@@ -26,9 +46,26 @@ loglevel = "info"
 # 優雅重啟
 graceful_timeout = 30
 
-# 記憶體優化：不預載應用（減少記憶體使用）
-preload_app = False
+# 預載應用：master 載入一次後 fork，worker 以寫入時複製共用已載入的模組，
+# 啟動與 max_requests 回收時不必重新 import（設定 GUNICORN_PRELOAD=0 可停用）
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") != "0"
 
 # 最大請求數（自動重啟 worker 釋放記憶體）
 max_requests = 1000
 max_requests_jitter = 50
+
+
+def post_fork(server, worker):
+    """
+    preload 時資料庫連線池建立於 master，子進程不可沿用繼承的連線：
+    fork 後丟棄連線池（close=False 不關閉 master 仍持有的連線），由 worker 重新連線
+    """
+    if not server.cfg.preload_app:
+        return
+
+    from models import db
+
+    app = server.app.wsgi()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
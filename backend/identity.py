@@ -0,0 +1,101 @@
+"""
+當前用戶
+Current User Identity
+
+大多數路由只需要 get_jwt_identity()，因此不在每個請求以 user_lookup_loader 查詢用戶；
+路由實際用到用戶資料時才透過 current_user 載入：
+- 用戶欄位保存於每個 worker 的 LRU 快取（含 TTL），命中時不查詢資料庫
+- 同一請求內只載入一次
+- 用戶資料變更並提交後自動失效（/api/auth/me PUT、修改 / 重設密碼、刪除帳號）
+"""
+
+from itertools import chain
+from typing import Dict, Optional
+
+from flask import g, has_request_context
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from werkzeug.local import LocalProxy
+
+from cache import TTLCache
+from models import db, User
+
+# 每個 worker 各自快取；跨 worker 的一致性由 TTL 保證（寫入路徑需直接查詢資料庫）
+user_cache = TTLCache(maxsize=1024, ttl=60)
+
+_DIRTY_USERS_KEY = 'identity_dirty_users'
+_USER_COLUMNS = tuple(column.key for column in inspect(User).column_attrs)
+
+
+def _user_values(user: User) -> Dict:
+    return {key: getattr(user, key) for key in _USER_COLUMNS}
+
+
+def get_user(user_id: int) -> Optional[User]:
+    """
+    取得用戶（優先讀取快取）
+
+    快取命中時以快取欄位建立物件並併入 session（不查詢資料庫），
+    返回的物件與查詢結果相同，可存取關聯或修改後提交
+    """
+    values = user_cache.get(user_id)
+    if values is None:
+        user = db.session.get(User, user_id)
+        if user is not None:
+            user_cache.set(user_id, _user_values(user))
+        return user
+
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+
+def cached_user_field(user_id: int, key: str):
+    """讀取單一用戶欄位（不需要 ORM 物件時使用，例如時區）"""
+    values = user_cache.get(user_id)
+    if values is None:
+        user = get_user(user_id)
+        return getattr(user, key) if user is not None else None
+    return values.get(key)
+
+
+def _load_current_user() -> Optional[User]:
+    """載入 JWT 身分對應的用戶（同一請求內只載入一次）"""
+    if '_current_user' not in g:
+        identity = get_jwt_identity() if has_request_context() else None
+        g._current_user = get_user(int(identity)) if identity is not None else None
+    return g._current_user
+
+
+# 需在 @jwt_required() 保護的路由內使用；用戶不存在時為 None
+current_user: User = LocalProxy(_load_current_user)
+
+
+def _collect_dirty_users(session, flush_context):
+    """flush 時記錄資料有變更的用戶"""
+    users = session.info.setdefault(_DIRTY_USERS_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            users.add(obj.id)
+
+
+def _invalidate_after_commit(session):
+    """提交後使相關用戶的快取失效"""
+    for user_id in session.info.pop(_DIRTY_USERS_KEY, ()):
+        user_cache.invalidate(user_id)
+
+
+def _discard_after_rollback(session):
+    session.info.pop(_DIRTY_USERS_KEY, None)
+
+
+event.listen(Session, 'after_flush', _collect_dirty_users)
+event.listen(Session, 'after_commit', _invalidate_after_commit)
+event.listen(Session, 'after_rollback', _discard_after_rollback)
+
+
+def init_app(app):
+    """套用快取設定"""
+    user_cache.maxsize = app.config.get('USER_CACHE_SIZE', 1024)
+    user_cache.ttl = app.config.get('USER_CACHE_TTL', 60)
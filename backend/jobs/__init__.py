@@ -0,0 +1,36 @@
+"""
+背景工作模組
+Background Jobs Module
+
+以資料庫作為佇列（不需外部 broker），由獨立的 worker 進程執行耗時工作
+"""
+
+import click
+from flask.cli import AppGroup
+
+from .queue import register, periodic, enqueue, find_active, claim_next, requeue_stale, ACTIVE_STATUSES
+from .worker import run_job, run_worker
+from . import export, enrichment, maintenance
+
+
+jobs_cli = AppGroup('jobs', help='背景工作管理')
+
+
+@jobs_cli.command('worker')
+@click.option('--poll-interval', type=float, default=None, help='佇列為空時的等待秒數')
+@click.option('--once', is_flag=True, help='處理完目前佇列即結束')
+def worker_command(poll_interval, once):
+    """啟動背景工作執行器"""
+    processed = run_worker(poll_interval=poll_interval, once=once)
+    click.echo(f'已處理 {processed} 個工作')
+
+
+def init_app(app):
+    """註冊 CLI 指令"""
+    app.cli.add_command(jobs_cli)
+
+
+__all__ = [
+    'init_app', 'ACTIVE_STATUSES', 'register', 'periodic', 'enqueue', 'find_active', 'claim_next',
+    'requeue_stale', 'run_job', 'run_worker', 'export', 'enrichment'
+]
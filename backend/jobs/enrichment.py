@@ -0,0 +1,77 @@
+"""
+背景文獻補全
+Background Reference Enrichment
+
+解析端點先以本地解析結果建立文獻並立即返回，
+補全（CrossRef / OpenAlex 查詢）由 worker 執行後更新該筆文獻。
+查詢受速率限制時等待額度恢復後拋出，由 worker 放回佇列重試（計入 JOB_MAX_ATTEMPTS）。
+"""
+
+import time
+
+from models import Reference
+from references import ReferenceParser, RateLimited, get_api_client, find_duplicate
+from .queue import register
+
+ENRICH_REFERENCE = 'enrich_reference'
+
+# 受速率限制時重試前的最長等待秒數
+RATE_LIMIT_MAX_SLEEP = 60
+
+# 補全後更新的欄位
+ENRICHED_FIELDS = (
+    'title', 'authors', 'year', 'journal', 'volume', 'issue', 'pages', 'publisher', 'doi', 'url'
+)
+
+parser = ReferenceParser()
+
+
+def reference_data(reference: Reference) -> dict:
+    """將文獻轉為解析結果格式（未解析出標題時以原文暫代，補全時視為缺少）"""
+    data = {field: getattr(reference, field) for field in ENRICHED_FIELDS}
+    if reference.title == reference.original_text:
+        data['title'] = None
+    data['type'] = reference.reference_type
+    return data
+
+
+@register(ENRICH_REFERENCE)
+def enrich_reference(job) -> dict:
+    """補全文獻並更新完整度與信心度"""
+    reference_id = job.payload['reference_id']
+    reference = Reference.query.filter_by(id=reference_id, user_id=job.user_id).first()
+    if reference is None:
+        # 補全前已被刪除
+        return {'reference_id': reference_id, 'enriched': False, 'deleted': True}
+
+    try:
+        enriched = get_api_client().enrich_reference(reference_data(reference))
+    except RateLimited as e:
+        # 背景工作不佔用 web worker，可等待到額度恢復再放回佇列
+        time.sleep(min(e.retry_after, RATE_LIMIT_MAX_SLEEP))
+        raise
+
+    duplicate = None
+    if enriched['enriched']:
+        # 補全出的 DOI 已屬於同一用戶的另一筆文獻時不寫入 DOI（唯一索引）
+        if enriched.get('doi') and enriched['doi'] != reference.doi:
+            duplicate = find_duplicate(job.user_id, {'doi': enriched['doi']}, exclude_id=reference.id)
+
+        for field in ENRICHED_FIELDS:
+            if field == 'doi' and duplicate is not None:
+                continue
+            if enriched.get(field):
+                setattr(reference, field, enriched[field])
+
+    reference.enriched = enriched['enriched']
+    reference.completeness = parser.calculate_completeness(enriched)
+    reference.confidence = parser.calculate_confidence(enriched)
+
+    result = {
+        'reference_id': reference_id,
+        'enriched': enriched['enriched'],
+        'source': enriched.get('enrichment_source')
+    }
+    if duplicate is not None:
+        result['duplicate_of'] = duplicate.id
+    return result
@@ -0,0 +1,83 @@
+"""
+非同步導出工作
+Asynchronous Export Jobs
+
+將完整帳號導出（JSON）寫入 gzip 壓縮檔，保存於 EXPORT_DIR/<user_id>/<job_id>.json.gz，
+逾期（EXPORT_RETENTION_HOURS）後由 worker 清除。
+"""
+
+import gzip
+import os
+import shutil
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from models import db, User, BackgroundJob
+import exporter
+from .queue import register, periodic
+
+EXPORT_ALL = 'export_all'
+
+
+def _user_dir(user_id: int) -> str:
+    return os.path.join(current_app.config['EXPORT_DIR'], str(user_id))
+
+
+def artifact_path(job: BackgroundJob) -> str:
+    """導出檔案路徑"""
+    return os.path.join(_user_dir(job.user_id), f'{job.id}.json.gz')
+
+
+def remove_user_artifacts(user_id: int):
+    """刪除用戶所有導出檔案"""
+    shutil.rmtree(_user_dir(user_id), ignore_errors=True)
+
+
+@register(EXPORT_ALL)
+def export_all(job: BackgroundJob) -> dict:
+    """導出用戶所有數據並壓縮"""
+    user = db.session.get(User, job.user_id)
+    if user is None:
+        raise LookupError('用戶不存在')
+
+    path = artifact_path(job)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # 先寫入暫存檔，完成後再改名，下載端不會讀到寫到一半的檔案
+    temp_path = f'{path}.tmp'
+    try:
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+            for chunk in exporter.buffered(exporter.iter_all_json(user)):
+                f.write(chunk)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return {
+        'filename': f"gradpilot_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json.gz",
+        'size': os.path.getsize(path)
+    }
+
+
+@periodic
+def expire_exports():
+    """刪除逾期的導出檔案，工作狀態改為 expired"""
+    retention = current_app.config.get('EXPORT_RETENTION_HOURS', 24)
+    cutoff = datetime.utcnow() - timedelta(hours=retention)
+
+    jobs = BackgroundJob.query.filter(
+        BackgroundJob.kind == EXPORT_ALL,
+        BackgroundJob.status == 'succeeded',
+        BackgroundJob.finished_at < cutoff
+    ).all()
+
+    for job in jobs:
+        path = artifact_path(job)
+        if os.path.exists(path):
+            os.remove(path)
+        job.status = 'expired'
+
+    db.session.commit()
+    return len(jobs)
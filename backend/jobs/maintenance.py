@@ -0,0 +1,16 @@
+"""
+定期維護工作
+Periodic Maintenance
+
+由 worker 閒置時執行
+"""
+
+from models import db
+from references import MetadataCache
+from .queue import periodic
+
+
+@periodic
+def purge_metadata_cache():
+    """刪除過期的文獻元數據快取"""
+    return MetadataCache(db.engine).purge_expired()
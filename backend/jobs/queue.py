@@ -0,0 +1,121 @@
+"""
+工作佇列
+Database-backed Job Queue
+
+以 background_jobs 資料表作為佇列：
+- PostgreSQL：SELECT ... FOR UPDATE SKIP LOCKED 取出，多個 worker 互不阻塞
+- SQLite：以條件式 UPDATE（status 仍為 pending 才更新）樂觀搶占
+"""
+
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import case, select, update
+
+from models import db, BackgroundJob
+
+# 工作種類 -> 處理函式（接收 BackgroundJob，返回可序列化為 JSON 的結果）
+HANDLERS: Dict[str, Callable] = {}
+
+# worker 閒置時定期執行的維護工作（例如清除過期檔案）
+PERIODIC_TASKS: List[Callable] = []
+
+ACTIVE_STATUSES = ('pending', 'running')
+
+
+def register(kind: str):
+    """註冊工作處理函式"""
+    def decorator(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return decorator
+
+
+def periodic(fn):
+    """註冊維護工作"""
+    PERIODIC_TASKS.append(fn)
+    return fn
+
+
+def get_handler(kind: str) -> Optional[Callable]:
+    return HANDLERS.get(kind)
+
+
+def enqueue(kind: str, user_id: int, payload: dict = None) -> BackgroundJob:
+    """新增工作（由呼叫端 commit）"""
+    job = BackgroundJob(kind=kind, user_id=user_id, payload=payload or {}, status='pending')
+    db.session.add(job)
+    return job
+
+
+def find_active(kind: str, user_id: int) -> Optional[BackgroundJob]:
+    """查詢用戶尚未完成的同種工作"""
+    return BackgroundJob.query.filter(
+        BackgroundJob.kind == kind,
+        BackgroundJob.user_id == user_id,
+        BackgroundJob.status.in_(ACTIVE_STATUSES)
+    ).order_by(BackgroundJob.created_at.desc()).first()
+
+
+def claim_next() -> Optional[BackgroundJob]:
+    """
+    取出最早的待處理工作並標記為執行中
+
+    Returns:
+        取得的工作；佇列為空或被其他 worker 搶先時返回 None
+    """
+    stmt = (
+        select(BackgroundJob.id)
+        .where(BackgroundJob.status == 'pending')
+        .order_by(BackgroundJob.created_at.asc(), BackgroundJob.id.asc())
+        .limit(1)
+    )
+    if db.session.get_bind().dialect.name == 'postgresql':
+        stmt = stmt.with_for_update(skip_locked=True)
+
+    job_id = db.session.execute(stmt).scalar()
+    if job_id is None:
+        db.session.rollback()
+        return None
+
+    claimed = db.session.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.id == job_id, BackgroundJob.status == 'pending')
+        .values(
+            status='running',
+            started_at=datetime.utcnow(),
+            attempts=BackgroundJob.attempts + 1
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+
+    if not claimed:
+        return None
+    return db.session.get(BackgroundJob, job_id)
+
+
+def requeue_stale(timeout: int, max_attempts: int) -> int:
+    """
+    處理執行逾時（worker 中途終止，例如導出時被 OOM 終止）的工作
+
+    未達 max_attempts 次的放回佇列；已達上限者標記為 failed，
+    避免每次重新執行都使 worker 終止而無限重試
+
+    Returns:
+        放回佇列或標記為失敗的工作數
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=timeout)
+    exhausted = BackgroundJob.attempts >= max_attempts
+    count = db.session.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.status == 'running', BackgroundJob.started_at < cutoff)
+        .values(
+            status=case((exhausted, 'failed'), else_='pending'),
+            finished_at=case((exhausted, datetime.utcnow()), else_=BackgroundJob.finished_at),
+            error=case((exhausted, 'worker terminated'), else_=BackgroundJob.error)
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return count
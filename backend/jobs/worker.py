@@ -0,0 +1,114 @@
+"""
+背景工作執行器
+Job Worker
+
+以獨立進程執行（flask jobs worker），與 gunicorn web worker 分開，
+長時間工作不會佔用處理互動請求的 worker。
+"""
+
+import logging
+import signal
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+
+from models import db, BackgroundJob
+from .queue import claim_next, get_handler, requeue_stale, PERIODIC_TASKS
+
+logger = logging.getLogger(__name__)
+
+
+def run_job(job: BackgroundJob) -> BackgroundJob:
+    """執行單一工作並記錄結果；失敗時在重試次數內放回佇列"""
+    job_id = job.id
+    max_attempts = current_app.config.get('JOB_MAX_ATTEMPTS', 3)
+    handler = get_handler(job.kind)
+
+    try:
+        if handler is None:
+            raise LookupError(f'未註冊的工作種類: {job.kind}')
+        result = handler(job)
+    except Exception as e:
+        logger.exception('Job %s (%s) failed', job_id, job.kind)
+        db.session.rollback()
+        job = db.session.get(BackgroundJob, job_id)
+        job.error = str(e)
+        if handler is not None and job.attempts < max_attempts:
+            job.status = 'pending'
+        else:
+            job.status = 'failed'
+            job.finished_at = datetime.utcnow()
+    else:
+        job.status = 'succeeded'
+        job.result = result
+        job.error = None
+        job.finished_at = datetime.utcnow()
+
+    db.session.commit()
+    return job
+
+
+def run_periodic_tasks():
+    """執行維護工作（單一工作失敗不影響其他工作）"""
+    for task in PERIODIC_TASKS:
+        try:
+            task()
+        except Exception:
+            logger.exception('Periodic task %s failed', task.__name__)
+            db.session.rollback()
+
+
+def run_worker(poll_interval: float = None, once: bool = False) -> int:
+    """
+    持續處理佇列中的工作
+
+    Args:
+        poll_interval: 佇列為空時的等待秒數
+        once: 處理完目前佇列即結束
+
+    Returns:
+        處理的工作數
+    """
+    config = current_app.config
+    poll_interval = poll_interval or config.get('JOB_POLL_INTERVAL', 2)
+    timeout = config.get('JOB_TIMEOUT', 600)
+    max_attempts = config.get('JOB_MAX_ATTEMPTS', 3)
+    maintenance_interval = config.get('JOB_MAINTENANCE_INTERVAL', 300)
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    # 收到終止訊號時完成目前工作後再結束（訊號處理只能在主執行緒註冊）
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+    processed = 0
+    last_maintenance = 0.0
+    while not stopping:
+        if time.monotonic() - last_maintenance >= maintenance_interval:
+            stale = requeue_stale(timeout, max_attempts)
+            if stale:
+                logger.warning('Requeued or failed %s stale job(s)', stale)
+            run_periodic_tasks()
+            last_maintenance = time.monotonic()
+
+        job = claim_next()
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        logger.info('Running job %s (%s)', job.id, job.kind)
+        job = run_job(job)
+        logger.info('Job %s %s', job.id, job.status)
+        processed += 1
+        db.session.remove()
+
+    return processed
@@ -13,5 +13,11 @@ from .todo import Todo
 from .note import Note
 from .pomodoro import PomodoroSession
 from .reference import Reference
+from .search_document import SearchDocument
+from .focus_rollup import DailyFocusRollup
+from .job import BackgroundJob
+from .metadata_cache import MetadataCacheEntry
+from .formatted_citation import FormattedCitation
+from .dashboard_version import DashboardVersion
 
-__all__ = ['db', 'User', 'Todo', 'Note', 'PomodoroSession', 'Reference']
+__all__ = ['db', 'User', 'Todo', 'Note', 'PomodoroSession', 'Reference', 'SearchDocument', 'DailyFocusRollup', 'BackgroundJob', 'MetadataCacheEntry', 'FormattedCitation', 'DashboardVersion']
@@ -0,0 +1,22 @@
+"""
+儀表板版本模型
+Dashboard Version Model
+
+每位用戶一列，待辦、筆記、番茄鐘或用戶資料變更時於同一交易內遞增；
+各 worker 的儀表板快取與版本一同保存，讀取時比對版本，其他 worker 提交的變更也能使快取失效。
+"""
+
+from . import db
+
+
+class DashboardVersion(db.Model):
+    """儀表板版本資料表"""
+
+    __tablename__ = 'dashboard_versions'
+
+    # 不設外鍵：刪除帳號時同一次 flush 內仍會遞增該用戶的版本
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<DashboardVersion {self.user_id} {self.version}>'
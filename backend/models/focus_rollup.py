@@ -0,0 +1,37 @@
+"""
+每日專注彙總模型
+Daily Focus Rollup Model
+
+每位用戶每天一列，於記錄番茄鐘時累加，統計端點只需讀取彙總列。
+"""
+
+from . import db
+
+
+class DailyFocusRollup(db.Model):
+    """每日專注彙總資料表"""
+
+    __tablename__ = 'daily_focus_rollup'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'date', name='uq_daily_focus_rollup_user_date'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+
+    # 日期與彙總
+    date = db.Column(db.Date, nullable=False)
+    sessions = db.Column(db.Integer, nullable=False, default=0)  # 完成的專注次數
+    minutes = db.Column(db.Integer, nullable=False, default=0)  # 專注分鐘數
+
+    def to_dict(self):
+        """轉換為字典"""
+        return {
+            'date': self.date.isoformat() if self.date else None,
+            'sessions': self.sessions,
+            'minutes': self.minutes,
+            'hours': round(self.minutes / 60, 1)
+        }
+
+    def __repr__(self):
+        return f'<DailyFocusRollup {self.user_id} {self.date}>'
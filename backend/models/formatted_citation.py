@@ -0,0 +1,32 @@
+"""
+格式化引用快取模型
+Formatted Citation Cache Model
+
+每筆文獻每種引用格式保存一份格式化結果，以內容雜湊判斷是否仍然有效，
+由 references.citations 維護。
+"""
+
+from . import db
+from datetime import datetime
+
+
+class FormattedCitation(db.Model):
+    """格式化引用快取資料表"""
+
+    __tablename__ = 'formatted_citations'
+    __table_args__ = (
+        db.UniqueConstraint('reference_id', 'style', name='uq_formatted_citations_reference_style'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    reference_id = db.Column(db.Integer, db.ForeignKey('references.id', ondelete='CASCADE'), nullable=False)
+    style = db.Column(db.String(20), nullable=False)  # apa, mla, chicago, harvard
+
+    # 格式化時的文獻內容雜湊，與目前內容不同即視為失效
+    content_hash = db.Column(db.String(40), nullable=False)
+    text = db.Column(db.Text, nullable=False)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<FormattedCitation {self.reference_id}:{self.style}>'
@@ -0,0 +1,51 @@
+"""
+背景工作模型
+Background Job Model
+
+以資料庫作為工作佇列（不需外部 broker），由 `flask jobs worker` 取出執行。
+"""
+
+from . import db
+from datetime import datetime
+
+
+class BackgroundJob(db.Model):
+    """背景工作資料表"""
+
+    __tablename__ = 'background_jobs'
+    __table_args__ = (
+        db.Index('ix_background_jobs_status_created', 'status', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+
+    # 工作內容
+    kind = db.Column(db.String(50), nullable=False)  # 例如：export_all
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, running, succeeded, failed
+    payload = db.Column(db.JSON, default=dict)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+
+    # 時間戳
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        """轉換為字典"""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'attempts': self.attempts,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def __repr__(self):
+        return f'<BackgroundJob {self.id} {self.kind} {self.status}>'
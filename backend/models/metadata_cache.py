@@ -0,0 +1,32 @@
+"""
+文獻元數據快取模型
+Reference Metadata Cache Model
+
+快取 CrossRef 查詢結果（跨用戶共用），以正規化 DOI 或正規化的標題+作者查詢為鍵；
+查無結果（404 / 無符合項目）亦會以較短的 TTL 快取。
+"""
+
+from . import db
+from datetime import datetime
+
+
+class MetadataCacheEntry(db.Model):
+    """文獻元數據快取資料表"""
+
+    __tablename__ = 'metadata_cache'
+
+    id = db.Column(db.Integer, primary_key=True)
+    cache_key = db.Column(db.String(512), nullable=False, unique=True)  # doi:<doi> 或 query:<sha1>
+    kind = db.Column(db.String(20), nullable=False)  # doi, query
+
+    # 快取內容（negative 為 True 時 payload 為空）
+    payload = db.Column(db.JSON)
+    negative = db.Column(db.Boolean, nullable=False, default=False)
+    hits = db.Column(db.Integer, nullable=False, default=0)
+
+    # 時間戳
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<MetadataCacheEntry {self.cache_key}>'
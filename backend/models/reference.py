@@ -11,6 +11,12 @@ class Reference(db.Model):
     """文獻資料表"""
 
     __tablename__ = 'references'
+    __table_args__ = (
+        # 同一用戶的 DOI 不可重複（未填 DOI 為 NULL，不受限制）；
+        # 兩個複合索引皆以 user_id 開頭，同時涵蓋依用戶篩選的查詢
+        db.Index('uq_references_user_doi', 'user_id', 'normalized_doi', unique=True),
+        db.Index('ix_references_user_fingerprint', 'user_id', 'fingerprint'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -31,6 +37,10 @@ class Reference(db.Model):
     doi = db.Column(db.String(255), index=True)
     url = db.Column(db.Text)
 
+    # 重複偵測（由 references.dedupe 於寫入時計算）
+    normalized_doi = db.Column(db.String(255))  # 去除前綴並轉小寫的 DOI
+    fingerprint = db.Column(db.String(40))  # 標題 + 第一作者 + 年份的雜湊
+
     # 類型與分類
     reference_type = db.Column(db.String(50), default='article')  # article, book, website, conference
     tags = db.Column(db.Text)  # 逗號分隔的標籤
@@ -48,6 +58,11 @@ class Reference(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # 格式化引用快取
+    formatted_citations = db.relationship(
+        'FormattedCitation', backref='reference', lazy=True, cascade='all, delete-orphan'
+    )
+
     def to_dict(self):
         """轉換為字典"""
         return {
@@ -0,0 +1,80 @@
+"""
+全文檢索文件模型
+Search Document Model
+
+每一筆待辦、筆記、文獻在此表中對應一筆索引文件，
+由 fulltext.indexer 在 flush 時自動維護。
+- PostgreSQL：以 tsvector 生成欄位 + GIN 索引
+- SQLite：以 FTS5 外部內容虛擬表 + 觸發器同步
+"""
+
+from . import db
+from datetime import datetime
+from sqlalchemy import event, DDL
+
+
+class SearchDocument(db.Model):
+    """全文檢索文件資料表"""
+
+    __tablename__ = 'search_documents'
+    __table_args__ = (
+        db.UniqueConstraint('doc_type', 'doc_id', name='uq_search_documents_doc'),
+        db.Index('ix_search_documents_user_type', 'user_id', 'doc_type'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    # 衍生索引表，不設外鍵，避免刪除用戶時 flush 順序衝突
+    user_id = db.Column(db.Integer, nullable=False)
+
+    # 來源資料
+    doc_type = db.Column(db.String(20), nullable=False)  # todo, note, reference
+    doc_id = db.Column(db.Integer, nullable=False)
+
+    # 索引內容（標題權重較高）
+    title = db.Column(db.Text)
+    body = db.Column(db.Text)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<SearchDocument {self.doc_type}:{self.doc_id}>'
+
+
+_table = SearchDocument.__table__
+
+# PostgreSQL：生成 tsvector 欄位與 GIN 索引
+event.listen(_table, 'after_create', DDL(
+    "ALTER TABLE search_documents ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(body, '')), 'B')"
+    ") STORED"
+).execute_if(dialect='postgresql'))
+event.listen(_table, 'after_create', DDL(
+    "CREATE INDEX ix_search_documents_search_vector "
+    "ON search_documents USING GIN (search_vector)"
+).execute_if(dialect='postgresql'))
+
+# SQLite：FTS5 外部內容表，以觸發器與 search_documents 保持同步
+_SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5("
+    "title, body, content='search_documents', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); "
+    "END",
+]
+for _statement in _SQLITE_FTS_DDL:
+    event.listen(_table, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+
+event.listen(_table, 'before_drop', DDL(
+    "DROP TABLE IF EXISTS search_documents_fts"
+).execute_if(dialect='sqlite'))
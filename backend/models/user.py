@@ -32,6 +32,8 @@ class User(db.Model):
     notes = db.relationship('Note', backref='user', lazy=True, cascade='all, delete-orphan')
     pomodoro_sessions = db.relationship('PomodoroSession', backref='user', lazy=True, cascade='all, delete-orphan')
     references = db.relationship('Reference', backref='user', lazy=True, cascade='all, delete-orphan')
+    focus_rollups = db.relationship('DailyFocusRollup', backref='user', lazy=True, cascade='all, delete-orphan')
+    background_jobs = db.relationship('BackgroundJob', backref='user', lazy=True, cascade='all, delete-orphan')
 
     def set_password(self, password):
         """設定密碼（加密）"""
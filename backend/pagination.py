@@ -0,0 +1,151 @@
+"""
+Keyset 分頁
+Keyset (Cursor) Pagination
+
+以排序鍵的最後一筆值作為游標，下一頁以 WHERE (k1, k2, ...) > (v1, v2, ...)
+的展開條件查詢，不使用 OFFSET，深翻頁成本與第一頁相同。
+游標為不透明字串（base64 編碼的 JSON），用戶端只需原樣回傳。
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime, date
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_, func
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class SortKey:
+    """排序鍵（最後一個排序鍵必須唯一，通常為 id）"""
+
+    def __init__(self, column, descending: bool = False, default=None):
+        """
+        Args:
+            column: 模型欄位
+            descending: 是否遞減排序
+            default: 欄位為 NULL 時的替代值（避免 NULL 破壞比較）
+        """
+        self.column = column
+        self.descending = descending
+        self.default = default
+
+    @property
+    def expression(self):
+        if self.default is None:
+            return self.column
+        return func.coalesce(self.column, self.default)
+
+    def value(self, obj):
+        value = getattr(obj, self.column.key)
+        return self.default if value is None else value
+
+    def order_by(self):
+        return self.expression.desc() if self.descending else self.expression.asc()
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+    return value
+
+
+def encode_cursor(values: Sequence) -> str:
+    """將排序鍵值編碼為游標"""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> List:
+    """解析游標，格式錯誤時拋出 ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError('無效的分頁游標')
+
+    if not isinstance(values, list):
+        raise ValueError('無效的分頁游標')
+    return [_decode_value(v) for v in values]
+
+
+def _after(keys: Sequence[SortKey], values: Sequence):
+    """產生「排在游標之後」的條件：(k1 > v1) OR (k1 = v1 AND k2 > v2) OR ..."""
+    clauses = []
+    for i, key in enumerate(keys):
+        equal = [keys[j].expression == values[j] for j in range(i)]
+        if isinstance(values[i], bool):
+            # 布林值只有兩種，「之後」即為另一個值（遞減時 True 在前）
+            if values[i] != key.descending:
+                continue
+            beyond = key.expression == (not values[i])
+        else:
+            beyond = key.expression < values[i] if key.descending else key.expression > values[i]
+        clauses.append(and_(*equal, beyond))
+    return or_(*clauses)
+
+
+def paginate(query, keys: Sequence[SortKey], limit: Optional[int] = None,
+             cursor: Optional[str] = None) -> Tuple[List, Optional[str]]:
+    """
+    以 keyset 方式分頁查詢
+
+    Args:
+        query: 已套用篩選條件的查詢
+        keys: 排序鍵（最後一個必須唯一）
+        limit: 每頁筆數，None 表示不分頁（返回全部）
+        cursor: 上一頁返回的游標
+
+    Returns:
+        (資料列表, 下一頁游標)，沒有下一頁時游標為 None
+    """
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(keys):
+            raise ValueError('無效的分頁游標')
+        query = query.filter(_after(keys, values))
+
+    query = query.order_by(*[key.order_by() for key in keys])
+
+    if limit is None:
+        return query.all(), None
+
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    items = query.limit(limit + 1).all()
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    return items, encode_cursor([key.value(items[-1]) for key in keys])
+
+
+def page_args(request, default_limit: Optional[int] = None) -> Tuple[Optional[int], Optional[str]]:
+    """
+    讀取分頁參數（limit, cursor）
+
+    只帶 cursor 時使用 DEFAULT_PAGE_SIZE；兩者皆無時使用 default_limit
+    """
+    cursor = request.args.get('cursor') or None
+    limit = request.args.get('limit', type=int)
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE if cursor else default_limit
+    return limit, cursor
+
+
+def cursor_headers(next_cursor: Optional[str]) -> dict:
+    """列表型回應以標頭返回下一頁游標"""
+    return {'X-Next-Cursor': next_cursor} if next_cursor else {}
@@ -5,8 +5,98 @@ References Module
 包含文獻解析、格式化和 API 查詢功能
 """
 
+import json
+import time
+
+import click
+from flask.cli import AppGroup
+
 from .parser import ReferenceParser
 from .formatter import ReferenceFormatter
-from .api_client import APIClient
+from .api_client import APIClient, ResourceNotFound
+from .cache import MetadataCache
+from .ratelimit import RateLimiter, RateLimited
+from .resolver import MultiSourceResolver
+from .normalize import normalize_doi, normalize_query
+from .service import get_api_client
+from .bulk import iter_parse
+from .importer import IMPORT_FORMATS, iter_records, import_references
+from .dedupe import find_duplicate, upsert_reference, merge_duplicates
+from . import citations
+
+
+references_cli = AppGroup('references', help='文獻管理')
+
+
+@references_cli.command('parse-bulk')
+@click.argument('input_file', type=click.File('r', encoding='utf-8'), default='-')
+@click.option('--output', '-o', type=click.File('w', encoding='utf-8'), default='-', help='輸出檔（NDJSON，預設為標準輸出）')
+@click.option('--workers', type=int, default=None, help='工作進程數')
+@click.option('--chunk-size', type=int, default=None, help='每個區塊的筆數')
+def parse_bulk_command(input_file, output, workers, chunk_size):
+    """大量解析文獻（每行一筆），結果依輸入順序輸出為 NDJSON"""
+    from flask import current_app
+
+    started = time.perf_counter()
+    count = 0
+    for parsed in iter_parse(
+        input_file,
+        workers=workers or current_app.config.get('BULK_PARSE_WORKERS'),
+        chunk_size=chunk_size or current_app.config.get('BULK_PARSE_CHUNK_SIZE', 500)
+    ):
+        output.write(json.dumps(parsed, ensure_ascii=False) + '\n')
+        count += 1
+
+    seconds = time.perf_counter() - started
+    rate = count / seconds if seconds else 0
+    click.echo(f'已解析 {count} 筆文獻，耗時 {seconds:.2f} 秒（{rate:.0f} 筆/秒）', err=True)
+
+
+@references_cli.command('import')
+@click.argument('input_file', type=click.File('r', encoding='utf-8-sig', errors='replace'))
+@click.option('--user-id', type=int, required=True, help='匯入的目標用戶')
+@click.option('--format', 'fmt', type=click.Choice(IMPORT_FORMATS), default=None, help='檔案格式（預設依副檔名或內容判斷）')
+@click.option('--batch-size', type=int, default=None, help='每批寫入筆數')
+def import_command(input_file, user_id, fmt, batch_size):
+    """從 BibTeX / RIS 檔案匯入文獻"""
+    from flask import current_app
+
+    try:
+        records = iter_records(input_file, fmt=fmt, filename=input_file.name)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    result = import_references(
+        user_id, records,
+        batch_size=batch_size or current_app.config.get('REFERENCE_IMPORT_BATCH_SIZE', 500)
+    )
+    click.echo(
+        f"已匯入 {result['imported']} 筆文獻（略過 {result['skipped']} 筆），"
+        f"耗時 {result['seconds']:.2f} 秒（{result['rate'] or 0:.0f} 筆/秒）"
+    )
+
+
+@references_cli.command('dedupe')
+@click.option('--user-id', type=int, default=None, help='只處理指定用戶')
+@click.option('--dry-run', is_flag=True, help='只計算重複筆數，不合併')
+def dedupe_command(user_id, dry_run):
+    """合併既有的重複文獻（相同 DOI，或相同標題 + 第一作者 + 年份）"""
+    count = merge_duplicates(user_id=user_id, dry_run=dry_run)
+    if dry_run:
+        click.echo(f'找到 {count} 筆重複文獻')
+    else:
+        click.echo(f'已合併 {count} 筆重複文獻')
+
+
+def init_app(app):
+    """註冊 CLI 指令"""
+    app.cli.add_command(references_cli)
+
 
-__all__ = ['ReferenceParser', 'ReferenceFormatter', 'APIClient']
+__all__ = [
+    'init_app', 'iter_parse', 'IMPORT_FORMATS', 'iter_records', 'import_references',
+    'find_duplicate', 'upsert_reference', 'merge_duplicates', 'citations',
+    'ReferenceParser', 'ReferenceFormatter', 'APIClient', 'ResourceNotFound',
+    'MetadataCache', 'RateLimiter', 'RateLimited', 'MultiSourceResolver', 'normalize_doi', 'normalize_query',
+    'get_api_client'
+]
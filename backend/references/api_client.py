@@ -5,18 +5,36 @@ API Client Module
 功能：
 - 透過 DOI 查詢完整文獻資訊
 - 透過標題和作者查詢
-- 整合多個 API 來源
+- 整合多個 API 來源（CrossRef、OpenAlex、doi.org CSL-JSON 並行查詢）
 """
 
-import requests
+import os
+import threading
 import time
-from typing import Dict, Optional, List
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlencode, urlsplit
+from typing import TYPE_CHECKING, Dict, Optional, List
 import logging
 
+from .normalize import normalize_doi, normalize_query
+from .ratelimit import DEFAULT_RETRY_AFTER, RateLimited, parse_retry_after
+from .resolver import MultiSourceResolver
+
+if TYPE_CHECKING:
+    import requests
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class ResourceNotFound(Exception):
+    """資源不存在（404），與逾時等暫時性錯誤區分，可快取為查無結果"""
+
+
+# 查詢函式返回此值表示暫時性錯誤（不寫入快取）
+TRANSIENT = object()
+
+
 class APIClient:
     """文獻 API 客戶端"""
 
@@ -29,16 +47,137 @@ class APIClient:
         'User-Agent': 'AcademicReferenceFormatter/1.0 (mailto:support@example.com)'
     }
 
-    def __init__(self, timeout: int = 10, max_retries: int = 3):
+    # doi.org 內容協商（CSL-JSON）
+    CSL_HEADERS = {'Accept': 'application/vnd.citationstyles.csl+json'}
+
+    # 可用的查詢來源
+    SOURCES = ('crossref', 'openalex', 'doi.org')
+
+    # 需要重試的暫時性錯誤狀態碼（429 不重試，拋出 RateLimited 並由速率限制器暫停該主機）
+    RETRY_STATUSES = (500, 502, 503, 504)
+
+    def __init__(self, timeout: int = 10, max_retries: int = 3, cache=None, rate_limiter=None,
+                 pool_connections: int = 4, pool_maxsize: int = 10, backoff_factor: float = 0.5,
+                 sources: List[str] = None, resolver: MultiSourceResolver = None,
+                 endpoints: Dict[str, str] = None):
         """
         初始化 API 客戶端
 
         Args:
             timeout: 請求超時時間（秒）
-            max_retries: 最大重試次數
+            max_retries: 最大嘗試次數（含第一次請求，每次嘗試都經過速率限制器）
+            cache: 元數據快取（MetadataCache），None 表示不快取
+            rate_limiter: 對外請求速率限制器（RateLimiter），None 表示不限速
+            pool_connections: 連線池保留的主機數
+            pool_maxsize: 每個主機保持的連線數
+            backoff_factor: 重試間隔係數（第 n 次重試等待 backoff_factor * 2^(n-1) 秒）
+            sources: 啟用的查詢來源（預設全部）
+            resolver: 多來源查詢器（預設以預設參數建立）
+            endpoints: 覆寫來源位址 { 來源: URL }（鏡像站或負載測試用的模擬服務）
         """
         self.timeout = timeout
         self.max_retries = max_retries
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.backoff_factor = backoff_factor
+        self.sources = [source for source in (sources or self.SOURCES) if source in self.SOURCES]
+        self.resolver = resolver or MultiSourceResolver()
+
+        endpoints = endpoints or {}
+        self.CROSSREF_API = endpoints.get('crossref') or self.CROSSREF_API
+        self.OPENALEX_API = endpoints.get('openalex') or self.OPENALEX_API
+        self.DOI_ORG = endpoints.get('doi.org') or self.DOI_ORG
+
+        self._session = None
+        self._session_pid = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> 'requests.Session':
+        """
+        連線池化的 HTTP session（keep-alive，同一進程內共用）
+
+        fork 後子進程不可沿用父進程的連線，以 pid 判斷並重新建立
+        """
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._session_lock:
+                if self._session is None or self._session_pid != pid:
+                    self._session = self._create_session()
+                    self._session_pid = pid
+        return self._session
+
+    def _create_session(self) -> 'requests.Session':
+        # requests 於第一次對外查詢時才載入（約 0.1 秒），不拖慢 worker 啟動
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # 不在 urllib3 內重試：重試由 _make_request 進行，每次重送都需取得速率限制額度
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=0
+        )
+
+        session = requests.Session()
+        session.headers.update(self.HEADERS)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def close(self):
+        """關閉連線池"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _lookup(self, key: Optional[str], kind: str, fetch, description: str) -> Optional[Dict]:
+        """
+        經由快取執行查詢
+
+        Args:
+            key: 快取鍵（None 表示不快取）
+            kind: 快取種類（doi, query）
+            fetch: 查詢函式，返回結果、None（查無結果）或 TRANSIENT（暫時性錯誤）
+            description: 錯誤記錄用的說明
+
+        Returns:
+            文獻元數據字典，失敗返回 None
+
+        Raises:
+            RateLimited: 取不到對外請求額度
+        """
+        if key and self.cache:
+            found, cached = self.cache.get(key)
+            if found:
+                return cached
+
+        try:
+            result = fetch()
+        except ResourceNotFound:
+            result = None
+        except RateLimited:
+            # 不寫入快取，交由呼叫端回報或重試
+            raise
+        except Exception as e:
+            logger.error(f"{description} 查詢失敗: {e}")
+            return None
+
+        if result is TRANSIENT:
+            return None
+        if key and self.cache:
+            # 查無結果同樣快取（negative）
+            self.cache.set(key, kind, result)
+        return result
+
+    def _doi_key(self, doi: str, source: str) -> Optional[str]:
+        return self.cache.doi_key(doi, source) if self.cache else None
+
+    def _query_key(self, title: str, authors: Optional[List[str]], source: str) -> Optional[str]:
+        return self.cache.query_key(normalize_query(title, authors), source) if self.cache else None
 
     def query_by_doi(self, doi: str) -> Optional[Dict]:
         """
@@ -50,19 +189,17 @@ class APIClient:
         Returns:
             文獻元數據字典，失敗返回 None
         """
+        doi = normalize_doi(doi)
         if not doi:
             return None
 
-        url = f"{self.CROSSREF_API}/{doi}"
-
-        try:
-            response = self._make_request(url)
-            if response and response.get('status') == 'ok':
-                return self._parse_crossref_response(response['message'])
-        except Exception as e:
-            logger.error(f"CrossRef 查詢失敗 (DOI: {doi}): {e}")
+        def fetch():
+            response = self._make_request(f"{self.CROSSREF_API}/{doi}")
+            if not response or response.get('status') != 'ok':
+                return TRANSIENT
+            return self._parse_crossref_response(response['message'])
 
-        return None
+        return self._lookup(self._doi_key(doi, 'crossref'), 'doi', fetch, f"CrossRef (DOI: {doi})")
 
     def query_by_metadata(self, title: str, authors: List[str] = None) -> Optional[Dict]:
         """
@@ -87,16 +224,76 @@ class APIClient:
         query = ' '.join(query_parts)
         url = f"{self.CROSSREF_API}?query={query}&rows=1"
 
-        try:
+        def fetch():
             response = self._make_request(url)
-            if response and response.get('status') == 'ok':
-                items = response['message'].get('items', [])
-                if items:
-                    return self._parse_crossref_response(items[0])
-        except Exception as e:
-            logger.error(f"標題查詢失敗: {e}")
+            if not response or response.get('status') != 'ok':
+                return TRANSIENT
+            items = response['message'].get('items', [])
+            return self._parse_crossref_response(items[0]) if items else None
 
-        return None
+        return self._lookup(self._query_key(title, authors, 'crossref'), 'query', fetch, "CrossRef 標題")
+
+    def query_openalex_by_doi(self, doi: str) -> Optional[Dict]:
+        """通過 DOI 查詢 OpenAlex"""
+        doi = normalize_doi(doi)
+        if not doi:
+            return None
+
+        def fetch():
+            response = self._make_request(f"{self.OPENALEX_API}/https://doi.org/{doi}")
+            if not response:
+                return TRANSIENT
+            return self._parse_openalex_response(response)
+
+        return self._lookup(self._doi_key(doi, 'openalex'), 'doi', fetch, f"OpenAlex (DOI: {doi})")
+
+    def query_openalex_by_metadata(self, title: str, authors: List[str] = None) -> Optional[Dict]:
+        """通過標題查詢 OpenAlex（作者只用於快取鍵，與 CrossRef 查詢一致）"""
+        if not title:
+            return None
+
+        url = f"{self.OPENALEX_API}?{urlencode({'search': title, 'per-page': 1})}"
+
+        def fetch():
+            response = self._make_request(url)
+            if not response:
+                return TRANSIENT
+            items = response.get('results', [])
+            return self._parse_openalex_response(items[0]) if items else None
+
+        return self._lookup(self._query_key(title, authors, 'openalex'), 'query', fetch, "OpenAlex 標題")
+
+    def query_csl_by_doi(self, doi: str) -> Optional[Dict]:
+        """通過 doi.org 內容協商取得 CSL-JSON（涵蓋 DataCite 等非 CrossRef 註冊的 DOI）"""
+        doi = normalize_doi(doi)
+        if not doi:
+            return None
+
+        def fetch():
+            response = self._make_request(f"{self.DOI_ORG}/{doi}", headers=self.CSL_HEADERS)
+            if not response:
+                return TRANSIENT
+            return self._parse_csl_response(response)
+
+        return self._lookup(self._doi_key(doi, 'doi.org'), 'doi', fetch, f"doi.org (DOI: {doi})")
+
+    def _doi_lookups(self, doi: str):
+        methods = {
+            'crossref': self.query_by_doi,
+            'openalex': self.query_openalex_by_doi,
+            'doi.org': self.query_csl_by_doi,
+        }
+        return [(source, lambda fn=methods[source]: fn(doi)) for source in self.sources]
+
+    def _metadata_lookups(self, title: str, authors: List[str]):
+        methods = {
+            'crossref': self.query_by_metadata,
+            'openalex': self.query_openalex_by_metadata,
+        }
+        return [
+            (source, lambda fn=methods[source]: fn(title, authors))
+            for source in self.sources if source in methods
+        ]
 
     def enrich_reference(self, partial_data: Dict) -> Dict:
         """
@@ -107,67 +304,143 @@ class APIClient:
 
         Returns:
             補完後的文獻資料
+
+        Raises:
+            RateLimited: 各來源皆受速率限制而沒有任何結果（呼叫端可稍後重試）
         """
         enriched = partial_data.copy()
-        api_data = None
+        api_data, sources = None, []
 
-        # 優先使用 DOI 查詢
+        # 優先使用 DOI 查詢（各來源並行）
         if partial_data.get('doi'):
             logger.info(f"使用 DOI 查詢: {partial_data['doi']}")
-            api_data = self.query_by_doi(partial_data['doi'])
+            api_data, sources = self.resolver.resolve(self._doi_lookups(partial_data['doi']))
 
         # 如果 DOI 查詢失敗，嘗試標題查詢
         if not api_data and partial_data.get('title'):
             logger.info(f"使用標題查詢: {partial_data['title'][:50]}...")
             authors = [a.get('last', '') for a in partial_data.get('authors', [])]
-            api_data = self.query_by_metadata(partial_data['title'], authors)
+            api_data, sources = self.resolver.resolve(self._metadata_lookups(partial_data['title'], authors))
 
         # 合併 API 資料
         if api_data:
             enriched = self._merge_data(partial_data, api_data)
             enriched['enriched'] = True
-            enriched['enrichment_source'] = 'crossref'
+            enriched['enrichment_source'] = '+'.join(sources)
         else:
             enriched['enriched'] = False
 
         return enriched
 
-    def _make_request(self, url: str) -> Optional[Dict]:
+    def enrich_many(self, items: List[Dict], max_workers: int = 4,
+                    timeout: Optional[float] = None) -> List[Dict]:
         """
-        發送 HTTP 請求（含重試機制）
+        並行補完多筆文獻
+
+        以有上限的執行緒池同時查詢（同時連線數不超過 max_workers，
+        避免對 CrossRef 造成突發流量），結果順序與輸入相同。
 
         Args:
-            url: 請求 URL
+            items: 部分解析的文獻資料列表
+            max_workers: 同時查詢數
+            timeout: 整批等待秒數，逾時未完成者保留原始資料
 
         Returns:
-            JSON 回應，失敗返回 None
+            [{'status': 'enriched' | 'not_found' | 'skipped' | 'timeout' | 'rate_limited' | 'error',
+              'data': 文獻資料, 'error': 錯誤訊息（僅 error）,
+              'retry_after': 建議重試秒數（僅 rate_limited）}]
         """
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.get(
-                    url,
-                    headers=self.HEADERS,
-                    timeout=self.timeout
-                )
-
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
-                    logger.warning(f"資源不存在 (404): {url}")
-                    return None
-                elif response.status_code == 429:
-                    # 速率限制，等待後重試
-                    wait_time = 2 ** attempt
-                    logger.warning(f"速率限制，等待 {wait_time} 秒後重試...")
-                    time.sleep(wait_time)
+        results = [None] * len(items)
+        pending = {}
+
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='enrich')
+        try:
+            for index, item in enumerate(items):
+                if item.get('doi') or item.get('title'):
+                    pending[executor.submit(self.enrich_reference, item)] = index
                 else:
-                    logger.warning(f"HTTP {response.status_code}: {url}")
+                    results[index] = {'status': 'skipped', 'data': item}
+
+            done, not_done = wait(pending, timeout=timeout)
+        finally:
+            # 不等待逾時的查詢，未開始者直接取消
+            executor.shutdown(wait=False, cancel_futures=True)
 
-            except requests.Timeout:
-                logger.warning(f"請求超時 (嘗試 {attempt + 1}/{self.max_retries})")
+        for future in done:
+            index = pending[future]
+            try:
+                data = future.result()
+            except RateLimited as e:
+                results[index] = {
+                    'status': 'rate_limited', 'data': items[index], 'retry_after': round(e.retry_after, 1)
+                }
+                continue
+            except Exception as e:
+                logger.error(f"文獻補全失敗 (第 {index + 1} 筆): {e}")
+                results[index] = {'status': 'error', 'data': items[index], 'error': str(e)}
+            else:
+                results[index] = {'status': 'enriched' if data.get('enriched') else 'not_found', 'data': data}
+
+        for future in not_done:
+            results[pending[future]] = {'status': 'timeout', 'data': items[pending[future]]}
+
+        return results
+
+    def _make_request(self, url: str, headers: Dict = None) -> Optional[Dict]:
+        """
+        發送 HTTP 請求
+
+        逾時、連線錯誤與 RETRY_STATUSES 在此重試（最多 max_retries 次，指數退避），
+        每次嘗試前都向速率限制器取得額度，重送的請求同樣計入對外請求速率
+
+        Args:
+            url: 請求 URL
+            headers: 額外的請求標頭
+
+        Returns:
+            JSON 回應，暫時性錯誤（逾時、重試用盡）返回 None
+
+        Raises:
+            ResourceNotFound: 資源不存在（404）
+            RateLimited: 取不到請求額度，或來源返回 429
+        """
+        import requests
+
+        host = urlsplit(url).hostname
+        attempts = max(self.max_retries, 1)
+        for attempt in range(attempts):
+            if attempt:
+                time.sleep(self.backoff_factor * 2 ** (attempt - 1))
+            if self.rate_limiter:
+                self.rate_limiter.acquire(host)
+
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                logger.warning(f"請求失敗（第 {attempt + 1}/{attempts} 次）: {e}")
+                continue
             except Exception as e:
                 logger.error(f"請求失敗: {e}")
-                break
+                return None
+
+            if self.rate_limiter:
+                # 429 / 503 的 Retry-After 會暫停該主機，下一次 acquire 依此等待或拋出 RateLimited
+                self.rate_limiter.observe(host, response)
+
+            if response.status_code == 200:
+                return response.json()
+            elif response.status_code == 404:
+                logger.warning(f"資源不存在 (404): {url}")
+                raise ResourceNotFound(url)
+            elif response.status_code == 429:
+                logger.warning(f"速率限制 (429): {url}")
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                raise RateLimited(host, retry_after or DEFAULT_RETRY_AFTER)
+            elif response.status_code not in self.RETRY_STATUSES:
+                logger.warning(f"HTTP {response.status_code}: {url}")
+                return None
+
+            logger.warning(f"HTTP {response.status_code}（第 {attempt + 1}/{attempts} 次）: {url}")
 
         return None
 
@@ -250,6 +523,71 @@ class APIClient:
 
         return result
 
+    def _parse_openalex_response(self, data: Dict) -> Dict:
+        """
+        解析 OpenAlex work 物件
+
+        Args:
+            data: OpenAlex API 返回的 work 物件
+
+        Returns:
+            標準化的文獻資料字典
+        """
+        biblio = data.get('biblio') or {}
+        location = data.get('primary_location') or {}
+        source = location.get('source') or {}
+
+        authors = []
+        for authorship in data.get('authorships') or []:
+            name = ((authorship.get('author') or {}).get('display_name') or '').strip()
+            if name:
+                first, _, last = name.rpartition(' ')
+                authors.append({'last': last, 'first': first})
+
+        pages = None
+        if biblio.get('first_page'):
+            pages = biblio['first_page']
+            if biblio.get('last_page') and biblio['last_page'] != biblio['first_page']:
+                pages = f"{pages}-{biblio['last_page']}"
+
+        work_type = data.get('type')
+        return {
+            'title': data.get('title') or data.get('display_name'),
+            'authors': authors,
+            'year': str(data['publication_year']) if data.get('publication_year') else None,
+            'journal': source.get('display_name'),
+            'volume': biblio.get('volume'),
+            'issue': biblio.get('issue'),
+            'pages': pages,
+            'doi': normalize_doi(data.get('doi')),
+            'publisher': source.get('host_organization_name'),
+            'type': 'book' if work_type in ('book', 'monograph') else 'article'
+        }
+
+    def _parse_csl_response(self, data: Dict) -> Dict:
+        """
+        解析 CSL-JSON（doi.org 內容協商）
+
+        欄位與 CrossRef 相同，但標題、期刊為字串，出版日期位於 issued
+        """
+        data = dict(data)
+        for key in ('title', 'container-title'):
+            if isinstance(data.get(key), str):
+                data[key] = [data[key]]
+        if data.get('type') == 'article-journal':
+            data['type'] = 'journal-article'
+
+        result = self._parse_crossref_response(data)
+        if not result['year']:
+            date_parts = (data.get('issued') or {}).get('date-parts', [[]])
+            if date_parts and date_parts[0] and date_parts[0][0]:
+                result['year'] = str(date_parts[0][0])
+        return result
+
+    def metrics(self) -> Dict:
+        """各來源的查詢延遲與成功率"""
+        return self.resolver.metrics()
+
     def _merge_data(self, original: Dict, api_data: Dict) -> Dict:
         """
         合併原始資料和 API 資料
@@ -0,0 +1,213 @@
+"""
+文獻元數據快取
+Persistent Metadata Cache
+
+以資料庫保存 CrossRef 查詢結果，所有 worker 與用戶共用。
+直接使用 engine（Core），不依賴 Flask 請求或 session，可在背景執行緒中使用。
+
+命中次數先累計於記憶體，累積 hit_flush_size 筆或超過 hit_flush_interval 秒後
+以一次批次 UPDATE 寫回，讀取快取本身不寫入資料庫。
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import bindparam, case, func, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from models import MetadataCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# 查無結果（negative）時 get 返回的 payload
+NOT_FOUND = None
+
+
+class MetadataCache:
+    """文獻元數據快取（含 TTL 與查無結果快取）"""
+
+    def __init__(self, engine, ttl: int = 30 * 24 * 3600, negative_ttl: int = 24 * 3600,
+                 hit_flush_size: int = 100, hit_flush_interval: float = 60):
+        """
+        初始化快取
+
+        Args:
+            engine: SQLAlchemy engine
+            ttl: 查詢結果保存秒數
+            negative_ttl: 查無結果保存秒數
+            hit_flush_size: 累計多少次命中後寫回資料庫
+            hit_flush_interval: 距上次寫回超過此秒數時寫回
+        """
+        self.engine = engine
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hit_flush_size = hit_flush_size
+        self.hit_flush_interval = hit_flush_interval
+        self.table = MetadataCacheEntry.__table__
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        # 尚未寫回的命中次數 { 快取列 id: 次數 }
+        self._pending_hits: Dict[int, int] = {}
+        self._pending_total = 0
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def doi_key(doi: str, source: str = 'crossref') -> str:
+        """DOI 快取鍵（DOI 需已正規化；CrossRef 以外的來源加上來源前綴）"""
+        key = f'doi:{doi}'
+        return key if source == 'crossref' else f'{source}:{key}'
+
+    @staticmethod
+    def query_key(query: str, source: str = 'crossref') -> str:
+        """標題查詢快取鍵（查詢字串需已正規化，雜湊以限制長度）"""
+        key = 'query:' + hashlib.sha1(query.encode('utf-8')).hexdigest()
+        return key if source == 'crossref' else f'{source}:{key}'
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, key: str) -> Tuple[bool, Optional[Dict]]:
+        """
+        讀取快取（只查詢，命中次數累計於記憶體）
+
+        Returns:
+            (是否命中, payload)；命中查無結果時 payload 為 NOT_FOUND
+        """
+        table = self.table
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(table.c.id, table.c.payload, table.c.negative)
+                .where(table.c.cache_key == key, table.c.expires_at > datetime.utcnow())
+            ).first()
+
+        if row is None:
+            self._count('misses')
+            return False, None
+
+        self._record_hit(row.id, 'negative_hits' if row.negative else 'hits')
+        if row.negative:
+            return True, NOT_FOUND
+        return True, row.payload
+
+    def _record_hit(self, entry_id: int, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+            self._pending_hits[entry_id] = self._pending_hits.get(entry_id, 0) + 1
+            self._pending_total += 1
+            due = (self._pending_total >= self.hit_flush_size
+                   or time.monotonic() - self._last_flush >= self.hit_flush_interval)
+
+        if due:
+            try:
+                self.flush_hits()
+            except SQLAlchemyError as e:
+                # 命中次數僅供統計，寫回失敗不影響查詢
+                logger.warning(f"寫回快取命中次數失敗: {e}")
+
+    def flush_hits(self) -> int:
+        """
+        將累計的命中次數以一次批次 UPDATE 寫回資料庫
+
+        Returns:
+            更新的快取列數
+        """
+        with self._lock:
+            pending, self._pending_hits = self._pending_hits, {}
+            self._pending_total = 0
+            self._last_flush = time.monotonic()
+
+        if not pending:
+            return 0
+
+        table = self.table
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam('entry_id'))
+            .values(hits=table.c.hits + bindparam('hit_count'))
+        )
+        with self.engine.begin() as conn:
+            # 依 id 排序更新，避免併發寫回時互相等待
+            conn.execute(stmt, [
+                {'entry_id': entry_id, 'hit_count': count} for entry_id, count in sorted(pending.items())
+            ])
+        return len(pending)
+
+    def set(self, key: str, kind: str, payload: Optional[Dict]):
+        """寫入快取（payload 為 None 表示查無結果）"""
+        negative = payload is None
+        ttl = self.negative_ttl if negative else self.ttl
+        values = {
+            'cache_key': key,
+            'kind': kind,
+            'payload': payload,
+            'negative': negative,
+            'hits': 0,
+            'created_at': datetime.utcnow(),
+            'expires_at': datetime.utcnow() + timedelta(seconds=ttl),
+        }
+
+        table = self.table
+        dialect = self.engine.dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            dialect_insert = None
+
+        with self.engine.begin() as conn:
+            if dialect_insert is None:
+                # 不支援 ON CONFLICT 的資料庫：先更新，沒有資料列再插入
+                updated = conn.execute(update(table).where(table.c.cache_key == key).values(**values))
+                if updated.rowcount == 0:
+                    conn.execute(insert(table).values(**values))
+                return
+
+            stmt = dialect_insert(table).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['cache_key'],
+                set_={name: stmt.excluded[name] for name in values if name != 'cache_key'}
+            )
+            conn.execute(stmt)
+
+    def purge_expired(self) -> int:
+        """刪除過期的快取"""
+        with self.engine.begin() as conn:
+            return conn.execute(
+                self.table.delete().where(self.table.c.expires_at <= datetime.utcnow())
+            ).rowcount
+
+    def stats(self) -> Dict:
+        """命中統計（本進程）與快取筆數"""
+        self.flush_hits()
+
+        table = self.table
+        with self.engine.connect() as conn:
+            row = conn.execute(select(
+                func.count(table.c.id),
+                func.coalesce(func.sum(case((table.c.negative, 1), else_=0)), 0),
+                func.coalesce(func.sum(table.c.hits), 0),
+            )).one()
+
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                'entries': row[0],
+                'negative_entries': int(row[1]),
+                'total_hits': int(row[2]),
+                'hits': self.hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.negative_hits) / lookups, 3) if lookups else None,
+                'ttl': self.ttl,
+                'negative_ttl': self.negative_ttl
+            }
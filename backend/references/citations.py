@@ -0,0 +1,151 @@
+"""
+格式化引用快取
+Formatted Citation Cache
+
+切換 APA / MLA / Chicago / Harvard 時，同一筆文獻會被反覆格式化。
+格式化結果依 (文獻, 格式) 保存於 formatted_citations，並記錄當時的內容雜湊：
+- 讀取時雜湊與目前內容相同才採用，否則重新格式化並覆寫
+- 文獻更新時於 flush 一併刪除其快取；刪除文獻時隨 ORM 級聯刪除
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Dict, List, Sequence
+
+from sqlalchemy import delete, event, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from models import db, Reference, FormattedCitation
+from .formatter import ReferenceFormatter
+
+# 影響格式化結果的欄位
+FORMAT_FIELDS = (
+    'title', 'authors', 'year', 'journal', 'volume', 'issue', 'pages', 'publisher', 'doi', 'url',
+    'reference_type'
+)
+
+# 格式化規則變更時遞增，使既有快取全部失效
+FORMAT_VERSION = 2
+
+
+def formatter_data(reference: Reference) -> Dict:
+    """將文獻轉為 ReferenceFormatter 的輸入格式（空欄位不傳入，以使用格式化器的預設值，例如 n.d.）"""
+    data = {field: getattr(reference, field) for field in FORMAT_FIELDS}
+    data = {field: value for field, value in data.items() if value is not None}
+    data['type'] = reference.reference_type
+    return data
+
+
+def content_hash(reference: Reference) -> str:
+    """計算影響格式化結果的內容雜湊"""
+    values = [FORMAT_VERSION] + [getattr(reference, field) for field in FORMAT_FIELDS]
+    raw = json.dumps(values, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _dialect_insert(dialect: str):
+    """取得支援 ON CONFLICT 的 insert 建構函數"""
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+
+def _store(rows: List[Dict]):
+    """寫入格式化結果（同一文獻與格式的舊結果直接覆寫）"""
+    table = FormattedCitation.__table__
+    dialect_insert = _dialect_insert(db.session.get_bind().dialect.name)
+
+    if dialect_insert is None:
+        for row in rows:
+            db.session.execute(delete(table).where(
+                table.c.reference_id == row['reference_id'], table.c.style == row['style']
+            ))
+        db.session.execute(insert(table), rows)
+        return
+
+    stmt = dialect_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['reference_id', 'style'],
+        set_={
+            'content_hash': stmt.excluded.content_hash,
+            'text': stmt.excluded.text,
+            'created_at': stmt.excluded.created_at,
+        }
+    )
+    db.session.execute(stmt, rows)
+
+
+def render(references: Sequence[Reference], styles: Sequence[str]) -> Dict[int, Dict[str, str]]:
+    """
+    取得文獻的格式化引用（優先讀取快取，未命中者格式化後寫入，呼叫端負責提交）
+
+    Args:
+        references: 文獻列表
+        styles: 引用格式（需為 ReferenceFormatter 支援的格式）
+
+    Returns:
+        { 文獻 ID: { 格式: 格式化字串 } }
+    """
+    if not references or not styles:
+        return {reference.id: {} for reference in references}
+
+    table = FormattedCitation.__table__
+    hashes = {reference.id: content_hash(reference) for reference in references}
+
+    cached = {}
+    rows = db.session.execute(
+        select(table.c.reference_id, table.c.style, table.c.content_hash, table.c.text).where(
+            table.c.reference_id.in_(list(hashes)), table.c.style.in_(list(styles))
+        )
+    )
+    for row in rows:
+        if hashes.get(row.reference_id) == row.content_hash:
+            cached[(row.reference_id, row.style)] = row.text
+
+    result = {}
+    misses = []
+    now = datetime.utcnow()
+    for reference in references:
+        rendered = result[reference.id] = {}
+        data = None
+        for style in styles:
+            text = cached.get((reference.id, style))
+            if text is None:
+                data = data or formatter_data(reference)
+                text = cached[(reference.id, style)] = ReferenceFormatter.format(data, style)
+                misses.append({
+                    'reference_id': reference.id,
+                    'style': style,
+                    'content_hash': hashes[reference.id],
+                    'text': text,
+                    'created_at': now,
+                })
+            rendered[style] = text
+
+    if misses:
+        _store(misses)
+    return result
+
+
+def _formatting_changed(reference: Reference) -> bool:
+    state = inspect(reference)
+    return any(state.attrs[field].history.has_changes() for field in FORMAT_FIELDS)
+
+
+def _after_flush(session, flush_context):
+    """文獻內容變更時刪除其格式化快取（與資料變更位於同一交易）"""
+    ids = [
+        obj.id for obj in session.dirty
+        if isinstance(obj, Reference) and _formatting_changed(obj)
+    ]
+    if ids:
+        table = FormattedCitation.__table__
+        session.connection().execute(delete(table).where(table.c.reference_id.in_(ids)))
+
+
+event.listen(Session, 'after_flush', _after_flush)
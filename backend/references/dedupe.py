@@ -0,0 +1,366 @@
+"""
+文獻去重
+Reference Deduplication
+
+每筆文獻寫入時計算兩個鍵：
+- normalized_doi：正規化 DOI，(user_id, normalized_doi) 唯一索引保證同一用戶不重複
+- fingerprint：正規化標題 + 第一作者姓 + 年份的雜湊，用於偵測沒有 DOI 的重複文獻
+
+新增與匯入遇到重複時合併至既有文獻（只補上空白欄位，不覆寫用戶的修改），
+不另外建立一筆。
+"""
+
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, event, inspect, or_, select, text, update
+from sqlalchemy.exc import IntegrityError
+
+from models import db, Reference
+from .normalize import normalize_doi, normalize_text
+from .parser import ReferenceParser
+
+# 合併時可補上的欄位
+MERGE_FIELDS = (
+    'title', 'authors', 'year', 'journal', 'volume', 'issue', 'pages', 'publisher', 'doi', 'url', 'notes'
+)
+
+KEY_COLUMNS = ('normalized_doi', 'fingerprint')
+
+_parser = ReferenceParser()
+
+
+def fingerprint(title: Optional[str], authors: Optional[List[Dict]], year: Optional[str]) -> Optional[str]:
+    """
+    計算重複偵測指紋
+
+    只有標題時過於寬鬆（例如「Introduction」），需至少再有第一作者或年份
+    """
+    title = normalize_text(title)
+    first_author = ''
+    if authors and isinstance(authors[0], dict):
+        first_author = normalize_text(authors[0].get('last'))
+    year = (year or '').strip()
+
+    if not title or not (first_author or year):
+        return None
+    return hashlib.sha1(f'{title}|{first_author}|{year}'.encode('utf-8')).hexdigest()
+
+
+def reference_keys(values: Dict) -> Tuple[Optional[str], Optional[str]]:
+    """返回 (normalized_doi, fingerprint)"""
+    return (
+        normalize_doi(values.get('doi')),
+        fingerprint(values.get('title'), values.get('authors'), values.get('year'))
+    )
+
+
+def _set_keys(mapper, connection, reference):
+    reference.normalized_doi, reference.fingerprint = reference_keys({
+        'doi': reference.doi,
+        'title': reference.title,
+        'authors': reference.authors,
+        'year': reference.year,
+    })
+
+
+event.listen(Reference, 'before_insert', _set_keys)
+event.listen(Reference, 'before_update', _set_keys)
+
+
+def _same_work(reference: Reference, normalized_doi: Optional[str]) -> bool:
+    """指紋相同但 DOI 不同時視為不同文獻（例如同作者同年的同名更正版）"""
+    existing_doi = reference.normalized_doi or normalize_doi(reference.doi)
+    return not (normalized_doi and existing_doi and existing_doi != normalized_doi)
+
+
+def find_duplicate(user_id: int, values: Dict, exclude_id: Optional[int] = None) -> Optional[Reference]:
+    """
+    尋找與 values 重複的既有文獻（先比對 DOI，再比對指紋）
+
+    Args:
+        user_id: 用戶 ID
+        values: 文獻欄位（title、authors、year、doi）
+        exclude_id: 排除的文獻 ID（更新時排除自己）
+    """
+    normalized_doi, key = reference_keys(values)
+    query = Reference.query.filter(Reference.user_id == user_id)
+    if exclude_id is not None:
+        query = query.filter(Reference.id != exclude_id)
+
+    if normalized_doi:
+        duplicate = query.filter(Reference.normalized_doi == normalized_doi).first()
+        if duplicate is not None:
+            return duplicate
+
+    if key:
+        for candidate in query.filter(Reference.fingerprint == key).order_by(Reference.id.asc()):
+            if _same_work(candidate, normalized_doi):
+                return candidate
+    return None
+
+
+def _merge_tags(current: Optional[str], incoming: Optional[str]) -> Optional[str]:
+    """合併逗號分隔的標籤（保留順序、去除重複）"""
+    tags = []
+    for value in (current, incoming):
+        for tag in (value or '').split(','):
+            tag = tag.strip()
+            if tag and tag not in tags:
+                tags.append(tag)
+    return ', '.join(tags) if tags else current
+
+
+def merge_into(reference: Reference, values: Dict) -> List[str]:
+    """
+    將 values 合併至既有文獻（只補上空白欄位，標籤取聯集）
+
+    Returns:
+        有變更的欄位
+    """
+    changed = []
+    for field in MERGE_FIELDS:
+        if not getattr(reference, field) and values.get(field):
+            setattr(reference, field, values[field])
+            changed.append(field)
+
+    tags = _merge_tags(reference.tags, values.get('tags'))
+    if tags != reference.tags:
+        reference.tags = tags
+        changed.append('tags')
+
+    if changed:
+        data = {field: getattr(reference, field) for field in MERGE_FIELDS}
+        data['type'] = reference.reference_type
+        reference.completeness = _parser.calculate_completeness(data)
+        reference.confidence = max(reference.confidence or 0.0, _parser.calculate_confidence(data))
+    return changed
+
+
+def upsert_reference(values: Dict) -> Tuple[Reference, bool]:
+    """
+    新增文獻，已存在時合併至既有文獻（呼叫端負責提交）
+
+    Args:
+        values: Reference 欄位（需包含 user_id）
+
+    Returns:
+        (文獻, 是否為新建立)
+    """
+    user_id = values['user_id']
+    duplicate = find_duplicate(user_id, values)
+    if duplicate is None:
+        reference = Reference(**values)
+        try:
+            with db.session.begin_nested():
+                db.session.add(reference)
+            return reference, True
+        except IntegrityError:
+            # 並行寫入相同 DOI：唯一索引擋下後改為合併
+            duplicate = find_duplicate(user_id, values)
+            if duplicate is None:
+                raise
+
+    merge_into(duplicate, values)
+    return duplicate, False
+
+
+def split_duplicates(user_id: int, rows: List[Dict]) -> Tuple[List[Dict], int]:
+    """
+    批次匯入用：將重複的資料列合併至既有文獻或同批的前一筆
+
+    Args:
+        rows: 已含 normalized_doi / fingerprint 的資料列
+
+    Returns:
+        (需要新增的資料列, 合併的筆數)
+    """
+    dois = {row['normalized_doi'] for row in rows if row.get('normalized_doi')}
+    keys = {row['fingerprint'] for row in rows if row.get('fingerprint')}
+
+    by_doi: Dict[str, object] = {}
+    by_key: Dict[str, List] = {}
+    if dois or keys:
+        conditions = []
+        if dois:
+            conditions.append(Reference.normalized_doi.in_(dois))
+        if keys:
+            conditions.append(Reference.fingerprint.in_(keys))
+        existing = Reference.query.filter(
+            Reference.user_id == user_id, or_(*conditions)
+        ).order_by(Reference.id.asc())
+        for reference in existing:
+            if reference.normalized_doi:
+                by_doi.setdefault(reference.normalized_doi, reference)
+            if reference.fingerprint:
+                by_key.setdefault(reference.fingerprint, []).append(reference)
+
+    def doi_of(target):
+        if isinstance(target, dict):
+            return target.get('normalized_doi')
+        return target.normalized_doi or normalize_doi(target.doi)
+
+    new_rows = []
+    merged = 0
+    for row in rows:
+        normalized_doi, key = row.get('normalized_doi'), row.get('fingerprint')
+        target = by_doi.get(normalized_doi) if normalized_doi else None
+        if target is None and key:
+            target = next(
+                (c for c in by_key.get(key, ()) if not (normalized_doi and doi_of(c) and doi_of(c) != normalized_doi)),
+                None
+            )
+
+        if target is None:
+            new_rows.append(row)
+            if normalized_doi:
+                by_doi[normalized_doi] = row
+            if key:
+                by_key.setdefault(key, []).append(row)
+            continue
+
+        merged += 1
+        if isinstance(target, dict):
+            # 同批重複：補上前一筆的空白欄位
+            for field in MERGE_FIELDS:
+                if not target.get(field) and row.get(field):
+                    target[field] = row[field]
+            target['tags'] = _merge_tags(target.get('tags'), row.get('tags')) or ''
+            target['normalized_doi'], target['fingerprint'] = reference_keys(target)
+            if target['normalized_doi']:
+                by_doi.setdefault(target['normalized_doi'], target)
+        else:
+            merge_into(target, row)
+
+    return new_rows, merged
+
+
+def backfill_keys(batch_size: int = 500) -> int:
+    """
+    為尚未計算鍵的既有文獻補上 normalized_doi / fingerprint（呼叫端負責提交）
+
+    同一用戶重複的 DOI 只保留最早一筆，其餘留空，
+    以便建立唯一索引；之後可用 merge_duplicates() 合併
+
+    Returns:
+        更新的筆數
+    """
+    table = Reference.__table__
+    connection = db.session.connection()
+
+    seen = {
+        (user_id, normalized_doi)
+        for user_id, normalized_doi in connection.execute(
+            select(table.c.user_id, table.c.normalized_doi).where(table.c.normalized_doi.isnot(None))
+        )
+    }
+    rows = connection.execute(
+        select(table.c.id, table.c.user_id, table.c.doi, table.c.title, table.c.authors, table.c.year)
+        .where(table.c.fingerprint.is_(None), table.c.normalized_doi.is_(None))
+        .order_by(table.c.id.asc())
+    ).all()
+
+    updated = 0
+    for start in range(0, len(rows), batch_size):
+        values = []
+        for row in rows[start:start + batch_size]:
+            normalized_doi, key = reference_keys(row._mapping)
+            if normalized_doi and (row.user_id, normalized_doi) in seen:
+                normalized_doi = None
+            elif normalized_doi:
+                seen.add((row.user_id, normalized_doi))
+            if normalized_doi or key:
+                values.append({'row_id': row.id, 'normalized_doi': normalized_doi, 'fingerprint': key})
+
+        if values:
+            connection.execute(
+                update(table).where(table.c.id == bindparam('row_id')).values(
+                    normalized_doi=bindparam('normalized_doi'), fingerprint=bindparam('fingerprint')
+                ),
+                values
+            )
+            updated += len(values)
+    return updated
+
+
+def merge_duplicates(user_id: Optional[int] = None, dry_run: bool = False) -> int:
+    """
+    合併既有的重複文獻（保留最早一筆，補上其餘各筆的欄位後刪除）
+
+    Returns:
+        合併（刪除）的筆數
+    """
+    query = Reference.query
+    if user_id is not None:
+        query = query.filter(Reference.user_id == user_id)
+
+    keepers: Dict[Tuple, Reference] = {}
+    duplicates: List[Tuple[Reference, Reference]] = []
+    for reference in query.order_by(Reference.user_id, Reference.id).all():
+        normalized_doi = normalize_doi(reference.doi)
+        key = fingerprint(reference.title, reference.authors, reference.year)
+
+        keeper = keepers.get((reference.user_id, 'doi', normalized_doi)) if normalized_doi else None
+        if keeper is None and key:
+            keeper = keepers.get((reference.user_id, 'key', key))
+            if keeper is not None and not _same_work(keeper, normalized_doi):
+                keeper = None
+
+        if keeper is None:
+            if normalized_doi:
+                keepers[(reference.user_id, 'doi', normalized_doi)] = reference
+            if key:
+                keepers.setdefault((reference.user_id, 'key', key), reference)
+            continue
+        duplicates.append((keeper, reference))
+
+    if dry_run or not duplicates:
+        return len(duplicates)
+
+    # 先刪除重複的文獻，再合併欄位（避免合併後的 DOI 與待刪除的資料列衝突）
+    merged = []
+    for keeper, duplicate in duplicates:
+        merged.append((keeper, {field: getattr(duplicate, field) for field in MERGE_FIELDS + ('tags',)}))
+        db.session.delete(duplicate)
+    db.session.flush()
+
+    for keeper, values in merged:
+        merge_into(keeper, values)
+    db.session.commit()
+    return len(duplicates)
+
+
+def upgrade_schema(engine) -> bool:
+    """
+    為既有的 references 資料表加入去重欄位與索引（db.create_all 不會修改既有資料表）
+
+    Returns:
+        是否有進行升級
+    """
+    table = Reference.__table__
+    inspector = inspect(engine)
+    if not inspector.has_table(table.name):
+        return False
+
+    existing = {column['name'] for column in inspector.get_columns(table.name)}
+    missing = [name for name in KEY_COLUMNS if name not in existing]
+    existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+    if not missing and all(index.name in existing_indexes for index in table.indexes):
+        return False
+
+    preparer = engine.dialect.identifier_preparer
+    with engine.begin() as connection:
+        for name in missing:
+            column = table.c[name]
+            connection.execute(text(
+                f'ALTER TABLE {preparer.format_table(table)} ADD COLUMN '
+                f'{preparer.format_column(column)} {column.type.compile(engine.dialect)}'
+            ))
+
+    db.session.remove()
+    backfill_keys()
+    db.session.commit()
+
+    for index in table.indexes:
+        index.create(engine, checkfirst=True)
+    return True
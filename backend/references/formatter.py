@@ -9,9 +9,13 @@ Reference Formatter Module
 - Harvard Referencing Style
 """
 
-from typing import Dict, List, Optional
+import re
+from typing import Dict, List, Optional, Tuple
 from abc import ABC, abstractmethod
 
+# 排序時忽略的英文冠詞
+LEADING_ARTICLE_PATTERN = re.compile(r'^(?:a|an|the)\s+', re.IGNORECASE)
+
 
 class BaseFormatter(ABC):
     """文獻格式化器基類"""
@@ -689,6 +693,48 @@ class ReferenceFormatter:
 
         return formatter.format(data)
 
+    # 參考文獻列表排序：皆先依作者（無作者時以標題代替），
+    # APA / Harvard 同作者依年份，MLA / Chicago 同作者依標題
+    SORT_ORDERS = {
+        'apa': ('authors', 'year', 'title'),
+        'harvard': ('authors', 'year', 'title'),
+        'mla': ('authors', 'title', 'year'),
+        'chicago': ('authors', 'title', 'year'),
+    }
+
+    @staticmethod
+    def _sort_title(data: Dict) -> str:
+        return LEADING_ARTICLE_PATTERN.sub('', (data.get('title') or '').strip()).casefold()
+
+    @classmethod
+    def sort_key(cls, data: Dict, style: str = 'apa') -> Tuple:
+        """
+        參考文獻列表的排序鍵
+
+        Args:
+            data: 文獻資料字典
+            style: 格式類型
+
+        Returns:
+            可比較的排序鍵
+        """
+        style = style.lower()
+        if style not in cls.SORT_ORDERS:
+            raise ValueError(f"不支援的格式: {style}")
+
+        title = cls._sort_title(data)
+        authors = tuple(
+            ((a.get('last') or '').casefold(), (a.get('first') or '').casefold())
+            for a in (data.get('authors') or []) if isinstance(a, dict)
+        ) or ((title, ''),)
+
+        values = {
+            'authors': authors,
+            'year': str(data.get('year') or ''),  # 無年份（n.d.）排在同作者的最前面
+            'title': title,
+        }
+        return tuple(values[field] for field in cls.SORT_ORDERS[style])
+
     @classmethod
     def get_available_styles(cls) -> List[str]:
         """獲取所有可用的格式類型"""
@@ -0,0 +1,730 @@
+"""
+BibTeX / RIS 匯入
+BibTeX and RIS Importer
+
+逐段讀取上傳檔案並逐筆解析條目（不將整個檔案載入記憶體），
+轉換為 Reference 欄位後分批以多列 INSERT 寫入。
+
+- BibTeX：支援 @string 巨集、# 串接、巢狀大括號與常見 LaTeX 重音符號
+- RIS：Zotero / Mendeley / EndNote 匯出的標籤格式（TY ... ER）
+"""
+
+import logging
+import os
+import re
+import time
+import unicodedata
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy import insert
+
+from models import db, Reference
+from fulltext.indexer import write_documents
+from .dedupe import reference_keys, split_duplicates
+from .normalize import DOI_PREFIX_PATTERN
+from .parser import ReferenceParser
+
+IMPORT_FORMATS = ('bibtex', 'ris')
+
+# 每次讀取的字元數
+READ_SIZE = 64 * 1024
+
+DEFAULT_BATCH_SIZE = 500
+
+# 回應中最多列出的錯誤筆數
+MAX_REPORTED_ERRORS = 20
+
+BIBTEX_TYPES = {
+    'article': 'article',
+    'book': 'book', 'inbook': 'book', 'incollection': 'book', 'booklet': 'book',
+    'inproceedings': 'conference', 'conference': 'conference', 'proceedings': 'conference',
+    'online': 'website', 'electronic': 'website', 'www': 'website', 'webpage': 'website',
+}
+
+RIS_TYPES = {
+    'JOUR': 'article', 'JFULL': 'article', 'EJOUR': 'article', 'MGZN': 'article', 'NEWS': 'article',
+    'BOOK': 'book', 'CHAP': 'book', 'EBOOK': 'book', 'ECHAP': 'book', 'EDBOOK': 'book',
+    'CONF': 'conference', 'CPAPER': 'conference',
+    'ELEC': 'website', 'WEB': 'website', 'BLOG': 'website',
+}
+
+# BibTeX 內建月份巨集
+MONTH_MACROS = {
+    'jan': '1', 'feb': '2', 'mar': '3', 'apr': '4', 'may': '5', 'jun': '6',
+    'jul': '7', 'aug': '8', 'sep': '9', 'oct': '10', 'nov': '11', 'dec': '12',
+}
+
+# LaTeX 重音指令 -> Unicode 組合字元
+LATEX_ACCENTS = {
+    '`': '\u0300', "'": '\u0301', '^': '\u0302', '~': '\u0303', '=': '\u0304', 'u': '\u0306',
+    '.': '\u0307', '"': '\u0308', 'H': '\u030b', 'v': '\u030c', 'c': '\u0327', 'k': '\u0328',
+}
+
+# 跳脫的大括號先以私用區字元暫存，避免與 LaTeX 分組一起被移除
+ESCAPED_BRACES = {'{': '\ue000', '}': '\ue001'}
+
+LATEX_SYMBOLS = {
+    'ss': 'ß', 'o': 'ø', 'O': 'Ø', 'aa': 'å', 'AA': 'Å', 'ae': 'æ', 'AE': 'Æ',
+    'oe': 'œ', 'OE': 'Œ', 'l': 'ł', 'L': 'Ł',
+}
+
+ENTRY_START_RE = re.compile(r'@\s*([A-Za-z]+)\s*([{(])')
+DELIMITER_RE = re.compile(r'[{}()]')
+QUOTED_RE = re.compile(r'[{}"]')
+FIELD_NAME_RE = re.compile(r'\s*([A-Za-z][\w\-:.+/]*)\s*=\s*')
+MACRO_RE = re.compile(r'[A-Za-z][\w\-:.+/]*|\d+')
+NAME_SEPARATOR_RE = re.compile(r'[{}]|\s+and\s+', re.IGNORECASE)
+NAME_TOKEN_RE = re.compile(r'(?:\{[^{}]*\}|[^\s{},])+')
+ACCENT_RE = re.compile(
+    r'\\([`\'^~=."])\s*(?:\{\s*(\\i|[A-Za-z])\s*\}|(\\i|[A-Za-z]))'
+    r'|\\([uHvck])\s*\{\s*(\\i|[A-Za-z])\s*\}'
+)
+SYMBOL_RE = re.compile(r'\\(ss|aa|AA|ae|AE|oe|OE|o|O|l|L)(?![A-Za-z])(?:\{\})?\s?')
+ESCAPED_RE = re.compile(r'\\([&%$#_{}])')
+COMMAND_RE = re.compile(r'\\[A-Za-z]+\*?\s*')
+YEAR_RE = re.compile(r'\d{4}')
+RIS_LINE_RE = re.compile(r'^([A-Z][A-Z0-9])\s{1,2}-\s?(.*)$')
+RIS_START_RE = re.compile(r'^\s*TY\s{1,2}-', re.MULTILINE)
+WHITESPACE_RE = re.compile(r'\s+')
+
+logger = logging.getLogger(__name__)
+
+_parser = ReferenceParser()
+
+
+# ---------------------------------------------------------------------------
+# 串流讀取
+# ---------------------------------------------------------------------------
+
+def read_chunks(stream: TextIO, size: int = READ_SIZE) -> Iterator[str]:
+    """逐段讀取文字串流"""
+    while True:
+        chunk = stream.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """將文字區塊切分為行（保留跨區塊的不完整行）"""
+    pending = ''
+    for chunk in chunks:
+        lines = (pending + chunk).splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith(('\n', '\r')) else ''
+        yield from lines
+    if pending:
+        yield pending
+
+
+def detect_format(filename: Optional[str], sample: str) -> Optional[str]:
+    """依副檔名或檔案開頭內容判斷格式"""
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension in ('.bib', '.bibtex'):
+        return 'bibtex'
+    if extension == '.ris':
+        return 'ris'
+
+    if RIS_START_RE.search(sample):
+        return 'ris'
+    if ENTRY_START_RE.search(sample):
+        return 'bibtex'
+    return None
+
+
+# ---------------------------------------------------------------------------
+# LaTeX 與姓名處理
+# ---------------------------------------------------------------------------
+
+def _replace_accent(match) -> str:
+    command = match.group(1) or match.group(4)
+    letter = match.group(2) or match.group(3) or match.group(5)
+    if letter == '\\i':
+        letter = 'i'
+    return unicodedata.normalize('NFC', letter + LATEX_ACCENTS[command])
+
+
+def clean_latex(value: Optional[str]) -> str:
+    """移除 LaTeX 標記（重音轉為 Unicode、去除大括號與格式指令）"""
+    if not value:
+        return ''
+    if '\\' in value:
+        value = ACCENT_RE.sub(_replace_accent, value)
+        value = SYMBOL_RE.sub(lambda m: LATEX_SYMBOLS[m.group(1)], value)
+        value = ESCAPED_RE.sub(lambda m: ESCAPED_BRACES.get(m.group(1), m.group(1)), value)
+        value = COMMAND_RE.sub('', value)
+    value = value.replace('{', '').replace('}', '').replace('~', ' ')
+    value = value.replace('---', '\u2014').replace('--', '\u2013')
+    value = value.replace(ESCAPED_BRACES['{'], '{').replace(ESCAPED_BRACES['}'], '}')
+    return WHITESPACE_RE.sub(' ', value).strip()
+
+
+def clean_identifier(value: Optional[str]) -> str:
+    """DOI / URL 只去除大括號與空白（保留 ~、-- 等字元）"""
+    if not value:
+        return ''
+    return WHITESPACE_RE.sub('', value.replace('{', '').replace('}', ''))
+
+
+def _initials(first: str) -> str:
+    """名轉為縮寫（與 ReferenceParser 相同：'Richard M.' -> 'RM'）"""
+    return ''.join(part[0] for part in re.split(r'[\s.\-]+', first) if part)
+
+
+def _split_bibtex_names(value: str) -> List[str]:
+    """以最外層的 and 分隔作者（大括號內的 and 屬於機構名稱）"""
+    names = []
+    depth = 0
+    start = 0
+    for match in NAME_SEPARATOR_RE.finditer(value):
+        token = match.group()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            names.append(value[start:match.start()])
+            start = match.end()
+    names.append(value[start:])
+    return [name.strip() for name in names if name.strip()]
+
+
+def parse_bibtex_name(name: str) -> Optional[Dict[str, str]]:
+    """
+    解析 BibTeX 姓名
+
+    支援 'Last, First'、'Last, Jr, First'、'First von Last' 與 '{機構名稱}'
+    """
+    if name.lower() == 'others':
+        return None
+    if name.startswith('{') and name.endswith('}') and NAME_TOKEN_RE.fullmatch(name):
+        return {'last': clean_latex(name), 'first': ''}
+
+    parts = [part.strip() for part in _split_top_level(name, ',')]
+    if len(parts) >= 2:
+        last, first = parts[0], parts[-1]
+    else:
+        tokens = NAME_TOKEN_RE.findall(name)
+        if not tokens:
+            return None
+        # 姓從第一個小寫開頭的字（von、de 等）開始，否則為最後一個字
+        split = len(tokens) - 1
+        for i, token in enumerate(tokens[:-1]):
+            if i > 0 and token[:1].islower():
+                split = i
+                break
+        last = ' '.join(tokens[split:])
+        first = ' '.join(tokens[:split])
+
+    last = clean_latex(last)
+    if not last:
+        return None
+    return {'last': last, 'first': _initials(clean_latex(first))}
+
+
+def parse_ris_name(name: str) -> Optional[Dict[str, str]]:
+    """解析 RIS 姓名（'Last, First' 或 'Last, F.M.'）"""
+    name = name.strip()
+    if not name:
+        return None
+    if ',' in name:
+        last, first = name.split(',', 1)
+    else:
+        tokens = name.split()
+        last, first = tokens[-1], ' '.join(tokens[:-1])
+    return {'last': last.strip(), 'first': _initials(first.strip())}
+
+
+def _split_top_level(text: str, separator: str) -> List[str]:
+    """以不在大括號內的分隔字元切分"""
+    parts = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(text):
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth = max(depth - 1, 0)
+        elif char == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+# ---------------------------------------------------------------------------
+# BibTeX
+# ---------------------------------------------------------------------------
+
+def _split_bibtex(chunks: Iterable[str]) -> Iterator[Tuple[str, str, str]]:
+    """
+    從文字區塊中逐一切出 BibTeX 條目
+
+    Yields:
+        (條目類型, 條目內容（不含外層括號）, 原始文字)
+    """
+    chunks = iter(chunks)
+    buffer = ''
+    pos = 0            # 目前條目（或搜尋）的起點
+    entry = None       # (類型, 結束字元, 內容起點)
+    scan = 0           # 已掃描到的位置
+    depth = 0          # 大括號深度
+    parens = 0         # 以 ( ) 包圍的條目中，最外層的小括號深度
+    exhausted = False
+
+    while True:
+        if entry is None:
+            match = ENTRY_START_RE.search(buffer, pos)
+            if match:
+                closing = '}' if match.group(2) == '{' else ')'
+                entry = (match.group(1).lower(), closing, match.end())
+                pos = match.start()
+                scan = match.end()
+                depth = parens = 0
+                continue
+            # 條目之外的文字皆為註解，只保留可能是不完整條目開頭的部分
+            at = buffer.rfind('@', pos)
+            pos = at if at >= 0 else len(buffer)
+        else:
+            entry_type, closing, body_start = entry
+            end = None
+            for match in DELIMITER_RE.finditer(buffer, scan):
+                char = match.group()
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    if depth == 0 and closing == '}':
+                        end = match.end()
+                        break
+                    depth = max(depth - 1, 0)
+                elif closing == ')' and depth == 0:
+                    if char == '(':
+                        parens += 1
+                    elif parens:
+                        parens -= 1
+                    else:
+                        end = match.end()
+                        break
+
+            if end is not None:
+                yield entry_type, buffer[body_start:end - 1], buffer[pos:end]
+                pos = end
+                entry = None
+                continue
+            scan = len(buffer)
+
+        if exhausted:
+            return
+
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            continue
+
+        # 丟棄已處理的部分，位置一併平移
+        if entry is not None:
+            entry_type, closing, body_start = entry
+            entry = (entry_type, closing, body_start - pos)
+            scan -= pos
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def _matching_brace(text: str, start: int) -> int:
+    """返回與 text[start] 的 '{' 對應的 '}' 位置（不平衡時為字串結尾）"""
+    depth = 0
+    for match in DELIMITER_RE.finditer(text, start):
+        char = match.group()
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return match.start()
+    return len(text)
+
+
+def _closing_quote(text: str, start: int) -> int:
+    """返回與 text[start] 的 '"' 對應的結束引號位置（忽略大括號內的引號）"""
+    depth = 0
+    for match in QUOTED_RE.finditer(text, start + 1):
+        char = match.group()
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            return match.start()
+    return len(text)
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos
+
+
+def _parse_value(text: str, pos: int, macros: Dict[str, str]) -> Tuple[str, int]:
+    """解析欄位值（{...}、"..."、數字或巨集，可用 # 串接）"""
+    parts = []
+    while True:
+        pos = _skip_whitespace(text, pos)
+        char = text[pos:pos + 1]
+        if char == '{':
+            end = _matching_brace(text, pos)
+            parts.append(text[pos + 1:end])
+            pos = end + 1
+        elif char == '"':
+            end = _closing_quote(text, pos)
+            parts.append(text[pos + 1:end])
+            pos = end + 1
+        else:
+            match = MACRO_RE.match(text, pos)
+            if not match:
+                break
+            word = match.group()
+            parts.append(macros.get(word.lower(), word))
+            pos = match.end()
+
+        pos = _skip_whitespace(text, pos)
+        if text.startswith('#', pos):
+            pos += 1
+            continue
+        break
+    return ''.join(parts), pos
+
+
+def parse_bibtex_fields(body: str, macros: Dict[str, str]) -> Dict[str, str]:
+    """解析條目內容為 {欄位名稱（小寫）: 原始值}（略過引用鍵）"""
+    fields = {}
+    pos = 0
+
+    comma = body.find(',')
+    equals = body.find('=')
+    if comma >= 0 and (equals < 0 or comma < equals):
+        pos = comma + 1
+
+    while True:
+        match = FIELD_NAME_RE.match(body, pos)
+        if not match:
+            break
+        value, pos = _parse_value(body, match.end(), macros)
+        fields.setdefault(match.group(1).lower(), value)
+
+        pos = _skip_whitespace(body, pos)
+        if not body.startswith(',', pos):
+            break
+        pos += 1
+    return fields
+
+
+def bibtex_to_data(entry_type: str, fields: Dict[str, str]) -> Dict:
+    """將 BibTeX 欄位轉換為解析結果格式（與 ReferenceParser.parse_reference 相同的欄位）"""
+    def field(*names):
+        for name in names:
+            value = clean_latex(fields.get(name))
+            if value:
+                return value
+        return None
+
+    ref_type = BIBTEX_TYPES.get(entry_type)
+    year = field('year', 'date')
+    year_match = YEAR_RE.search(year) if year else None
+
+    journal_fields = ('journal', 'journaltitle')
+    if ref_type in ('conference', 'book'):
+        journal_fields += ('booktitle',)
+
+    pages = field('pages')
+    doi = clean_identifier(fields.get('doi'))
+    keywords = field('keywords')
+
+    authors = []
+    for name in _split_bibtex_names(fields.get('author') or fields.get('editor') or ''):
+        author = parse_bibtex_name(name)
+        if author:
+            authors.append(author)
+
+    return {
+        'title': field('title'),
+        'authors': authors,
+        'year': year_match.group(0) if year_match else None,
+        'journal': field(*journal_fields),
+        'volume': field('volume'),
+        'issue': field('number', 'issue'),
+        'pages': pages.replace('\u2013', '-').replace('\u2014', '-') if pages else None,
+        'publisher': field('publisher', 'institution', 'organization', 'school'),
+        'doi': DOI_PREFIX_PATTERN.sub('', doi) if doi else None,
+        'url': clean_identifier(fields.get('url')) or None,
+        'type': ref_type,
+        'tags': ', '.join(filter(None, (k.strip() for k in re.split(r'[,;]', keywords)))) if keywords else None,
+        'notes': field('note', 'annote'),
+    }
+
+
+def iter_bibtex(chunks: Iterable[str]) -> Iterator[Tuple[Dict, str]]:
+    """
+    逐筆解析 BibTeX
+
+    Yields:
+        (解析結果, 原始條目文字)
+    """
+    macros = dict(MONTH_MACROS)
+    for entry_type, body, raw in _split_bibtex(chunks):
+        if entry_type in ('comment', 'preamble'):
+            continue
+        fields = parse_bibtex_fields(body, macros)
+        if entry_type == 'string':
+            macros.update(fields)
+            continue
+        yield bibtex_to_data(entry_type, fields), raw.strip()
+
+
+# ---------------------------------------------------------------------------
+# RIS
+# ---------------------------------------------------------------------------
+
+def _split_ris(lines: Iterable[str]) -> Iterator[Tuple[Dict[str, List[str]], str]]:
+    """
+    逐筆切出 RIS 記錄
+
+    Yields:
+        ({標籤: [值, ...]}, 原始記錄文字)
+    """
+    record = None
+    raw = []
+    last_tag = None
+
+    for line in lines:
+        line = line.rstrip('\r\n').lstrip('\ufeff')
+        match = RIS_LINE_RE.match(line)
+        if match:
+            tag, value = match.group(1), match.group(2).strip()
+            if tag == 'TY':
+                record = {'TY': [value]}
+                raw = [line]
+                last_tag = tag
+                continue
+            if record is None:
+                continue
+            raw.append(line)
+            if tag == 'ER':
+                yield record, '\n'.join(raw)
+                record = None
+                continue
+            record.setdefault(tag, []).append(value)
+            last_tag = tag
+        elif record is not None and line.strip():
+            # 部分軟體會將過長的值折行
+            record[last_tag][-1] = f'{record[last_tag][-1]} {line.strip()}'.strip()
+            raw.append(line)
+
+    # 最後一筆缺少 ER 時仍然匯入
+    if record is not None:
+        yield record, '\n'.join(raw)
+
+
+def ris_to_data(record: Dict[str, List[str]]) -> Dict:
+    """將 RIS 記錄轉換為解析結果格式"""
+    def field(*tags):
+        for tag in tags:
+            for value in record.get(tag, ()):
+                if value:
+                    return value
+        return None
+
+    year = field('PY', 'Y1', 'DA')
+    year_match = YEAR_RE.search(year) if year else None
+
+    start_page, end_page = field('SP'), field('EP')
+    pages = f'{start_page}-{end_page}' if start_page and end_page else start_page
+
+    authors = []
+    for name in record.get('AU', []) + record.get('A1', []):
+        author = parse_ris_name(name)
+        if author:
+            authors.append(author)
+
+    doi = field('DO')
+    keywords = [k for k in record.get('KW', []) if k]
+
+    return {
+        'title': field('TI', 'T1', 'CT', 'BT'),
+        'authors': authors,
+        'year': year_match.group(0) if year_match else None,
+        'journal': field('JF', 'JO', 'T2', 'JA', 'J2'),
+        'volume': field('VL'),
+        'issue': field('IS', 'CP'),
+        'pages': pages,
+        'publisher': field('PB'),
+        'doi': DOI_PREFIX_PATTERN.sub('', doi) if doi else None,
+        'url': field('UR', 'L2'),
+        'type': RIS_TYPES.get((field('TY') or '').upper()),
+        'tags': ', '.join(keywords) or None,
+        'notes': field('N1'),
+    }
+
+
+def iter_ris(chunks: Iterable[str]) -> Iterator[Tuple[Dict, str]]:
+    """
+    逐筆解析 RIS
+
+    Yields:
+        (解析結果, 原始記錄文字)
+    """
+    for record, raw in _split_ris(_iter_lines(chunks)):
+        yield ris_to_data(record), raw
+
+
+def iter_records(stream: TextIO, fmt: Optional[str] = None,
+                 filename: Optional[str] = None) -> Iterator[Tuple[Dict, str]]:
+    """
+    逐筆解析匯入檔
+
+    Args:
+        stream: 文字串流
+        fmt: 'bibtex' 或 'ris'，未指定時依副檔名或內容判斷
+
+    Raises:
+        ValueError: 無法判斷或不支援的格式
+    """
+    chunks = read_chunks(stream)
+    first = next(chunks, '')
+    fmt = fmt or detect_format(filename, first)
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError('不支援的匯入格式（僅支援 BibTeX 與 RIS）')
+
+    chunks = chain([first], chunks)
+    return iter_bibtex(chunks) if fmt == 'bibtex' else iter_ris(chunks)
+
+
+# ---------------------------------------------------------------------------
+# 寫入資料庫
+# ---------------------------------------------------------------------------
+
+def _fit(column: str, value):
+    """依欄位長度截斷字串（避免 PostgreSQL 拒絕整批寫入）"""
+    length = getattr(Reference.__table__.c[column].type, 'length', None)
+    if length and isinstance(value, str) and len(value) > length:
+        return value[:length]
+    return value
+
+
+def reference_row(user_id: int, data: Dict, original_text: str) -> Optional[Dict]:
+    """將解析結果轉換為 references 資料列，缺少標題時返回 None"""
+    if not data.get('title'):
+        return None
+
+    data = dict(data)
+    data['type'] = data.get('type') or _parser.detect_reference_type(data)
+    if data['type'] == 'unknown':
+        data['type'] = 'article'
+
+    row = {
+        'user_id': user_id,
+        'title': data['title'],
+        'authors': data.get('authors') or [],
+        'year': data.get('year'),
+        'journal': data.get('journal'),
+        'volume': data.get('volume'),
+        'issue': data.get('issue'),
+        'pages': data.get('pages'),
+        'publisher': data.get('publisher'),
+        'doi': data.get('doi'),
+        'url': data.get('url'),
+        'reference_type': data['type'],
+        'tags': data.get('tags') or '',
+        'notes': data.get('notes') or '',
+        'original_text': original_text,
+        'confidence': _parser.calculate_confidence(data),
+        'completeness': _parser.calculate_completeness(data),
+        'enriched': False,
+    }
+    row = {column: _fit(column, value) for column, value in row.items()}
+    row['normalized_doi'], row['fingerprint'] = reference_keys(row)
+    return row
+
+
+def _insert_statement():
+    """批次 INSERT（同一用戶的 DOI 已存在時略過，避免並行匯入違反唯一索引）"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(Reference).returning(Reference)
+    return dialect_insert(Reference).on_conflict_do_nothing(
+        index_elements=['user_id', 'normalized_doi']
+    ).returning(Reference)
+
+
+def _insert_batch(user_id: int, rows: List[Dict]) -> Tuple[int, int]:
+    """
+    以單一多列 INSERT 寫入一批文獻，重複的文獻合併至既有文獻
+
+    批次 INSERT 不經過 flush，全文檢索的 after_flush 事件不會觸發，需自行寫入索引
+
+    Returns:
+        (新增筆數, 合併筆數)
+    """
+    rows, merged = split_duplicates(user_id, rows)
+    if not rows:
+        return 0, merged
+
+    references = db.session.scalars(_insert_statement(), rows).all()
+    write_documents(db.session.connection(), references, [])
+    return len(references), merged + len(rows) - len(references)
+
+
+def import_references(user_id: int, records: Iterable[Tuple[Dict, str]],
+                      batch_size: int = DEFAULT_BATCH_SIZE) -> Dict:
+    """
+    分批匯入文獻（完成後提交）
+
+    Args:
+        user_id: 用戶 ID
+        records: iter_records() 的輸出
+        batch_size: 每批寫入筆數
+
+    Returns:
+        { imported, duplicates, skipped, errors, seconds, rate }
+    """
+    started = time.perf_counter()
+    imported = duplicates = skipped = 0
+    errors = []
+    batch = []
+
+    for index, (data, raw) in enumerate(records):
+        row = reference_row(user_id, data, raw)
+        if row is None:
+            skipped += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({'index': index, 'error': '缺少標題'})
+            continue
+
+        batch.append(row)
+        if len(batch) >= batch_size:
+            inserted, merged = _insert_batch(user_id, batch)
+            imported += inserted
+            duplicates += merged
+            batch = []
+
+    if batch:
+        inserted, merged = _insert_batch(user_id, batch)
+        imported += inserted
+        duplicates += merged
+    db.session.commit()
+
+    seconds = time.perf_counter() - started
+    logger.info(
+        f"用戶 {user_id} 匯入 {imported} 筆文獻（合併重複 {duplicates} 筆，略過 {skipped} 筆），耗時 {seconds:.2f} 秒"
+    )
+    return {
+        'imported': imported,
+        'duplicates': duplicates,
+        'skipped': skipped,
+        'errors': errors,
+        'seconds': round(seconds, 3),
+        'rate': round(imported / seconds, 1) if seconds else None,
+    }
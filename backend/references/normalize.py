@@ -0,0 +1,52 @@
+"""
+查詢鍵正規化
+Lookup Key Normalization
+
+同一篇文獻常以不同寫法出現（https://doi.org/ 前綴、大小寫、標點、全形字元），
+正規化後才能共用快取。
+"""
+
+import re
+import unicodedata
+from typing import List, Optional
+
+# DOI 前綴（URL、doi: 標記）
+DOI_PREFIX_PATTERN = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+
+# 非文字字元（查詢字串中視為分隔）
+NON_WORD_PATTERN = re.compile(r'[^\w]+', re.UNICODE)
+
+
+def normalize_doi(doi: Optional[str]) -> Optional[str]:
+    """
+    正規化 DOI（DOI 不分大小寫）
+
+    Examples:
+        'https://doi.org/10.1038/Nature14539.' -> '10.1038/nature14539'
+    """
+    if not doi:
+        return None
+
+    doi = unicodedata.normalize('NFKC', doi).strip()
+    doi = DOI_PREFIX_PATTERN.sub('', doi)
+    doi = doi.rstrip('.,;')
+    return doi.lower() or None
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """全形轉半形、不分大小寫、標點與空白合併為單一空格"""
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKC', text).casefold()
+    return NON_WORD_PATTERN.sub(' ', text).strip()
+
+
+def normalize_query(title: str, authors: List[str] = None) -> str:
+    """
+    正規化標題 + 作者查詢（作者只取前兩位，與實際查詢一致）
+
+    Examples:
+        ('Deep Learning.', ['LeCun', 'Bengio']) -> 'deep learning|lecun bengio'
+    """
+    author_part = ' '.join(normalize_text(a) for a in (authors or [])[:2] if a)
+    return f'{normalize_text(title)}|{author_part}'
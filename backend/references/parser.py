@@ -28,6 +28,18 @@ class ReferenceParser:
     # 期刊卷期頁碼模式
     VOLUME_ISSUE_PATTERN = r'(\d+)\((\d+)\),?\s*(\d+(?:-\d+)?)'
 
+    # 預先編譯的正則表達式（避免每次呼叫都經過 re 模組的快取查詢）
+    DOI_RE = re.compile(DOI_PATTERN, re.IGNORECASE)
+    DOI_STRIP_RE = re.compile(DOI_PATTERN)  # 標題清理用（不分大小寫會多匹配少數 Unicode 字元）
+    YEAR_RE = re.compile(YEAR_PATTERN)
+    APA_AUTHOR_RE = re.compile(r'([A-Z][a-z]+(?:-[A-Z][a-z]+)?),\s*([A-Z]\.(?:\s*[A-Z]\.)?)')
+    SIMPLE_AUTHOR_RE = re.compile(r'\b([A-Z][a-z]+)\s+([A-Z][a-z]+)\b')
+    VOLUME_ISSUE_RE = re.compile(VOLUME_ISSUE_PATTERN)
+    VOLUME_PAGES_RE = re.compile(r'(\d+),\s*(\d+(?:-\d+)?)')
+    URL_RE = re.compile(r'https?://[^\s]+')
+    TITLE_RE = re.compile(r'\(?\d{4}\)?\.\s*(.+?)\.')
+    TRAILING_JOURNAL_RE = re.compile(r'\s*[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,?\s*$')
+
     def parse_reference(self, text: str) -> Dict:
         """
         解析純文字文獻
@@ -87,9 +99,14 @@ class ReferenceParser:
     def extract_doi(self, text: str) -> Optional[str]:
         """提取 DOI"""
         # 移除常見的 DOI 前綴
-        text = text.replace('doi:', '').replace('DOI:', '').replace('https://doi.org/', '')
+        if 'doi' in text or 'DOI' in text:
+            text = text.replace('doi:', '').replace('DOI:', '').replace('https://doi.org/', '')
+
+        # DOI 必定包含 '10.'，不含時略過正則搜尋
+        if '10.' not in text:
+            return None
 
-        match = re.search(self.DOI_PATTERN, text, re.IGNORECASE)
+        match = self.DOI_RE.search(text)
         if match:
             doi = match.group(0)
             # 清理尾部標點符號
@@ -100,16 +117,16 @@ class ReferenceParser:
     def extract_year(self, text: str) -> Optional[str]:
         """提取年份"""
         # 通常年份在括號中：(2020) 或在作者後：Smith 2020
-        year_match = re.search(r'\((' + self.YEAR_PATTERN + r')\)', text)
-        if year_match:
-            return year_match.group(1)
+        # 單次掃描：優先返回括號中的年份，否則返回第一個年份
+        first = None
+        for year_match in self.YEAR_RE.finditer(text):
+            start, end = year_match.span()
+            if start > 0 and text[start - 1] == '(' and text[end:end + 1] == ')':
+                return year_match.group(0)
+            if first is None:
+                first = year_match.group(0)
 
-        # 如果沒找到括號中的年份，找任何年份
-        year_match = re.search(self.YEAR_PATTERN, text)
-        if year_match:
-            return year_match.group(0)
-
-        return None
+        return first
 
     def extract_authors(self, text: str) -> List[Dict[str, str]]:
         """
@@ -121,8 +138,7 @@ class ReferenceParser:
         authors = []
 
         # 嘗試匹配 APA 格式：Last, F. M.
-        apa_pattern = r'([A-Z][a-z]+(?:-[A-Z][a-z]+)?),\s*([A-Z]\.(?:\s*[A-Z]\.)?)'
-        matches = re.findall(apa_pattern, text)
+        matches = self.APA_AUTHOR_RE.findall(text)
 
         for match in matches:
             authors.append({
@@ -132,8 +148,7 @@ class ReferenceParser:
 
         # 如果沒找到，嘗試匹配簡單格式：FirstName LastName
         if not authors:
-            simple_pattern = r'\b([A-Z][a-z]+)\s+([A-Z][a-z]+)\b'
-            matches = re.findall(simple_pattern, text[:100])  # 只搜尋前 100 字元
+            matches = self.SIMPLE_AUTHOR_RE.findall(text[:100])  # 只搜尋前 100 字元
 
             for match in matches[:3]:  # 最多取 3 個
                 authors.append({
@@ -151,16 +166,19 @@ class ReferenceParser:
         1. 如果有句號，假設第一個句號後、第二個句號前是標題
         2. 移除年份和作者後的文字可能是標題
         """
-        # 移除 DOI 和 URL
-        clean_text = re.sub(r'https?://\S+', '', text)
-        clean_text = re.sub(self.DOI_PATTERN, '', clean_text)
+        # 移除 DOI 和 URL（不含 'http' / '10.' 時不可能匹配，略過）
+        clean_text = text
+        if 'http' in clean_text:
+            clean_text = self.URL_RE.sub('', clean_text)
+        if '10.' in clean_text:
+            clean_text = self.DOI_STRIP_RE.sub('', clean_text)
 
         # 嘗試找到年份後的第一個句點之前的文字
-        year_match = re.search(r'\(?\d{4}\)?\.\s*(.+?)\.', clean_text)
+        year_match = self.TITLE_RE.search(clean_text)
         if year_match:
             title = year_match.group(1).strip()
             # 移除期刊名稱（通常是斜體或大寫）
-            title = re.sub(r'\s*[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,?\s*$', '', title)
+            title = self.TRAILING_JOURNAL_RE.sub('', title)
             return title
 
         # 如果找不到，返回 None
@@ -169,7 +187,7 @@ class ReferenceParser:
     def extract_journal_info(self, text: str) -> Optional[Dict]:
         """提取期刊、卷、期、頁碼資訊"""
         # 匹配格式：Volume(Issue), Pages 或 Volume, Pages
-        match = re.search(self.VOLUME_ISSUE_PATTERN, text)
+        match = self.VOLUME_ISSUE_RE.search(text)
 
         if match:
             return {
@@ -179,7 +197,7 @@ class ReferenceParser:
             }
 
         # 嘗試只匹配卷號和頁碼
-        simple_match = re.search(r'(\d+),\s*(\d+(?:-\d+)?)', text)
+        simple_match = self.VOLUME_PAGES_RE.search(text)
         if simple_match:
             return {
                 'volume': simple_match.group(1),
@@ -190,8 +208,9 @@ class ReferenceParser:
 
     def extract_url(self, text: str) -> Optional[str]:
         """提取 URL"""
-        url_pattern = r'https?://[^\s]+'
-        match = re.search(url_pattern, text)
+        if 'http' not in text:
+            return None
+        match = self.URL_RE.search(text)
         if match:
             url = match.group(0)
             # 清理尾部標點符號
@@ -0,0 +1,215 @@
+"""
+對外 API 速率限制
+Outbound Rate Limiter
+
+以 token bucket 控制對 CrossRef / OpenAlex 的請求速率。
+狀態保存於本機檔案並以 fcntl 檔案鎖同步，同一台機器上的所有
+gunicorn worker 與背景工作進程共用同一個額度。
+
+- 主動限速：取不到 token 時短暫等待（最多 max_wait 秒），超過則拋出 RateLimited，
+  由呼叫端回報「受速率限制」或稍後重試（不會默默略過請求）
+- 依回應標頭調整：X-Rate-Limit-Limit / X-Rate-Limit-Interval 更新速率，
+  429 / 503 的 Retry-After 暫停該主機的所有請求
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows 開發環境：僅限同一進程內同步
+    fcntl = None
+
+# 未提供 Retry-After 時的暫停秒數
+DEFAULT_RETRY_AFTER = 5
+
+INTERVAL_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*$')
+INTERVAL_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, None: 1}
+
+
+class RateLimited(Exception):
+    """取不到對外請求額度（超過 max_wait 或來源返回 429），可於 retry_after 秒後重試"""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f'{host} 超過對外請求速率限制，{retry_after:.1f} 秒後可重試')
+        self.host = host
+        self.retry_after = retry_after
+
+
+def parse_interval(value: Optional[str]) -> Optional[float]:
+    """解析 X-Rate-Limit-Interval（例如 '1s'）為秒數"""
+    match = INTERVAL_PATTERN.match(value or '')
+    if not match:
+        return None
+    return float(match.group(1)) * INTERVAL_UNITS[match.group(2)]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After（秒數或 HTTP 日期）"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """跨進程共用的 token bucket（每個主機一個狀態檔）"""
+
+    def __init__(self, path: str, rate: float, capacity: float):
+        """
+        Args:
+            path: 狀態檔路徑
+            rate: 每秒補充的 token 數（預設速率，可被回應標頭覆寫）
+            capacity: 最大累積 token 數（允許的突發請求數）
+        """
+        self.path = path
+        self.rate = rate
+        self.capacity = capacity
+        self._lock = threading.Lock()
+
+    def _update(self, fn):
+        """在檔案鎖內讀取、修改並寫回狀態"""
+        with self._lock, open(self.path, 'a+') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or '{}')
+                except ValueError:
+                    state = {}
+
+                now = time.time()
+                rate = state.get('rate', self.rate)
+                capacity = state.get('capacity', self.capacity)
+                elapsed = max(now - state.get('updated', now), 0)
+                state['tokens'] = min(capacity, state.get('tokens', capacity) + elapsed * rate)
+                state['updated'] = now
+                state.setdefault('rate', rate)
+                state.setdefault('capacity', capacity)
+
+                result = fn(state, now)
+
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+                return result
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def try_acquire(self) -> float:
+        """
+        嘗試取得一個 token
+
+        Returns:
+            0 表示取得成功，否則為需要等待的秒數
+        """
+        def take(state, now):
+            blocked_until = state.get('blocked_until', 0)
+            if now < blocked_until:
+                return blocked_until - now
+            if state['tokens'] >= 1:
+                state['tokens'] -= 1
+                return 0.0
+            return (1 - state['tokens']) / state['rate']
+
+        return self._update(take)
+
+    def set_rate(self, rate: float, capacity: float):
+        """更新速率（所有進程共用）"""
+        def apply(state, now):
+            state['rate'] = rate
+            state['capacity'] = capacity
+            state['tokens'] = min(state['tokens'], capacity)
+
+        self._update(apply)
+
+    def block(self, seconds: float):
+        """暫停請求直到指定秒數之後"""
+        def apply(state, now):
+            state['blocked_until'] = max(state.get('blocked_until', 0), now + seconds)
+            state['tokens'] = 0
+
+        self._update(apply)
+
+
+class RateLimiter:
+    """依主機分別限速的對外請求限制器"""
+
+    def __init__(self, directory: str, rate: float = 10, capacity: float = 10, max_wait: float = 2):
+        """
+        Args:
+            directory: 狀態檔目錄（同一台機器的進程需指向同一目錄）
+            rate: 每個主機每秒請求數
+            capacity: 突發請求數
+            max_wait: 取得 token 的最長等待秒數
+        """
+        self.directory = directory
+        self.rate = rate
+        self.capacity = capacity
+        self.max_wait = max_wait
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._advertised: Dict[str, float] = {}  # 各主機最近一次由標頭得知的速率
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                path = os.path.join(self.directory, f'{host}.json')
+                self._buckets[host] = TokenBucket(path, self.rate, self.capacity)
+            return self._buckets[host]
+
+    def acquire(self, host: str):
+        """
+        取得對該主機發送一個請求的額度
+
+        Raises:
+            RateLimited: 需等待超過 max_wait 秒（不阻塞 web worker，由呼叫端決定回報或重試）
+        """
+        bucket = self.bucket(host)
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            wait = bucket.try_acquire()
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimited(host, wait)
+            time.sleep(wait)
+
+    def observe(self, host: str, response):
+        """依回應標頭調整速率或暫停請求"""
+        headers = response.headers
+
+        limit = headers.get('X-Rate-Limit-Limit')
+        interval = parse_interval(headers.get('X-Rate-Limit-Interval'))
+        if limit and interval:
+            try:
+                limit = float(limit)
+            except ValueError:
+                limit = None
+            if limit and limit > 0:
+                rate = limit / interval
+                if self._advertised.get(host) != rate:
+                    self.bucket(host).set_rate(rate, limit)
+                    self._advertised[host] = rate
+
+        if response.status_code in (429, 503):
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            if retry_after is None and response.status_code == 429:
+                retry_after = DEFAULT_RETRY_AFTER
+            if retry_after:
+                self.bucket(host).block(retry_after)
@@ -0,0 +1,204 @@
+"""
+多來源文獻查詢
+Multi-source Metadata Resolver
+
+同時向多個來源（CrossRef、OpenAlex、doi.org CSL-JSON）查詢：
+- 任一來源返回高品質結果即採用，不再等待其他來源
+- 否則等全部完成（或逾時）後，依品質由高到低合併
+- 記錄各來源延遲與成功率
+
+未等待的查詢無法中斷已送出的 HTTP 請求，會在背景完成（結果仍寫入快取）。
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .ratelimit import RateLimited
+
+# 評估品質的欄位
+QUALITY_FIELDS = ('title', 'authors', 'year', 'journal', 'volume', 'issue', 'pages', 'doi', 'publisher')
+
+# 延遲統計保留的樣本數
+LATENCY_WINDOW = 200
+
+
+def quality_score(data: Optional[Dict]) -> float:
+    """結果完整度（0 ~ 1）"""
+    if not data:
+        return 0.0
+    return sum(1 for field in QUALITY_FIELDS if data.get(field)) / len(QUALITY_FIELDS)
+
+
+def merge_results(results: Sequence[Dict]) -> Dict:
+    """以品質最高者為主，缺少的欄位由其他結果補上"""
+    ordered = sorted(results, key=quality_score, reverse=True)
+    merged = dict(ordered[0])
+    for result in ordered[1:]:
+        for key, value in result.items():
+            if value and not merged.get(key):
+                merged[key] = value
+    return merged
+
+
+class SourceMetrics:
+    """單一來源的查詢統計"""
+
+    def __init__(self):
+        self.requests = 0
+        self.found = 0
+        self.not_found = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.selected = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def to_dict(self) -> Dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000, 1)
+
+        return {
+            'requests': self.requests,
+            'found': self.found,
+            'not_found': self.not_found,
+            'errors': self.errors,
+            'rate_limited': self.rate_limited,
+            'selected': self.selected,
+            'p50_ms': percentile(0.5),
+            'p95_ms': percentile(0.95)
+        }
+
+
+class MultiSourceResolver:
+    """並行查詢多個來源並選出最佳結果"""
+
+    def __init__(self, max_workers: int = 8, timeout: float = 8, quality_threshold: float = 0.75):
+        """
+        Args:
+            max_workers: 查詢執行緒數
+            timeout: 等待所有來源的最長秒數
+            quality_threshold: 達到此完整度即採用，不再等待其他來源
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.quality_threshold = quality_threshold
+
+        self._metrics: Dict[str, SourceMetrics] = {}
+        self._metrics_lock = threading.Lock()
+
+        self._executor = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """執行緒池（fork 後的子進程重新建立）"""
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            with self._executor_lock:
+                if self._executor is None or self._executor_pid != pid:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix='resolver'
+                    )
+                    self._executor_pid = pid
+        return self._executor
+
+    def _record(self, source: str, **changes):
+        with self._metrics_lock:
+            metrics = self._metrics.setdefault(source, SourceMetrics())
+            for name, value in changes.items():
+                if name == 'latency':
+                    metrics.latencies.append(value)
+                else:
+                    setattr(metrics, name, getattr(metrics, name) + value)
+
+    def _timed(self, source: str, lookup: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+        started = time.perf_counter()
+        try:
+            result = lookup()
+        except RateLimited:
+            self._record(source, requests=1, rate_limited=1, latency=time.perf_counter() - started)
+            raise
+        except Exception:
+            self._record(source, requests=1, errors=1, latency=time.perf_counter() - started)
+            raise
+        self._record(
+            source, requests=1, latency=time.perf_counter() - started,
+            **({'found': 1} if result else {'not_found': 1})
+        )
+        return result
+
+    def resolve(self, lookups: Sequence[Tuple[str, Callable[[], Optional[Dict]]]]) -> Tuple[Optional[Dict], List[str]]:
+        """
+        並行執行查詢
+
+        Args:
+            lookups: [(來源名稱, 查詢函式)]，查詢函式返回結果或 None
+
+        Returns:
+            (結果, 採用的來源名稱列表)，全部查無結果時為 (None, [])
+
+        Raises:
+            RateLimited: 沒有任何結果且至少一個來源受速率限制（結果不代表查無此文獻）
+        """
+        if not lookups:
+            return None, []
+
+        futures = {
+            self.executor.submit(self._timed, source, lookup): source
+            for source, lookup in lookups
+        }
+        pending = set(futures)
+        results = {}
+        limited = []
+        deadline = time.monotonic() + self.timeout
+
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except RateLimited as e:
+                    limited.append(e)
+                    continue
+                except Exception:
+                    continue
+                if not result:
+                    continue
+
+                source = futures[future]
+                if quality_score(result) >= self.quality_threshold:
+                    # 已有高品質結果，取消尚未開始的查詢
+                    for other in pending:
+                        other.cancel()
+                    self._record(source, selected=1)
+                    return result, [source]
+                results[source] = result
+
+        for future in pending:
+            future.cancel()
+
+        if not results:
+            if limited:
+                raise min(limited, key=lambda e: e.retry_after)
+            return None, []
+
+        sources = sorted(results, key=lambda s: quality_score(results[s]), reverse=True)
+        for source in sources:
+            self._record(source, selected=1)
+        return merge_results([results[s] for s in sources]), sources
+
+    def metrics(self) -> Dict:
+        """各來源的查詢統計"""
+        with self._metrics_lock:
+            return {source: metrics.to_dict() for source, metrics in self._metrics.items()}
@@ -0,0 +1,72 @@
+"""
+API 客戶端設定
+API Client Factory
+
+依應用設定建立 APIClient（元數據快取、速率限制、多來源查詢），
+每個進程建立一次，供請求與背景工作共用。
+"""
+
+import threading
+
+from flask import current_app
+
+from models import db
+from .api_client import APIClient
+from .cache import MetadataCache
+from .ratelimit import RateLimiter
+from .resolver import MultiSourceResolver
+
+# gthread / gevent worker 的多個請求可能同時第一次取得客戶端
+_client_lock = threading.Lock()
+
+
+def get_api_client() -> APIClient:
+    """取得 API 客戶端（每個進程建立一次，依設定附上元數據快取與速率限制器）"""
+    client = current_app.extensions.get('reference_api_client')
+    if client is not None:
+        return client
+
+    with _client_lock:
+        client = current_app.extensions.get('reference_api_client')
+        if client is not None:
+            return client
+
+        config = current_app.config
+        cache = None
+        if config.get('METADATA_CACHE_ENABLED', True):
+            cache = MetadataCache(
+                db.engine,
+                ttl=config.get('METADATA_CACHE_TTL', 30 * 24 * 3600),
+                negative_ttl=config.get('METADATA_CACHE_NEGATIVE_TTL', 24 * 3600),
+                hit_flush_size=config.get('METADATA_CACHE_HIT_FLUSH_SIZE', 100),
+                hit_flush_interval=config.get('METADATA_CACHE_HIT_FLUSH_INTERVAL', 60)
+            )
+        rate_limiter = None
+        if config.get('REFERENCE_API_RATE'):
+            rate_limiter = RateLimiter(
+                config['RATE_LIMIT_DIR'],
+                rate=config['REFERENCE_API_RATE'],
+                capacity=config.get('REFERENCE_API_BURST', 10),
+                max_wait=config.get('REFERENCE_API_MAX_WAIT', 2)
+            )
+        client = APIClient(
+            timeout=config.get('REFERENCE_API_TIMEOUT', 10),
+            max_retries=config.get('REFERENCE_API_MAX_RETRIES', 3),
+            cache=cache,
+            rate_limiter=rate_limiter,
+            sources=config.get('REFERENCE_SOURCES'),
+            resolver=MultiSourceResolver(
+                max_workers=config.get('REFERENCE_RESOLVER_WORKERS', 8),
+                timeout=config.get('REFERENCE_RESOLVER_TIMEOUT', 8),
+                quality_threshold=config.get('REFERENCE_RESOLVER_QUALITY', 0.75)
+            ),
+            pool_maxsize=config.get('REFERENCE_API_POOL_SIZE', 10),
+            backoff_factor=config.get('REFERENCE_API_BACKOFF', 0.5),
+            endpoints={
+                'crossref': config.get('CROSSREF_API_URL'),
+                'openalex': config.get('OPENALEX_API_URL'),
+                'doi.org': config.get('DOI_ORG_URL'),
+            }
+        )
+        current_app.extensions['reference_api_client'] = client
+    return client
@@ -6,6 +6,8 @@ Authentication Routes
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from models import db, User
+from identity import current_user
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
@@ -85,13 +87,10 @@ def login():
 def get_current_user():
     """獲取當前用戶資訊"""
     try:
-        user_id = int(get_jwt_identity())  # 轉換字元串為整數
-        user = User.query.get(user_id)
-
-        if not user:
+        if not current_user:
             return jsonify({'error': '用戶不存在'}), 404
 
-        return jsonify(user.to_dict()), 200
+        return jsonify(current_user.to_dict()), 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -125,7 +124,13 @@ def update_current_user():
                 return jsonify({'error': '此郵箱已被使用'}), 400
             user.email = data['email']
 
+        timezone_changed = False
         if 'timezone' in data:
+            try:
+                ZoneInfo(data['timezone'])
+            except (ZoneInfoNotFoundError, ValueError, TypeError):
+                return jsonify({'error': '無效的時區'}), 400
+            timezone_changed = data['timezone'] != user.timezone
             user.timezone = data['timezone']
 
         if 'pomodoro_duration' in data:
@@ -142,6 +147,11 @@ def update_current_user():
 
         db.session.commit()
 
+        # 時區變更後，依新時區重建每日專注彙總（儀表板版本已隨用戶資料的變更遞增）
+        if timezone_changed:
+            from stats import backfill_rollup
+            backfill_rollup(user.id)
+
         return jsonify({
             'message': '資料更新成功',
             'user': user.to_dict()
@@ -225,10 +235,20 @@ def delete_account_by_email():
         from models.todo import Todo
         from models.note import Note
         from models.pomodoro import PomodoroSession
+        from models.focus_rollup import DailyFocusRollup
 
         Todo.query.filter_by(user_id=user.id).delete()
         Note.query.filter_by(user_id=user.id).delete()
         PomodoroSession.query.filter_by(user_id=user.id).delete()
+        DailyFocusRollup.query.filter_by(user_id=user.id).delete()
+
+        # 批次刪除不會觸發索引同步，手動清除全文檢索文件
+        import fulltext
+        fulltext.remove_user_documents(user.id)
+
+        # 刪除非同步導出檔案（工作紀錄隨用戶級聯刪除）
+        import jobs
+        jobs.export.remove_user_artifacts(user.id)
 
         # 刪除用戶
         db.session.delete(user)
@@ -6,6 +6,7 @@ Notes Routes
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, Note
+from pagination import SortKey, paginate, page_args, cursor_headers
 
 notes_bp = Blueprint('notes', __name__, url_prefix='/api/notes')
 
@@ -13,13 +14,14 @@ notes_bp = Blueprint('notes', __name__, url_prefix='/api/notes')
 @notes_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_notes():
-    """獲取用戶的所有筆記"""
+    """獲取用戶的筆記（帶 limit 或 cursor 時分頁，下一頁游標見 X-Next-Cursor 標頭）"""
     try:
         user_id = int(get_jwt_identity())
 
         # 查詢參數
         category = request.args.get('category')
         pinned = request.args.get('pinned')
+        limit, cursor = page_args(request)
 
         query = Note.query.filter_by(user_id=user_id)
 
@@ -29,10 +31,16 @@ def get_notes():
         if pinned is not None:
             query = query.filter_by(pinned=pinned.lower() == 'true')
 
-        notes = query.order_by(Note.pinned.desc(), Note.updated_at.desc()).all()
+        notes, next_cursor = paginate(query, [
+            SortKey(Note.pinned, descending=True, default=False),
+            SortKey(Note.updated_at, descending=True),
+            SortKey(Note.id, descending=True)
+        ], limit=limit, cursor=cursor)
 
-        return jsonify([note.to_dict() for note in notes]), 200
+        return jsonify([note.to_dict() for note in notes]), 200, cursor_headers(next_cursor)
 
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -6,8 +6,9 @@ Pomodoro Routes
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, PomodoroSession
-from datetime import datetime, timedelta
-from sqlalchemy import func
+from stats import record_focus_session, focus_statistics, to_utc_naive
+from pagination import SortKey, paginate, page_args, cursor_headers
+from datetime import datetime
 
 pomodoro_bp = Blueprint('pomodoro', __name__, url_prefix='/api/pomodoro')
 
@@ -15,14 +16,14 @@ pomodoro_bp = Blueprint('pomodoro', __name__, url_prefix='/api/pomodoro')
 @pomodoro_bp.route('/sessions', methods=['GET'])
 @jwt_required()
 def get_sessions():
-    """獲取番茄鐘記錄"""
+    """獲取番茄鐘記錄（keyset 分頁，下一頁游標見 X-Next-Cursor 標頭）"""
     try:
         user_id = int(get_jwt_identity())
 
         # 查詢參數
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
-        limit = request.args.get('limit', 100, type=int)
+        limit, cursor = page_args(request, default_limit=100)
 
         query = PomodoroSession.query.filter_by(user_id=user_id)
 
@@ -32,10 +33,15 @@ def get_sessions():
         if end_date:
             query = query.filter(PomodoroSession.started_at <= datetime.fromisoformat(end_date))
 
-        sessions = query.order_by(PomodoroSession.started_at.desc()).limit(limit).all()
+        sessions, next_cursor = paginate(query, [
+            SortKey(PomodoroSession.started_at, descending=True),
+            SortKey(PomodoroSession.id, descending=True)
+        ], limit=limit, cursor=cursor)
 
-        return jsonify([session.to_dict() for session in sessions]), 200
+        return jsonify([session.to_dict() for session in sessions]), 200, cursor_headers(next_cursor)
 
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -54,11 +60,15 @@ def create_session():
             session_type=data.get('session_type', 'focus'),
             completed=data.get('completed', True),
             task_name=data.get('task_name'),
-            started_at=datetime.fromisoformat(data['started_at']) if data.get('started_at') else datetime.utcnow(),
-            ended_at=datetime.fromisoformat(data['ended_at']) if data.get('ended_at') else datetime.utcnow()
+            # 前端傳入帶時區的 ISO 時間（toISOString），統一存為 UTC
+            started_at=to_utc_naive(datetime.fromisoformat(data['started_at'])) if data.get('started_at') else datetime.utcnow(),
+            ended_at=to_utc_naive(datetime.fromisoformat(data['ended_at'])) if data.get('ended_at') else datetime.utcnow()
         )
 
         db.session.add(session)
+
+        # 累加每日專注彙總（同一交易）
+        record_focus_session(session)
         db.session.commit()
 
         return jsonify(session.to_dict()), 201
@@ -71,65 +81,14 @@ def create_session():
 @pomodoro_bp.route('/stats', methods=['GET'])
 @jwt_required()
 def get_statistics():
-    """獲取番茄鐘統計資料"""
+    """獲取番茄鐘統計資料（讀取每日專注彙總）"""
     try:
         user_id = int(get_jwt_identity())
 
         # 查詢參數
         period = request.args.get('period', 'week')  # week, month, year
 
-        # 計算時間範圍
-        now = datetime.utcnow()
-        if period == 'week':
-            start_date = now - timedelta(days=7)
-        elif period == 'month':
-            start_date = now - timedelta(days=30)
-        elif period == 'year':
-            start_date = now - timedelta(days=365)
-        else:
-            start_date = now - timedelta(days=7)
-
-        # 查詢會話
-        sessions = PomodoroSession.query.filter(
-            PomodoroSession.user_id == user_id,
-            PomodoroSession.started_at >= start_date,
-            PomodoroSession.session_type == 'focus',
-            PomodoroSession.completed == True
-        ).all()
-
-        # 計算統計
-        total_sessions = len(sessions)
-        total_minutes = sum(s.duration for s in sessions)
-        total_hours = round(total_minutes / 60, 1)
-
-        # 每日統計
-        daily_stats = {}
-        for session in sessions:
-            date_key = session.started_at.strftime('%Y-%m-%d')
-            if date_key not in daily_stats:
-                daily_stats[date_key] = {'sessions': 0, 'minutes': 0}
-            daily_stats[date_key]['sessions'] += 1
-            daily_stats[date_key]['minutes'] += session.duration
-
-        # 轉換為列表
-        daily_list = [
-            {
-                'date': date,
-                'sessions': stats['sessions'],
-                'minutes': stats['minutes'],
-                'hours': round(stats['minutes'] / 60, 1)
-            }
-            for date, stats in sorted(daily_stats.items())
-        ]
-
-        return jsonify({
-            'period': period,
-            'total_sessions': total_sessions,
-            'total_minutes': total_minutes,
-            'total_hours': total_hours,
-            'daily_stats': daily_list,
-            'average_per_day': round(total_minutes / 7 if period == 'week' else total_minutes / 30, 1)
-        }), 200
+        return jsonify(focus_statistics(user_id, period)), 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -3,17 +3,28 @@
 References Management API Routes
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, Reference
-from references import ReferenceParser, ReferenceFormatter, APIClient
+from models import db, Reference, BackgroundJob
+from references import (
+    ReferenceParser, ReferenceFormatter, IMPORT_FORMATS, RateLimited, get_api_client, iter_parse,
+    iter_records, import_references, find_duplicate, upsert_reference, citations
+)
+from pagination import SortKey, paginate, page_args
+import exporter
+import jobs
+import io
+import json
+import math
 from sqlalchemy import or_
 
 references_bp = Blueprint('references', __name__, url_prefix='/api/references')
 
 # 初始化服務
 parser = ReferenceParser()
-api_client = APIClient()
+
+# 參考文獻列表每批讀取格式化快取的筆數
+BIBLIOGRAPHY_BATCH_SIZE = 500
 
 
 @references_bp.route('/parse', methods=['POST'])
@@ -22,7 +33,10 @@ def parse_reference():
     """
     解析文獻
     POST /api/references/parse
-    Body: { "text": "文獻文字", "enrich": true/false }
+    Body: { "text": "文獻文字", "enrich": true/false, "mode": "async" }
+
+    mode=async 時以本地解析結果建立文獻並立即返回（202），
+    補全由背景工作執行，完成後更新該筆文獻；以 /api/references/jobs/<id> 查詢進度
     """
     user_id = int(get_jwt_identity())
     data = request.get_json()
@@ -39,10 +53,23 @@ def parse_reference():
     try:
         # 解析文獻
         parsed = parser.parse_reference(text)
+        can_enrich = enrich and (parsed.get('doi') or parsed.get('title'))
+
+        if data.get('mode') == 'async':
+            return _save_and_enqueue(user_id, parsed, data, can_enrich)
 
         # 如果需要補全且有 DOI 或標題
-        if enrich and (parsed.get('doi') or parsed.get('title')):
-            parsed = api_client.enrich_reference(parsed)
+        if can_enrich:
+            try:
+                parsed = get_api_client().enrich_reference(parsed)
+            except RateLimited as e:
+                # 保留本地解析結果，告知客戶端補全受速率限制，可於 Retry-After 秒後重試
+                parsed['enriched'] = False
+                return jsonify({
+                    'success': True,
+                    'data': parsed,
+                    'rate_limited': True
+                }), 200, {'Retry-After': str(math.ceil(e.retry_after))}
 
         return jsonify({
             'success': True,
@@ -53,15 +80,247 @@ def parse_reference():
         return jsonify({'error': f'解析失敗: {str(e)}'}), 500
 
 
-@references_bp.route('/', methods=['GET'])
+def _job_response(job, reference=None):
+    """補全工作狀態（附上目前的文獻資料）"""
+    data = job.to_dict()
+    if reference is not None:
+        data['reference'] = reference.to_dict()
+    return data
+
+
+def _save_and_enqueue(user_id, parsed, data, enrich):
+    """以解析結果建立文獻（已存在時合併至既有文獻），並排入背景補全"""
+    try:
+        reference, created = upsert_reference({
+            'user_id': user_id,
+            'title': parsed.get('title') or parsed['original_text'],  # 未解析出標題時以原文暫代
+            'authors': parsed.get('authors', []),
+            'year': parsed.get('year'),
+            'journal': parsed.get('journal'),
+            'volume': parsed.get('volume'),
+            'issue': parsed.get('issue'),
+            'pages': parsed.get('pages'),
+            'publisher': parsed.get('publisher'),
+            'doi': parsed.get('doi'),
+            'url': parsed.get('url'),
+            'reference_type': parsed.get('type', 'article'),
+            'tags': data.get('tags', ''),
+            'notes': data.get('notes', ''),
+            'original_text': parsed['original_text'],
+            'confidence': parsed.get('confidence', 0.0),
+            'completeness': parsed.get('completeness', 0.0),
+            'enriched': False
+        })
+        db.session.flush()
+
+        job = None
+        if enrich and not reference.enriched:
+            job = jobs.enqueue(jobs.enrichment.ENRICH_REFERENCE, user_id, {'reference_id': reference.id})
+        db.session.commit()
+
+        body = {
+            'success': True,
+            'data': parsed,
+            'reference': reference.to_dict(),
+            'duplicate': not created,
+            'job': _job_response(job) if job else None
+        }
+        if job is None:
+            return jsonify(body), 201 if created else 200
+        return jsonify(body), 202, {'Location': f'/api/references/jobs/{job.id}'}
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'創建失敗: {str(e)}'}), 500
+
+
+@references_bp.route('/jobs/<int:job_id>', methods=['GET'])
 @jwt_required()
-def get_references():
+def get_enrichment_job(job_id):
     """
-    獲取文獻列表
-    GET /api/references?type=article&tags=machine learning&search=title keyword
+    查詢補全工作狀態
+    GET /api/references/jobs/<id>
+
+    立即返回目前狀態，不在請求中等待工作完成；
+    工作尚未結束時附上 Retry-After（REFERENCE_JOB_POLL_INTERVAL 秒），客戶端依此間隔再次查詢
+    """
+    user_id = int(get_jwt_identity())
+    job = BackgroundJob.query.filter_by(
+        id=job_id, user_id=user_id, kind=jobs.enrichment.ENRICH_REFERENCE
+    ).first()
+    if not job:
+        return jsonify({'error': '補全工作不存在'}), 404
+
+    reference = Reference.query.filter_by(id=job.payload.get('reference_id'), user_id=user_id).first()
+    headers = {}
+    if job.status in jobs.ACTIVE_STATUSES:
+        headers['Retry-After'] = str(current_app.config.get('REFERENCE_JOB_POLL_INTERVAL', 1))
+    return jsonify(_job_response(job, reference)), 200, headers
+
+
+@references_bp.route('/<int:ref_id>/enrich', methods=['POST'])
+@jwt_required()
+def enrich_existing_reference(ref_id):
+    """將既有文獻排入背景補全"""
+    user_id = int(get_jwt_identity())
+
+    reference = Reference.query.filter_by(id=ref_id, user_id=user_id).first()
+    if not reference:
+        return jsonify({'error': '文獻不存在'}), 404
+
+    try:
+        job = jobs.enqueue(jobs.enrichment.ENRICH_REFERENCE, user_id, {'reference_id': reference.id})
+        db.session.commit()
+        return jsonify(_job_response(job, reference)), 202, {'Location': f'/api/references/jobs/{job.id}'}
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'補全失敗: {str(e)}'}), 500
+
+
+@references_bp.route('/parse-batch', methods=['POST'])
+@jwt_required()
+def parse_references_batch():
+    """
+    批次解析文獻（整份參考文獻列表）
+    POST /api/references/parse-batch
+    Body: { "text": "多筆文獻，每行一筆", "enrich": true/false }
+       或 { "references": ["文獻文字", ...], "enrich": true/false }
+
+    補全以有上限的執行緒池並行查詢，結果順序與輸入相同，並附上每筆的狀態
+    """
+    data = request.get_json()
+
+    if not data or ('text' not in data and 'references' not in data):
+        return jsonify({'error': '缺少文獻文字'}), 400
+
+    if 'references' in data:
+        texts = [t.strip() for t in data['references'] if isinstance(t, str) and t.strip()]
+    else:
+        texts = [line.strip() for line in data['text'].split('\n') if line.strip()]
+    enrich = data.get('enrich', True)
+
+    if not texts:
+        return jsonify({'error': '文獻文字不能為空'}), 400
+
+    max_items = current_app.config.get('REFERENCE_BATCH_MAX_ITEMS', 200)
+    if len(texts) > max_items:
+        return jsonify({'error': f'單次最多解析 {max_items} 筆文獻'}), 400
+
+    try:
+        parsed = [parser.parse_reference(text) for text in texts]
+
+        if enrich:
+            results = get_api_client().enrich_many(
+                parsed,
+                max_workers=current_app.config.get('REFERENCE_API_CONCURRENCY', 4),
+                timeout=current_app.config.get('REFERENCE_BATCH_TIMEOUT', 45)
+            )
+        else:
+            results = [{'status': 'parsed', 'data': item} for item in parsed]
+
+        summary = {}
+        for index, result in enumerate(results):
+            result['index'] = index
+            summary[result['status']] = summary.get(result['status'], 0) + 1
+
+        return jsonify({
+            'success': True,
+            'count': len(results),
+            'summary': summary,
+            'results': results
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': f'解析失敗: {str(e)}'}), 500
+
+
+@references_bp.route('/parse-bulk', methods=['POST'])
+@jwt_required()
+def parse_references_bulk():
+    """
+    大量解析文獻（不補全），依輸入順序串流返回 NDJSON
+    POST /api/references/parse-bulk?chunk_size=500
+    Body: text/plain（每行一筆）、multipart 檔案（file），或 JSON { "text": "..." }
+
+    每行輸出：{ "index": 0, "data": {...} }
+
+    在請求所在的 worker 內逐塊解析，不啟動進程池；
+    多進程解析請使用 CLI（flask references parse-bulk --workers N）
+    """
+    chunk_size = request.args.get('chunk_size', type=int) or current_app.config.get('BULK_PARSE_CHUNK_SIZE', 500)
+
+    # 純文字與上傳檔案以串流逐行讀取，不先載入完整內容
+    if 'file' in request.files:
+        lines = io.TextIOWrapper(request.files['file'].stream, encoding='utf-8', errors='replace')
+    elif request.is_json:
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data.get('text'), str):
+            return jsonify({'error': '缺少文獻文字'}), 400
+        lines = data['text'].splitlines()
+    else:
+        lines = io.TextIOWrapper(request.stream, encoding=request.mimetype_params.get('charset', 'utf-8'), errors='replace')
+
+    def generate():
+        for index, parsed in enumerate(iter_parse(lines, workers=1, chunk_size=chunk_size)):
+            yield json.dumps({'index': index, 'data': parsed}, ensure_ascii=False) + '\n'
+
+    return Response(
+        stream_with_context(exporter.buffered(generate())),
+        mimetype='application/x-ndjson'
+    )
+
+
+@references_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_reference_file():
+    """
+    從 BibTeX / RIS 檔案匯入文獻
+    POST /api/references/import?format=bibtex
+    Body: multipart 檔案（file），或直接以檔案內容為 body
+
+    格式未指定時依副檔名或內容判斷
     """
     user_id = int(get_jwt_identity())
+    fmt = request.args.get('format') or request.form.get('format')
+    if fmt and fmt not in IMPORT_FORMATS:
+        return jsonify({'error': '不支援的匯入格式'}), 400
+
+    # 逐段讀取上傳內容，不一次載入整個檔案
+    if 'file' in request.files:
+        upload = request.files['file']
+        stream, filename = upload.stream, upload.filename
+    else:
+        stream, filename = request.stream, None
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', errors='replace')
+
+    try:
+        records = iter_records(text, fmt=fmt, filename=filename)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        result = import_references(
+            user_id, records, batch_size=current_app.config.get('REFERENCE_IMPORT_BATCH_SIZE', 500)
+        )
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'匯入失敗: {str(e)}'}), 500
+
+    return jsonify({
+        'success': True,
+        'message': f"已匯入 {result['imported']} 筆文獻",
+        **result
+    }), 201
 
+
+def _list_query(user_id):
+    """
+    依列表查詢參數（type、tags、search、sort、order）建立查詢
+
+    Returns:
+        (查詢, keyset 排序鍵)
+    """
     # 獲取查詢參數
     ref_type = request.args.get('type')
     tags = request.args.get('tags')
@@ -90,27 +349,83 @@ def get_references():
             )
         )
 
-    # 排序
+    # 排序（以 id 作為同值時的次序，供 keyset 分頁使用）
+    descending = order != 'asc'
     if sort == 'year':
-        sort_column = Reference.year
+        sort_key = SortKey(Reference.year, descending=descending, default='')
     elif sort == 'title':
-        sort_column = Reference.title
+        sort_key = SortKey(Reference.title, descending=descending, default='')
     elif sort == 'updated_at':
-        sort_column = Reference.updated_at
+        sort_key = SortKey(Reference.updated_at, descending=descending)
     else:
-        sort_column = Reference.created_at
+        sort_key = SortKey(Reference.created_at, descending=descending)
 
-    if order == 'asc':
-        query = query.order_by(sort_column.asc())
-    else:
-        query = query.order_by(sort_column.desc())
+    return query, [sort_key, SortKey(Reference.id, descending=descending)]
 
-    references = query.all()
+
+@references_bp.route('/', methods=['GET'])
+@jwt_required()
+def get_references():
+    """
+    獲取文獻列表
+    GET /api/references?type=article&tags=machine learning&search=title keyword&limit=50&cursor=...
+    """
+    user_id = int(get_jwt_identity())
+    limit, cursor = page_args(request)
+    query, keys = _list_query(user_id)
+
+    try:
+        references, next_cursor = paginate(query, keys, limit=limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({
+        'success': True,
+        'count': len(references),
+        'references': [ref.to_dict() for ref in references],
+        'next_cursor': next_cursor
+    }), 200
+
+
+@references_bp.route('/formatted', methods=['GET'])
+@jwt_required()
+def get_formatted_references():
+    """
+    獲取文獻列表及各引用格式的格式化結果（讀取格式化快取）
+    GET /api/references/formatted?styles=apa,mla&limit=50&cursor=...
+    篩選、排序與分頁參數同 GET /api/references；未指定 styles 時返回所有格式
+    """
+    user_id = int(get_jwt_identity())
+    limit, cursor = page_args(request)
+    query, keys = _list_query(user_id)
+
+    available = ReferenceFormatter.get_available_styles()
+    styles_arg = request.args.get('styles')
+    styles = [s.strip().lower() for s in styles_arg.split(',') if s.strip()] if styles_arg else available
+    unsupported = [style for style in styles if style not in available]
+    if unsupported:
+        return jsonify({'error': f"不支援的格式: {', '.join(unsupported)}"}), 400
+
+    try:
+        references, next_cursor = paginate(query, keys, limit=limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        rendered = citations.render(references, styles)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'格式化失敗: {str(e)}'}), 500
 
     return jsonify({
         'success': True,
         'count': len(references),
-        'references': [ref.to_dict() for ref in references]
+        'styles': styles,
+        'references': [
+            {**ref.to_dict(), 'formatted': rendered[ref.id]} for ref in references
+        ],
+        'next_cursor': next_cursor
     }), 200
 
 
@@ -129,30 +444,37 @@ def create_reference():
         return jsonify({'error': '缺少標題'}), 400
 
     try:
-        reference = Reference(
-            user_id=user_id,
-            title=data['title'],
-            authors=data.get('authors', []),
-            year=data.get('year'),
-            journal=data.get('journal'),
-            volume=data.get('volume'),
-            issue=data.get('issue'),
-            pages=data.get('pages'),
-            publisher=data.get('publisher'),
-            doi=data.get('doi'),
-            url=data.get('url'),
-            reference_type=data.get('type', 'article'),
-            tags=data.get('tags', ''),
-            notes=data.get('notes', ''),
-            original_text=data.get('original_text', ''),
-            confidence=data.get('confidence', 0.0),
-            completeness=data.get('completeness', 0.0),
-            enriched=data.get('enriched', False)
-        )
-
-        db.session.add(reference)
+        reference, created = upsert_reference({
+            'user_id': user_id,
+            'title': data['title'],
+            'authors': data.get('authors', []),
+            'year': data.get('year'),
+            'journal': data.get('journal'),
+            'volume': data.get('volume'),
+            'issue': data.get('issue'),
+            'pages': data.get('pages'),
+            'publisher': data.get('publisher'),
+            'doi': data.get('doi'),
+            'url': data.get('url'),
+            'reference_type': data.get('type', 'article'),
+            'tags': data.get('tags', ''),
+            'notes': data.get('notes', ''),
+            'original_text': data.get('original_text', ''),
+            'confidence': data.get('confidence', 0.0),
+            'completeness': data.get('completeness', 0.0),
+            'enriched': data.get('enriched', False)
+        })
         db.session.commit()
 
+        if not created:
+            # 已有相同 DOI 或相同標題/第一作者/年份的文獻，合併而不重複建立
+            return jsonify({
+                'success': True,
+                'message': '文獻已存在，已合併',
+                'duplicate': True,
+                'reference': reference.to_dict()
+            }), 200
+
         return jsonify({
             'success': True,
             'message': '文獻創建成功',
@@ -201,6 +523,15 @@ def update_reference(ref_id):
             'tags', 'notes'
         ]
 
+        if data.get('doi'):
+            # DOI 不可與同一用戶的其他文獻重複
+            duplicate = find_duplicate(user_id, {'doi': data['doi']}, exclude_id=reference.id)
+            if duplicate is not None:
+                return jsonify({
+                    'error': '已有相同 DOI 的文獻',
+                    'duplicate_id': duplicate.id
+                }), 409
+
         for field in updatable_fields:
             if field in data:
                 setattr(reference, field, data[field])
@@ -250,17 +581,32 @@ def format_reference():
     格式化文獻
     POST /api/references/format
     Body: { "reference": {...}, "style": "apa" }
+       或 { "reference_id": 1, "style": "apa" }（已儲存的文獻，讀取格式化快取）
     """
+    user_id = int(get_jwt_identity())
     data = request.get_json()
 
-    if not data or 'reference' not in data:
+    if not data or ('reference' not in data and 'reference_id' not in data):
         return jsonify({'error': '缺少文獻資料'}), 400
 
-    reference_data = data['reference']
     style = data.get('style', 'apa').lower()
 
     try:
-        formatted = ReferenceFormatter.format(reference_data, style)
+        if 'reference_id' in data:
+            reference = Reference.query.filter_by(id=data['reference_id'], user_id=user_id).first()
+            if not reference:
+                return jsonify({'error': '文獻不存在'}), 404
+            if style not in ReferenceFormatter.get_available_styles():
+                raise ValueError(f"不支援的格式: {style}")
+
+            formatted = citations.render([reference], [style])[reference.id][style]
+            db.session.commit()
+        else:
+            reference_data = data['reference']
+            # 文獻列表返回的資料以 reference_type 表示類型
+            if 'type' not in reference_data and reference_data.get('reference_type'):
+                reference_data = {**reference_data, 'type': reference_data['reference_type']}
+            formatted = ReferenceFormatter.format(reference_data, style)
 
         return jsonify({
             'success': True,
@@ -271,6 +617,7 @@ def format_reference():
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': f'格式化失敗: {str(e)}'}), 500
 
 
@@ -293,70 +640,72 @@ def export_references():
         ids = [int(id.strip()) for id in ids_str.split(',')]
         query = query.filter(Reference.id.in_(ids))
 
-    references = query.all()
-
     if format_type == 'bibtex':
-        bibtex_entries = []
-        for ref in references:
-            entry = _to_bibtex(ref)
-            bibtex_entries.append(entry)
-
-        bibtex_content = '\n\n'.join(bibtex_entries)
-
-        return bibtex_content, 200, {
-            'Content-Type': 'text/plain; charset=utf-8',
-            'Content-Disposition': 'attachment; filename=references.bib'
-        }
+        # 串流輸出，逐批讀取文獻
+        return Response(
+            stream_with_context(exporter.buffered(exporter.iter_references_bibtex(query))),
+            headers={
+                'Content-Type': 'text/plain; charset=utf-8',
+                'Content-Disposition': exporter.content_disposition('references.bib')
+            }
+        )
     else:
         return jsonify({'error': '不支援的格式'}), 400
 
 
-def _to_bibtex(reference):
-    """將 Reference 物件轉換為 BibTeX 格式"""
-    ref_type = reference.reference_type or 'article'
+@references_bp.route('/bibliography', methods=['GET'])
+@jwt_required()
+def get_bibliography():
+    """
+    產生參考文獻列表（依引用格式的排序規則排列，串流輸出）
+    GET /api/references/bibliography?style=apa&format=text&ids=1,2,3
+    未指定 ids 時依列表篩選參數（type、tags、search）選取文獻
+    format: text（預設）、html、markdown
+    """
+    user_id = int(get_jwt_identity())
+    style = request.args.get('style', 'apa').lower()
+    fmt = request.args.get('format', 'text').lower()
+    ids_str = request.args.get('ids')
+
+    if style not in ReferenceFormatter.get_available_styles():
+        return jsonify({'error': f'不支援的格式: {style}'}), 400
+    if fmt not in exporter.BIBLIOGRAPHY_FORMATS:
+        return jsonify({'error': '不支援的輸出格式'}), 400
 
-    # BibTeX key: 第一作者姓 + 年份
-    if reference.authors and len(reference.authors) > 0:
-        first_author = reference.authors[0].get('last', 'Unknown')
+    if ids_str:
+        try:
+            ids = [int(id.strip()) for id in ids_str.split(',') if id.strip()]
+        except ValueError:
+            return jsonify({'error': '無效的文獻 ID'}), 400
+        query = Reference.query.filter(Reference.user_id == user_id, Reference.id.in_(ids))
     else:
-        first_author = 'Unknown'
-
-    year = reference.year or 'n.d.'
-    key = f"{first_author}{year}"
-
-    # 作者列表
-    authors_str = ' and '.join([
-        f"{a.get('first', '')} {a.get('last', '')}"
-        for a in reference.authors
-    ]) if reference.authors else ''
-
-    # 構建 BibTeX 條目
-    lines = [f"@{ref_type}{{{key},"]
-
-    if reference.title:
-        lines.append(f"  title = {{{reference.title}}},")
-    if authors_str:
-        lines.append(f"  author = {{{authors_str}}},")
-    if reference.year:
-        lines.append(f"  year = {{{reference.year}}},")
-    if reference.journal:
-        lines.append(f"  journal = {{{reference.journal}}},")
-    if reference.volume:
-        lines.append(f"  volume = {{{reference.volume}}},")
-    if reference.issue:
-        lines.append(f"  number = {{{reference.issue}}},")
-    if reference.pages:
-        lines.append(f"  pages = {{{reference.pages}}},")
-    if reference.publisher:
-        lines.append(f"  publisher = {{{reference.publisher}}},")
-    if reference.doi:
-        lines.append(f"  doi = {{{reference.doi}}},")
-    if reference.url:
-        lines.append(f"  url = {{{reference.url}}},")
-
-    lines.append("}")
-
-    return '\n'.join(lines)
+        query, _ = _list_query(user_id)
+
+    try:
+        # 一次查詢載入後依格式排序，格式化結果讀取快取
+        references = sorted(
+            query.all(),
+            key=lambda ref: ReferenceFormatter.sort_key(citations.formatter_data(ref), style)
+        )
+        rendered = {}
+        for start in range(0, len(references), BIBLIOGRAPHY_BATCH_SIZE):
+            batch = references[start:start + BIBLIOGRAPHY_BATCH_SIZE]
+            rendered.update(citations.render(batch, [style]))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'格式化失敗: {str(e)}'}), 500
+
+    entries = [rendered[ref.id][style] for ref in references]
+    headers = {'Content-Type': exporter.BIBLIOGRAPHY_FORMATS[fmt]}
+    if request.args.get('download') in ('1', 'true'):
+        extension = {'text': 'txt', 'html': 'html', 'markdown': 'md'}[fmt]
+        headers['Content-Disposition'] = exporter.content_disposition(f'bibliography.{extension}')
+
+    return Response(
+        stream_with_context(exporter.buffered(exporter.iter_bibliography(entries, fmt, style))),
+        headers=headers
+    )
 
 
 @references_bp.route('/styles', methods=['GET'])
@@ -369,3 +718,31 @@ def get_available_styles():
         'success': True,
         'styles': styles
     }), 200
+
+
+@references_bp.route('/cache/stats', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    """元數據快取命中統計"""
+    cache = get_api_client().cache
+    if cache is None:
+        return jsonify({'success': True, 'enabled': False}), 200
+
+    return jsonify({
+        'success': True,
+        'enabled': True,
+        'stats': cache.stats()
+    }), 200
+
+
+@references_bp.route('/sources/stats', methods=['GET'])
+@jwt_required()
+def get_source_stats():
+    """各查詢來源的延遲與成功率（本進程）"""
+    client = get_api_client()
+
+    return jsonify({
+        'success': True,
+        'sources': client.sources,
+        'stats': client.metrics()
+    }), 200
@@ -5,8 +5,8 @@ Search Routes
 
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import Todo, Note
-from sqlalchemy import or_
+from models import Todo, Note, Reference
+import fulltext
 
 search_bp = Blueprint('search', __name__, url_prefix='/api/search')
 
@@ -14,7 +14,7 @@ search_bp = Blueprint('search', __name__, url_prefix='/api/search')
 @search_bp.route('/', methods=['GET'])
 @jwt_required()
 def search_all():
-    """全局搜尋 - 搜尋待辦事項和筆記"""
+    """全局搜尋 - 搜尋待辦事項、筆記和文獻（依相關度排序）"""
     try:
         user_id = int(get_jwt_identity())
         query = request.args.get('q', '').strip()
@@ -25,33 +25,17 @@ def search_all():
         if len(query) < 2:
             return jsonify({'error': '搜尋關鍵字至少需要 2 個字元'}), 400
 
-        # 搜尋待辦事項
-        todos = Todo.query.filter(
-            Todo.user_id == user_id,
-            or_(
-                Todo.title.ilike(f'%{query}%'),
-                Todo.description.ilike(f'%{query}%'),
-                Todo.tags.ilike(f'%{query}%')
-            )
-        ).order_by(Todo.created_at.desc()).limit(20).all()
-
-        # 搜尋筆記
-        notes = Note.query.filter(
-            Note.user_id == user_id,
-            or_(
-                Note.title.ilike(f'%{query}%'),
-                Note.content.ilike(f'%{query}%'),
-                Note.tags.ilike(f'%{query}%'),
-                Note.category.ilike(f'%{query}%')
-            )
-        ).order_by(Note.updated_at.desc()).limit(20).all()
+        todos = fulltext.search(Todo, user_id, query, limit=20)
+        notes = fulltext.search(Note, user_id, query, limit=20)
+        references = fulltext.search(Reference, user_id, query, limit=20)
 
         return jsonify({
             'query': query,
             'results': {
                 'todos': [todo.to_dict() for todo in todos],
                 'notes': [note.to_dict() for note in notes],
-                'total': len(todos) + len(notes)
+                'references': [ref.to_dict() for ref in references],
+                'total': len(todos) + len(notes) + len(references)
             }
         }), 200
 
@@ -71,14 +55,7 @@ def search_todos():
         if not query:
             return jsonify({'error': '請提供搜尋關鍵字'}), 400
 
-        todos = Todo.query.filter(
-            Todo.user_id == user_id,
-            or_(
-                Todo.title.ilike(f'%{query}%'),
-                Todo.description.ilike(f'%{query}%'),
-                Todo.tags.ilike(f'%{query}%')
-            )
-        ).order_by(Todo.created_at.desc()).limit(limit).all()
+        todos = fulltext.search(Todo, user_id, query, limit=limit)
 
         return jsonify({
             'query': query,
@@ -102,15 +79,7 @@ def search_notes():
         if not query:
             return jsonify({'error': '請提供搜尋關鍵字'}), 400
 
-        notes = Note.query.filter(
-            Note.user_id == user_id,
-            or_(
-                Note.title.ilike(f'%{query}%'),
-                Note.content.ilike(f'%{query}%'),
-                Note.tags.ilike(f'%{query}%'),
-                Note.category.ilike(f'%{query}%')
-            )
-        ).order_by(Note.updated_at.desc()).limit(limit).all()
+        notes = fulltext.search(Note, user_id, query, limit=limit)
 
         return jsonify({
             'query': query,
@@ -120,3 +89,27 @@ def search_notes():
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+
+@search_bp.route('/references', methods=['GET'])
+@jwt_required()
+def search_references():
+    """搜尋文獻"""
+    try:
+        user_id = int(get_jwt_identity())
+        query = request.args.get('q', '').strip()
+        limit = request.args.get('limit', 20, type=int)
+
+        if not query:
+            return jsonify({'error': '請提供搜尋關鍵字'}), 400
+
+        references = fulltext.search(Reference, user_id, query, limit=limit)
+
+        return jsonify({
+            'query': query,
+            'results': [ref.to_dict() for ref in references],
+            'total': len(references)
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -6,6 +6,7 @@ Todo Routes
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, Todo
+from pagination import SortKey, paginate, page_args, cursor_headers
 from datetime import datetime
 
 todos_bp = Blueprint('todos', __name__, url_prefix='/api/todos')
@@ -14,13 +15,14 @@ todos_bp = Blueprint('todos', __name__, url_prefix='/api/todos')
 @todos_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_todos():
-    """獲取用戶的所有待辦事項"""
+    """獲取用戶的待辦事項（帶 limit 或 cursor 時分頁，下一頁游標見 X-Next-Cursor 標頭）"""
     try:
         user_id = int(get_jwt_identity())
 
         # 查詢參數
         completed = request.args.get('completed')
         priority = request.args.get('priority')
+        limit, cursor = page_args(request)
 
         query = Todo.query.filter_by(user_id=user_id)
 
@@ -30,10 +32,16 @@ def get_todos():
         if priority:
             query = query.filter_by(priority=priority)
 
-        todos = query.order_by(Todo.order.asc(), Todo.created_at.desc()).all()
+        todos, next_cursor = paginate(query, [
+            SortKey(Todo.order, default=0),
+            SortKey(Todo.created_at, descending=True),
+            SortKey(Todo.id, descending=True)
+        ], limit=limit, cursor=cursor)
 
-        return jsonify([todo.to_dict() for todo in todos]), 200
+        return jsonify([todo.to_dict() for todo in todos]), 200, cursor_headers(next_cursor)
 
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1,9 +1,56 @@
 #!/bin/bash
 
-# 執行資料庫遷移
-echo "Running database migrations..."
-flask db upgrade
+# 建立 / 升級資料庫結構（有 migrations 目錄時一併執行 flask db upgrade），
+# 在啟動 gunicorn 前完成，不在請求中建立資料表；失敗時不啟動應用
+echo "Initializing database schema..."
+flask init-db --wait "${DB_WAIT_SECONDS:-30}" || exit 1
+
+# 設定 JOB_WORKER=0 可停用背景工作執行器（由其他服務處理佇列時）
+if [ "${JOB_WORKER:-1}" = "0" ]; then
+    echo "Starting application..."
+    exec gunicorn --config gunicorn.conf.py wsgi:app
+fi
+
+# 背景工作執行器（非同步導出等）與 gunicorn 在同一容器內執行：
+# 導出檔案寫入本機 EXPORT_DIR，下載請求需讀得到同一份檔案。
+# 由監督迴圈執行，異常結束時等待 JOB_WORKER_RESTART_DELAY 秒後重啟
+supervise_worker() {
+    local stopping="" worker_pid=""
+    trap 'stopping=1; [ -n "$worker_pid" ] && kill -TERM "$worker_pid" 2>/dev/null' TERM INT
+
+    while [ -z "$stopping" ]; do
+        flask jobs worker &
+        worker_pid=$!
+        wait "$worker_pid"
+        status=$?
+        if [ -n "$stopping" ]; then
+            # 收到終止訊號：等待目前的工作完成後結束
+            wait "$worker_pid" 2>/dev/null
+            break
+        fi
+        echo "Job worker exited with status $status, restarting in ${JOB_WORKER_RESTART_DELAY:-5}s..."
+        sleep "${JOB_WORKER_RESTART_DELAY:-5}"
+    done
+}
+
+echo "Starting job worker..."
+supervise_worker &
+supervisor_pid=$!
 
-# 啟動應用
 echo "Starting application..."
-exec gunicorn --config gunicorn.conf.py wsgi:app
+gunicorn --config gunicorn.conf.py wsgi:app &
+gunicorn_pid=$!
+
+# 平台停止容器時把訊號轉給 gunicorn 與監督迴圈（兩者皆會完成進行中的請求 / 工作）
+trap 'kill -TERM "$gunicorn_pid" "$supervisor_pid" 2>/dev/null' TERM INT
+
+# wait 會被訊號中斷，持續等待直到 gunicorn 真正結束
+while kill -0 "$gunicorn_pid" 2>/dev/null; do
+    wait "$gunicorn_pid"
+    status=$?
+done
+
+# gunicorn 結束（停止或異常）時一併停止背景工作執行器，以 gunicorn 的結束碼退出
+kill -TERM "$supervisor_pid" 2>/dev/null
+wait "$supervisor_pid"
+exit "${status:-1}"
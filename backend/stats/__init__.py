@@ -0,0 +1,38 @@
+"""
+統計模組
+Statistics Module
+
+儀表板與番茄鐘統計的聚合查詢、快取與每日專注彙總，
+皆依用戶時區切日
+"""
+
+import click
+from flask.cli import AppGroup
+
+from .dashboard import dashboard_cache, get_dashboard_stats, compute_dashboard_stats, bump_dashboard_versions
+from .rollup import record_focus_session, focus_statistics, backfill_rollup
+from .timezone import get_zone, user_zone, to_utc_naive, local_date_expr
+
+
+stats_cli = AppGroup('stats', help='統計資料管理')
+
+
+@stats_cli.command('backfill-rollup')
+@click.option('--user-id', type=int, default=None, help='只重建指定用戶')
+def backfill_rollup_command(user_id):
+    """由番茄鐘紀錄重建每日專注彙總"""
+    total = backfill_rollup(user_id=user_id)
+    click.echo(f'已寫入 {total} 筆每日彙總')
+
+
+def init_app(app):
+    """套用快取設定並註冊 CLI 指令"""
+    dashboard_cache.ttl = app.config.get('DASHBOARD_CACHE_TTL', 60)
+    app.cli.add_command(stats_cli)
+
+
+__all__ = [
+    'init_app', 'dashboard_cache', 'get_dashboard_stats', 'compute_dashboard_stats', 'bump_dashboard_versions',
+    'record_focus_session', 'focus_statistics', 'backfill_rollup',
+    'get_zone', 'user_zone', 'to_utc_naive', 'local_date_expr'
+]
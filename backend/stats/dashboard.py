@@ -0,0 +1,219 @@
+"""
+儀表板統計
+Dashboard Statistics
+
+以少量聚合查詢（CASE 條件加總）計算統計，並以每用戶快取包裝。
+待辦、筆記、番茄鐘或用戶資料變更時，於同一交易內遞增資料庫中的儀表板版本；
+讀取時以主鍵查詢目前版本與快取比對，其他 worker 提交的變更也會立即使快取失效。
+「今日」與「本週」依用戶時區切日，換算為 UTC 區間後在資料庫內計算。
+"""
+
+from datetime import timedelta
+from itertools import chain
+from typing import Dict
+
+from sqlalchemy import event, func, case, and_, insert, select
+from sqlalchemy.orm import Session
+
+from cache import TTLCache
+from models import db, Todo, Note, PomodoroSession, User, DashboardVersion
+from .rollup import _dialect_insert
+from .timezone import user_zone, local_today, local_day_bounds, local_day_start
+
+# 每個 worker 各自快取（值為 (版本, 統計)）；跨 worker 的一致性由資料庫中的版本保證
+dashboard_cache = TTLCache(maxsize=2048, ttl=60)
+
+_TRACKED_MODELS = (Todo, Note, PomodoroSession)
+_DIRTY_USERS_KEY = 'dashboard_dirty_users'
+
+
+def _count_if(condition):
+    """條件計數：SUM(CASE WHEN condition THEN 1 ELSE 0 END)"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _sum_if(condition, column):
+    """條件加總：SUM(CASE WHEN condition THEN column ELSE 0 END)"""
+    return func.coalesce(func.sum(case((condition, column), else_=0)), 0)
+
+
+def _todo_stats(user_id, today_start, today_end) -> Dict:
+    total, completed, today_completed = db.session.query(
+        func.count(Todo.id),
+        _count_if(Todo.completed == True),
+        _count_if(and_(
+            Todo.completed == True,
+            Todo.completed_at >= today_start,
+            Todo.completed_at < today_end
+        ))
+    ).filter(Todo.user_id == user_id).one()
+
+    return {
+        'total': total,
+        'completed': completed,
+        'pending': total - completed,
+        'today_completed': today_completed,
+        'completion_rate': round(completed / total * 100, 1) if total > 0 else 0
+    }
+
+
+def _note_stats(user_id) -> Dict:
+    total, pinned = db.session.query(
+        func.count(Note.id),
+        _count_if(Note.pinned == True)
+    ).filter(Note.user_id == user_id).one()
+
+    return {
+        'total': total,
+        'pinned': pinned
+    }
+
+
+def _pomodoro_stats(user_id, today_start, today_end, week_start) -> Dict:
+    is_today = and_(
+        PomodoroSession.started_at >= today_start,
+        PomodoroSession.started_at < today_end
+    )
+    today_sessions, today_minutes, week_sessions, week_minutes = db.session.query(
+        _count_if(is_today),
+        _sum_if(is_today, PomodoroSession.duration),
+        func.count(PomodoroSession.id),
+        func.coalesce(func.sum(PomodoroSession.duration), 0)
+    ).filter(
+        PomodoroSession.user_id == user_id,
+        PomodoroSession.started_at >= week_start,
+        PomodoroSession.session_type == 'focus',
+        PomodoroSession.completed == True
+    ).one()
+
+    return {
+        'today': {
+            'sessions': today_sessions,
+            'minutes': today_minutes,
+            'hours': round(today_minutes / 60, 1)
+        },
+        'week': {
+            'sessions': week_sessions,
+            'minutes': week_minutes,
+            'hours': round(week_minutes / 60, 1)
+        }
+    }
+
+
+def compute_dashboard_stats(user_id: int) -> Dict:
+    """
+    計算儀表板統計（不經快取）
+
+    Args:
+        user_id: 用戶 ID
+
+    Returns:
+        儀表板統計字典
+    """
+    # 用戶時區的今日與本週（週一起算），換算為 UTC 區間；
+    # 時區變更會遞增版本，此時其他 worker 的用戶快取可能尚未失效，需直接查詢
+    zone = user_zone(user_id, fresh=True)
+    today = local_today(zone)
+    today_start, today_end = local_day_bounds(today, zone)
+    week_start = local_day_start(today - timedelta(days=today.weekday()), zone)
+
+    # 即將到期的待辦事項
+    upcoming_todos = Todo.query.filter(
+        Todo.user_id == user_id,
+        Todo.completed == False,
+        Todo.due_date != None,
+        Todo.due_date >= today_start
+    ).order_by(Todo.due_date.asc()).limit(5).all()
+
+    # 最近更新的筆記
+    recent_notes = Note.query.filter_by(
+        user_id=user_id
+    ).order_by(Note.updated_at.desc()).limit(5).all()
+
+    return {
+        'todos': _todo_stats(user_id, today_start, today_end),
+        'notes': _note_stats(user_id),
+        'pomodoro': _pomodoro_stats(user_id, today_start, today_end, week_start),
+        'upcoming_todos': [todo.to_dict() for todo in upcoming_todos],
+        'recent_notes': [note.to_dict() for note in recent_notes]
+    }
+
+
+def dashboard_version(user_id: int) -> int:
+    """目前的儀表板版本（尚無資料列時為 0）"""
+    version = db.session.execute(
+        select(DashboardVersion.version).where(DashboardVersion.user_id == user_id)
+    ).scalar()
+    return version or 0
+
+
+def get_dashboard_stats(user_id: int) -> Dict:
+    """獲取儀表板統計（快取版本與資料庫一致時讀取快取）"""
+    version = dashboard_version(user_id)
+    cached = dashboard_cache.get(user_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    stats = compute_dashboard_stats(user_id)
+    dashboard_cache.set(user_id, (version, stats))
+    return stats
+
+
+def bump_dashboard_versions(connection, user_ids):
+    """
+    遞增用戶的儀表板版本（與呼叫端位於同一交易，回滾時一併撤銷）
+
+    Args:
+        connection: 目前交易的連線
+        user_ids: 用戶 ID
+    """
+    table = DashboardVersion.__table__
+    dialect_insert = _dialect_insert(connection.dialect.name)
+
+    # 依固定順序更新，避免併發交易互相等待對方持有的資料列
+    for user_id in sorted(user_ids):
+        if dialect_insert is None:
+            updated = connection.execute(
+                table.update().where(table.c.user_id == user_id).values(version=table.c.version + 1)
+            )
+            if updated.rowcount == 0:
+                connection.execute(insert(table).values(user_id=user_id, version=1))
+            continue
+
+        stmt = dialect_insert(table).values(user_id=user_id, version=1)
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=['user_id'],
+            set_={'version': table.c.version + 1}
+        ))
+
+
+def _collect_dirty_users(session, flush_context):
+    """flush 時遞增資料有變更的用戶的儀表板版本，並記錄供提交後清除本 worker 的快取"""
+    changed = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, _TRACKED_MODELS):
+            changed.add(obj.user_id)
+        elif isinstance(obj, User) and obj.id is not None:
+            # 時區等設定影響「今日」與「本週」的切日
+            changed.add(obj.id)
+    changed.discard(None)
+    if not changed:
+        return
+
+    bump_dashboard_versions(session.connection(), changed)
+    session.info.setdefault(_DIRTY_USERS_KEY, set()).update(changed)
+
+
+def _invalidate_after_commit(session):
+    """提交後使相關用戶的快取失效"""
+    for user_id in session.info.pop(_DIRTY_USERS_KEY, ()):
+        dashboard_cache.invalidate(user_id)
+
+
+def _discard_after_rollback(session):
+    session.info.pop(_DIRTY_USERS_KEY, None)
+
+
+event.listen(Session, 'after_flush', _collect_dirty_users)
+event.listen(Session, 'after_commit', _invalidate_after_commit)
+event.listen(Session, 'after_rollback', _discard_after_rollback)
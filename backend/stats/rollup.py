@@ -0,0 +1,164 @@
+"""
+每日專注彙總
+Daily Focus Rollup
+
+- 記錄番茄鐘時以 upsert 累加當日（用戶時區）彙總
+- 統計端點只讀取彙總列（年檢視最多 366 列）
+- 提供由原始紀錄重建彙總的回填（在資料庫內依本地日期分組）
+"""
+
+from datetime import timedelta
+from typing import Dict
+
+from sqlalchemy import delete, insert, select, func
+
+from models import db, DailyFocusRollup, PomodoroSession, User
+from .timezone import get_zone, user_zone, local_date, local_today, local_date_expr
+
+PERIOD_DAYS = {
+    'week': 7,
+    'month': 30,
+    'year': 365,
+}
+
+
+def _dialect_insert(dialect: str):
+    """取得支援 ON CONFLICT 的 insert 建構函數"""
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+
+def add_to_rollup(user_id: int, day, sessions: int, minutes: int):
+    """
+    累加單日彙總（與呼叫端位於同一交易）
+
+    Args:
+        user_id: 用戶 ID
+        day: 日期
+        sessions: 增加的專注次數
+        minutes: 增加的分鐘數
+    """
+    table = DailyFocusRollup.__table__
+    dialect_insert = _dialect_insert(db.session.get_bind().dialect.name)
+
+    if dialect_insert is None:
+        # 不支援 ON CONFLICT 的資料庫：先更新，沒有資料列再插入
+        updated = db.session.execute(
+            table.update()
+            .where(table.c.user_id == user_id, table.c.date == day)
+            .values(sessions=table.c.sessions + sessions, minutes=table.c.minutes + minutes)
+        )
+        if updated.rowcount == 0:
+            db.session.execute(insert(table).values(
+                user_id=user_id, date=day, sessions=sessions, minutes=minutes
+            ))
+        return
+
+    stmt = dialect_insert(table).values(user_id=user_id, date=day, sessions=sessions, minutes=minutes)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['user_id', 'date'],
+        set_={
+            'sessions': table.c.sessions + stmt.excluded.sessions,
+            'minutes': table.c.minutes + stmt.excluded.minutes,
+        }
+    )
+    db.session.execute(stmt)
+
+
+def record_focus_session(session: PomodoroSession):
+    """若為完成的專注會話，累加到用戶時區的當日彙總"""
+    if session.session_type != 'focus' or not session.completed:
+        return
+
+    # 切日結果會寫入彙總列，不可使用其他 worker 可能尚未失效的快取時區
+    day = local_date(session.started_at, user_zone(session.user_id, fresh=True))
+    add_to_rollup(session.user_id, day, 1, session.duration or 0)
+
+
+def focus_statistics(user_id: int, period: str = 'week') -> Dict:
+    """
+    讀取彙總列計算番茄鐘統計
+
+    Args:
+        user_id: 用戶 ID
+        period: 統計區間（week, month, year）
+
+    Returns:
+        統計字典
+    """
+    days = PERIOD_DAYS.get(period, PERIOD_DAYS['week'])
+    start_day = local_today(user_zone(user_id)) - timedelta(days=days)
+
+    rows = DailyFocusRollup.query.filter(
+        DailyFocusRollup.user_id == user_id,
+        DailyFocusRollup.date >= start_day,
+        DailyFocusRollup.sessions > 0
+    ).order_by(DailyFocusRollup.date.asc()).all()
+
+    total_sessions = sum(row.sessions for row in rows)
+    total_minutes = sum(row.minutes for row in rows)
+
+    return {
+        'period': period,
+        'total_sessions': total_sessions,
+        'total_minutes': total_minutes,
+        'total_hours': round(total_minutes / 60, 1),
+        'daily_stats': [row.to_dict() for row in rows],
+        'average_per_day': round(total_minutes / 7 if period == 'week' else total_minutes / 30, 1)
+    }
+
+
+def backfill_rollup(user_id: int = None) -> int:
+    """
+    由番茄鐘原始紀錄重建彙總（在資料庫內依本地日期分組，不載入 ORM 物件）
+
+    Args:
+        user_id: 只重建指定用戶（可選）
+
+    Returns:
+        寫入的彙總列數
+    """
+    table = DailyFocusRollup.__table__
+    dialect = db.session.get_bind().dialect.name
+
+    clear = delete(table)
+    zones = db.session.query(User.timezone).distinct()
+    if user_id is not None:
+        clear = clear.where(table.c.user_id == user_id)
+        zones = zones.filter(User.id == user_id)
+    db.session.execute(clear)
+
+    total = 0
+    # 依時區分批，同一批用戶共用同一個本地日期運算式
+    for (zone_name,) in zones.all():
+        day = local_date_expr(PomodoroSession.started_at, get_zone(zone_name), dialect)
+        zone_users = select(User.id).where(
+            User.timezone == zone_name if zone_name is not None else User.timezone.is_(None)
+        )
+
+        source = select(
+            PomodoroSession.user_id,
+            day,
+            func.count(PomodoroSession.id),
+            func.coalesce(func.sum(PomodoroSession.duration), 0)
+        ).where(
+            PomodoroSession.user_id.in_(zone_users),
+            PomodoroSession.session_type == 'focus',
+            PomodoroSession.completed == True
+        ).group_by(PomodoroSession.user_id, day)
+
+        if user_id is not None:
+            source = source.where(PomodoroSession.user_id == user_id)
+
+        result = db.session.execute(
+            insert(table).from_select(['user_id', 'date', 'sessions', 'minutes'], source)
+        )
+        total += result.rowcount
+
+    db.session.commit()
+    return total
@@ -0,0 +1,95 @@
+"""
+時區感知的日期分組
+Timezone-aware Day Bucketing
+
+資料庫內的時間一律為 UTC（naive datetime），統計需依用戶時區切日：
+- 區間查詢：將「本地日」換算為 UTC 起訖時間，沿用 started_at 索引
+- 分組查詢：PostgreSQL 以 timezone() 在資料庫內換算本地日期；
+  SQLite 以預先計算的 UTC 偏移量（分鐘）換算
+"""
+
+from datetime import datetime, date, time, timedelta, timezone
+from typing import Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import func
+
+from identity import cached_user_field
+from models import db, User
+
+DEFAULT_TIMEZONE = 'Asia/Taipei'
+
+
+def get_zone(name: str) -> ZoneInfo:
+    """取得時區物件，無效時使用預設時區"""
+    try:
+        return ZoneInfo(name or DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+def user_zone(user_id: int, fresh: bool = False) -> ZoneInfo:
+    """
+    查詢用戶時區
+
+    預設讀取用戶快取（顯示用途，其他 worker 變更時區後最多延遲 USER_CACHE_TTL 秒）；
+    寫入彙總等需依時區切日後持久保存的路徑應傳入 fresh=True 直接查詢資料庫
+    """
+    if fresh:
+        return get_zone(db.session.query(User.timezone).filter(User.id == user_id).scalar())
+    return get_zone(cached_user_field(user_id, 'timezone'))
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """將帶時區的時間轉為 UTC naive datetime（naive 視為 UTC）"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def local_today(zone: ZoneInfo) -> date:
+    """用戶時區的今天"""
+    return datetime.now(zone).date()
+
+
+def local_date(value: datetime, zone: ZoneInfo) -> date:
+    """將 UTC 時間換算為用戶時區的日期"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(zone).date()
+
+
+def local_day_start(day: date, zone: ZoneInfo) -> datetime:
+    """用戶時區某日 00:00 對應的 UTC naive datetime"""
+    return to_utc_naive(datetime.combine(day, time.min, tzinfo=zone))
+
+
+def local_day_bounds(day: date, zone: ZoneInfo) -> Tuple[datetime, datetime]:
+    """用戶時區某日的 UTC 起訖時間（含起點、不含終點）"""
+    return local_day_start(day, zone), local_day_start(day + timedelta(days=1), zone)
+
+
+def utc_offset_minutes(zone: ZoneInfo, at: datetime = None) -> int:
+    """時區相對 UTC 的偏移分鐘數（預設為目前時間）"""
+    offset = (at or datetime.now(timezone.utc)).astimezone(zone).utcoffset()
+    return int(offset.total_seconds() // 60)
+
+
+def local_date_expr(column, zone: ZoneInfo, dialect: str):
+    """
+    在資料庫內將 UTC 時間欄位換算為本地日期的 SQL 運算式
+
+    Args:
+        column: UTC naive datetime 欄位
+        zone: 用戶時區
+        dialect: 資料庫方言名稱
+
+    Returns:
+        SQL 運算式（PostgreSQL 為 date，SQLite 為 'YYYY-MM-DD' 字串）
+    """
+    if dialect == 'postgresql':
+        # timestamp AT TIME ZONE 'UTC' AT TIME ZONE :tz
+        return func.date(func.timezone(zone.key, func.timezone('UTC', column)))
+
+    # SQLite 無時區資料庫，使用預先計算的偏移量（夏令時間以目前偏移近似）
+    return func.date(column, f'{utc_offset_minutes(zone):+d} minutes')
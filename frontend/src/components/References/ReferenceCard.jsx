@@ -23,7 +23,7 @@ const ReferenceCard = ({ reference, onUpdate, onDelete, onEdit }) => {
     setCopying(true)
     try {
       const response = await referencesAPI.format({
-        reference: reference,
+        reference_id: reference.id,
         style: style
       })
 
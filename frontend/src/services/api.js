@@ -91,6 +91,9 @@ export const searchAPI = {
 // 導出 API
 export const exportAPI = {
   exportAll: () => api.get('/export/all', { responseType: 'blob' }),
+  exportAllAsync: () => api.post('/export/jobs'),
+  getExportJob: (id) => api.get(`/export/jobs/${id}`),
+  downloadExportJob: (id) => api.get(`/export/jobs/${id}/download`, { responseType: 'blob' }),
   exportTodos: (format = 'json') => api.get('/export/todos', { params: { format }, responseType: 'blob' }),
   exportNotes: (format = 'json') => api.get('/export/notes', { params: { format }, responseType: 'blob' }),
 };
@@ -98,12 +101,25 @@ export const exportAPI = {
 // 文獻 API
 export const referencesAPI = {
   parse: (data) => api.post('/references/parse', data),
+  parseBatch: (data) => api.post('/references/parse-batch', data),
+  parseBulk: (text) => api.post('/references/parse-bulk', { text }, { responseType: 'text' }),
+  importFile: (file, format) => {
+    const form = new FormData()
+    form.append('file', file)
+    if (format) form.append('format', format)
+    return api.post('/references/import', form)
+  },
+  parseAsync: (data) => api.post('/references/parse', { ...data, mode: 'async' }),
+  getEnrichmentJob: (id) => api.get(`/references/jobs/${id}`),
+  enrich: (id) => api.post(`/references/${id}/enrich`),
   getAll: (params) => api.get('/references', { params }),
   create: (data) => api.post('/references', data),
   getOne: (id) => api.get(`/references/${id}`),
   update: (id, data) => api.put(`/references/${id}`, data),
   delete: (id) => api.delete(`/references/${id}`),
   format: (data) => api.post('/references/format', data),
+  getFormatted: (params) => api.get('/references/formatted', { params }),
+  getBibliography: (params) => api.get('/references/bibliography', { params, responseType: 'text' }),
   export: (params) => api.get('/references/export', { params, responseType: 'blob' }),
   getStyles: () => api.get('/references/styles'),
 };